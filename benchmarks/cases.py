@@ -0,0 +1,254 @@
+"""Benchmark cases of the hot paths of Source.Python Admin.
+
+Every case gets the set up environment and returns the operation to time.
+Operations that take microseconds loop internally, so that a single
+timed run is long enough to measure.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from importlib import import_module
+from random import Random
+
+# Benchmarks
+from environment import (get_ip_address, get_steamid2,
+                         OFFLINE_ACCOUNT_ID_OFFSET)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Case name -> function returning the operation to time
+cases = {}
+
+# Calls per timed run of micro-benchmarks
+MICRO_LOOP_SIZE = 1000
+
+# Players listed in a full menu
+MENU_PLAYERS = 64
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def benchmark(name):
+    """Register the decorated function as the case of the given name."""
+    def decorator(func):
+        cases[name] = func
+        return func
+
+    return decorator
+
+
+def _get_module(name):
+    return import_module('admin.plugins.included.' + name)
+
+
+def _get_menu_player_names():
+    """Return names of a full server, some too long to be shown as is."""
+    return [
+        ('Player ' * (1 + number % 6)) + str(number)
+        for number in range(MENU_PLAYERS)
+    ]
+
+
+def _get_menu_formatting(cached):
+    """Return the operation that formats the player names and ban durations
+    of a full player menu followed by a duration menu, MICRO_LOOP_SIZE
+    times over in total.
+
+    :param bool cached: Whether to call the cached functions or the
+    functions they wrap.
+    """
+    from admin.core.helpers import format_player_name
+
+    base = _get_module('admin_kick_ban.bans.base')
+
+    format_name = format_player_name
+    format_duration = base.format_ban_duration
+    if not cached:
+        format_name = format_name.__wrapped__
+        format_duration = format_duration.__wrapped__
+
+    names = _get_menu_player_names()
+    durations = list(base.stock_ban_durations)
+    menu_count = max(1, MICRO_LOOP_SIZE // (len(names) + len(durations)))
+
+    def run():
+        for _ in range(menu_count):
+            for name in names:
+                format_name(name)
+
+            for duration in durations:
+                format_duration(duration)
+
+    return run
+
+
+def _find_entry(section, class_name):
+    for entry in section:
+        if type(entry).__name__ == class_name:
+            return entry
+
+    raise LookupError("No {} entry in the section".format(class_name))
+
+
+# =============================================================================
+# >> CASES
+# =============================================================================
+@benchmark('bans.refresh')
+def bench_bans_refresh(env):
+    banned_steamid_manager = env.get_ban_managers()[0]
+    return banned_steamid_manager.refresh
+
+
+@benchmark('bans.is_banned')
+def bench_bans_is_banned(env):
+    banned_steamid_manager, banned_ip_address_manager = (
+        env.get_ban_managers())
+
+    # Half of the lookups are for the seeded bans
+    random = Random(0)
+    account_ids = [
+        OFFLINE_ACCOUNT_ID_OFFSET + random.randrange(env.ban_count * 2 or 1)
+        for _ in range(MICRO_LOOP_SIZE)
+    ]
+    steamids = [get_steamid2(account_id) for account_id in account_ids]
+    ip_addresses = [get_ip_address(account_id) for account_id in account_ids]
+
+    def run():
+        for steamid in steamids:
+            banned_steamid_manager.is_banned(steamid)
+
+        for ip_address in ip_addresses:
+            banned_ip_address_manager.is_banned(ip_address)
+
+    return run
+
+
+@benchmark('bans.get_active_bans')
+def bench_bans_get_active_bans(env):
+    banned_steamid_manager = env.get_ban_managers()[0]
+
+    def run():
+        banned_steamid_manager.get_active_bans()
+        banned_steamid_manager.get_active_bans(reviewed=False)
+
+    return run
+
+
+@benchmark('menus.kick.build')
+def bench_menus_kick_build(env):
+    from admin.core.clients import clients
+
+    admin_kick_ban = _get_module('admin_kick_ban.admin_kick_ban')
+    menu_command = _find_entry(
+        admin_kick_ban.menu_section, '_KickMenuCommand')
+
+    client = clients[env.admin_index]
+
+    def run():
+        client.send_popup(menu_command.popup)
+
+    return run
+
+
+@benchmark('menus.ban_steamid.build')
+def bench_menus_ban_steamid_build(env):
+    from admin.core.clients import clients
+
+    admin_kick_ban = _get_module('admin_kick_ban.admin_kick_ban')
+    menu_command = _find_entry(
+        admin_kick_ban.menu_section_steamid, 'BanSteamIDMenuCommand')
+
+    client = clients[env.admin_index]
+
+    def run():
+        client.send_popup(menu_command.popup)
+
+    return run
+
+
+@benchmark('motd.nav.build')
+def bench_motd_nav_build(env):
+    from admin.core.clients import clients
+    from admin.core.frontends.motd import main_motd, MainPage
+
+    client = clients[env.admin_index]
+    page = MainPage(env.admin_index, 'INIT')
+
+    def run():
+        page._extract_nav_data(main_motd, client, 'en')
+
+    return run
+
+
+@benchmark('left_players.iterate')
+def bench_left_players_iterate(env):
+    left_player = _get_module('admin_kick_ban.left_player')
+
+    def run():
+        for _ in left_player.LeftPlayerIter('human'):
+            pass
+
+    return run
+
+
+@benchmark('tracking.save_to_database')
+def bench_tracking_save_to_database(env):
+    admin_tracking = _get_module('admin_tracking.admin_tracking')
+    tracked_player = admin_tracking.tracked_players[env.player_indexes[-1]]
+    counter = iter(range(10 ** 9))
+
+    def run():
+        # A few name changes per save, as on a real server
+        for _ in range(5):
+            tracked_player.track('Renamed {}'.format(next(counter)))
+
+        tracked_player.save_to_database()
+
+    return run
+
+
+@benchmark('helpers.format_player_name')
+def bench_helpers_format_player_name(env):
+    from admin.core.helpers import format_player_name
+
+    # The names of the players on the server, as menus show them over and
+    # over again
+    names = _get_menu_player_names()
+    names = (names * (MICRO_LOOP_SIZE // len(names) + 1))[:MICRO_LOOP_SIZE]
+
+    def run():
+        for name in names:
+            format_player_name(name)
+
+    return run
+
+
+@benchmark('helpers.format_ban_duration')
+def bench_helpers_format_ban_duration(env):
+    base = _get_module('admin_kick_ban.bans.base')
+
+    # Stock durations, as shown by the duration menus and MoTD pages
+    durations = list(base.stock_ban_durations)
+    durations = (
+        durations * (MICRO_LOOP_SIZE // len(durations) + 1))[:MICRO_LOOP_SIZE]
+
+    def run():
+        for duration in durations:
+            base.format_ban_duration(duration).get_string('en')
+
+    return run
+
+
+@benchmark('helpers.menu_formatting.cached')
+def bench_helpers_menu_formatting_cached(env):
+    return _get_menu_formatting(cached=True)
+
+
+@benchmark('helpers.menu_formatting.uncached')
+def bench_helpers_menu_formatting_uncached(env):
+    return _get_menu_formatting(cached=False)
@@ -0,0 +1,333 @@
+"""Offline Source.Python Admin environment for benchmarks.
+
+Source.Python itself only exists inside a running game server, so the
+environment puts the stand-ins from the stubs directory in its place and
+loads the real Source.Python Admin code from the repository on top of
+them. Configs, translations and data files are copied into a temporary
+game directory, so that the SQLite database, logs and generated files never
+end up in the repository.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from configparser import ConfigParser
+from importlib import import_module
+import os
+from random import Random
+from shutil import copytree, rmtree
+import sys
+from tempfile import mkdtemp
+from time import perf_counter, sleep, time
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+STUBS_PATH = os.path.join(BENCHMARKS_PATH, 'stubs')
+SRCDS_PATH = os.path.join(os.path.dirname(BENCHMARKS_PATH), 'srcds')
+PLUGIN_PATH = os.path.join(SRCDS_PATH, 'addons', 'source-python', 'plugins')
+
+# Directories copied into the temporary game directory
+COPIED_PATHS = (
+    os.path.join('cfg', 'source-python'),
+    os.path.join('addons', 'source-python', 'data'),
+    os.path.join('resource', 'source-python', 'translations'),
+)
+
+INCLUDED_PLUGINS = ('admin_kick_ban', 'admin_tracking')
+
+# Base value of 64-bit SteamIDs of individual public accounts
+STEAMID64_BASE = 76561197960265728
+
+# Offset of SteamIDs of players who are only seen in the database
+OFFLINE_ACCOUNT_ID_OFFSET = 1000000
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_steamid2(account_id):
+    return 'STEAM_1:{}:{}'.format(account_id % 2, account_id // 2)
+
+
+def get_steamid64(account_id):
+    return str(STEAMID64_BASE + account_id)
+
+
+def get_ip_address(number):
+    return '10.{}.{}.{}'.format(
+        number // 65536 % 256, number // 256 % 256, number % 256)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class BenchmarkEnvironment:
+    """Source.Python Admin loaded on top of the stand-ins.
+
+    Only one environment can be set up per process, as Source.Python Admin
+    is made of module-level singletons.
+    """
+    def __init__(self, seed=0, plugins=INCLUDED_PLUGINS,
+                 config_overrides=None):
+        """
+        :param dict config_overrides: Values to change in the copied
+            configs before loading, as {path relative to the game
+            directory: {section: {key: value}}}.
+        """
+        self.random = Random(seed)
+        self.plugins = plugins
+        self.config_overrides = config_overrides or {}
+
+        self.game_path = None
+        self.world = None
+        self.admin = None
+        self.modules = {}
+        self.player_indexes = []
+        self.admin_index = None
+        self.ban_count = 0
+
+    def setup(self):
+        """Create the game directory, load Source.Python Admin and its
+        included plugins.
+        """
+        self.game_path = mkdtemp(prefix='spa_benchmark_')
+        for path in COPIED_PATHS:
+            copytree(
+                os.path.join(SRCDS_PATH, path),
+                os.path.join(self.game_path, path)
+            )
+
+        for path, sections in self.config_overrides.items():
+            self._override_config(os.path.join(self.game_path, path), sections)
+
+        os.environ['SPA_BENCHMARK_GAME_PATH'] = self.game_path
+        sys.path[:0] = [STUBS_PATH, PLUGIN_PATH]
+
+        from standin import world
+        self.world = world
+
+        self.admin = import_module('admin.admin')
+        self.admin.load()
+
+        from admin.core.plugins.command import admin_command_manager
+        from admin.core.plugins.manager import admin_plugin_manager
+
+        for plugin_name in self.plugins:
+            admin_command_manager.load_plugin(plugin_name)
+
+        self.run_until(lambda: all(
+            plugin_name in admin_plugin_manager
+            for plugin_name in self.plugins
+        ))
+
+        for plugin_name in self.plugins:
+            module_name = 'admin.plugins.included.{0}.{0}'.format(plugin_name)
+            self.modules[plugin_name] = sys.modules[module_name]
+
+    @staticmethod
+    def _override_config(path, sections):
+        config = ConfigParser()
+        config.read(path, encoding='utf-8')
+
+        for section, values in sections.items():
+            if not config.has_section(section):
+                config.add_section(section)
+
+            for key, value in values.items():
+                config.set(section, key, str(value))
+
+        with open(path, 'w', encoding='utf-8') as f:
+            config.write(f)
+
+    def teardown(self):
+        """Unload Source.Python Admin, remove the game directory."""
+        if self.admin is not None:
+            self.admin.unload()
+            self.run_frames(2)
+            self.admin = None
+
+        if self.game_path is not None:
+            rmtree(self.game_path, ignore_errors=True)
+            self.game_path = None
+
+    def __enter__(self):
+        try:
+            self.setup()
+        except BaseException:
+            self.teardown()
+            raise
+
+        return self
+
+    def __exit__(self, *args):
+        self.teardown()
+        return False
+
+    # Server frames
+    def run_frames(self, count=1):
+        for _ in range(count):
+            self.world.run_frame()
+
+    def run_until(self, predicate, timeout=30.0, frame_interval=0.001):
+        """Run frames until the predicate is true, e.g. until worker
+        threads are done with their jobs.
+        """
+        deadline = perf_counter() + timeout
+        while not predicate():
+            if perf_counter() > deadline:
+                raise TimeoutError("Condition not met in {} seconds".format(
+                    timeout))
+
+            self.world.run_frame()
+            sleep(frame_interval)
+
+    def wait_for_jobs(self, timeout=30.0):
+        """Wait for the job scheduler and the action queue to go idle."""
+        from admin.core.actions import action_queue
+        from admin.core.scheduler import job_scheduler
+
+        def is_idle():
+            scheduler_metrics = job_scheduler.get_metrics()
+            action_metrics = action_queue.get_metrics()
+            if (
+                    scheduler_metrics['queue_depth'] or
+                    scheduler_metrics['running'] or
+                    action_metrics['queued_actions']):
+
+                return False
+
+            # Let the callbacks of finished jobs run on the game thread
+            self.run_frames(2)
+            return True
+
+        self.run_until(is_idle, timeout)
+
+    # Players
+    def connect_player(self, account_id, name=None, admin=False, bot=False,
+                       language='en'):
+        """Connect, validate and activate a player.
+
+        :return: Index of the player or None if the connection has been
+            rejected (e.g. the IP address is banned).
+        :rtype: int
+        """
+        steamid = 'BOT' if bot else get_steamid2(account_id)
+        if admin:
+            self.world.admin_steamids.add(steamid)
+
+        player = self.world.connect(
+            name or 'Player {}'.format(account_id), steamid,
+            get_ip_address(account_id) + ':27005', fake_client=bot,
+            language=language)
+
+        if player is None:
+            return None
+
+        if not bot:
+            self.world.validate_networkid(player.index)
+
+        self.world.activate(player.index)
+        self.player_indexes.append(player.index)
+        return player.index
+
+    def disconnect_player(self, index):
+        self.world.disconnect(index)
+        self.player_indexes.remove(index)
+
+    def seed_players(self, count, admins=1):
+        """Fill the server with the given number of players, the first ones
+        are admins.
+        """
+        for account_id in range(1, count + 1):
+            index = self.connect_player(account_id, admin=account_id <= admins)
+            if account_id == 1:
+                self.admin_index = index
+
+        self.run_frames()
+
+    def seed_left_players(self, count):
+        """Let the given number of players join and leave the server."""
+        first_account_id = OFFLINE_ACCOUNT_ID_OFFSET // 2
+        for account_id in range(first_account_id, first_account_id + count):
+            index = self.connect_player(account_id)
+            if index is not None:
+                self.disconnect_player(index)
+
+        self.run_frames()
+
+    # Database
+    def seed_bans(self, count):
+        """Add SteamID and IP address bans of players who are not on the
+        server: mostly active, some expired, lifted or permanent.
+        """
+        from admin.core.orm import Session
+
+        models = import_module('admin.plugins.included.admin_kick_ban.models')
+
+        current_time = int(time())
+        session = Session()
+        for number in range(count):
+            account_id = OFFLINE_ACCOUNT_ID_OFFSET + number
+            for model, uniqueid in (
+                    (models.BannedSteamID, get_steamid64(account_id)),
+                    (models.BannedIPAddress, get_ip_address(account_id))):
+
+                banned_user = model(
+                    uniqueid, 'Banned {}'.format(number), get_steamid64(1),
+                    self.random.randint(3600, 30 * 24 * 3600))
+
+                roll = self.random.random()
+                if roll < 0.1:
+                    banned_user.expires_at = current_time - 1
+                elif roll < 0.15:
+                    banned_user.lift_ban(get_steamid64(1))
+                elif roll < 0.25:
+                    banned_user.expires_at = -1
+
+                banned_user.reviewed = self.random.random() < 0.5
+                session.add(banned_user)
+
+        session.commit()
+        session.close()
+
+        self.ban_count += count
+
+    def seed_tracking_records(self, count, players=100):
+        """Add tracking records spread over the given number of players."""
+        from admin.core.orm import Session
+
+        models = import_module('admin.plugins.included.admin_tracking.models')
+
+        current_time = int(time())
+        session = Session()
+        for number in range(count):
+            account_id = 1 + number % players
+            record = models.TrackedPlayerRecord()
+            record.steamid64 = get_steamid64(account_id)
+            record.name = 'Player {} ({})'.format(account_id, number)
+            record.ip_address = get_ip_address(account_id)
+            record.seen_at = current_time - self.random.randint(0, 86400)
+            session.add(record)
+
+        session.commit()
+        session.close()
+
+    def refresh_bans(self):
+        """Load the seeded bans into the ban managers."""
+        for manager in self.get_ban_managers():
+            manager.refresh()
+
+    def get_ban_managers(self):
+        steamid = import_module(
+            'admin.plugins.included.admin_kick_ban.bans.steamid')
+        ip_address = import_module(
+            'admin.plugins.included.admin_kick_ban.bans.ip_address')
+
+        return (
+            steamid.banned_steamid_manager,
+            ip_address.banned_ip_address_manager,
+        )
@@ -0,0 +1,197 @@
+"""Run the benchmarks of Source.Python Admin hot paths offline.
+
+Usage:
+    python benchmarks/run.py [--players N] [--left-players N] [--bans N]
+                             [--records N] [--repeat N] [--output FILE]
+                             [--baseline FILE] [--threshold RATIO]
+                             [--verbose] [case ...]
+
+Exits with 1 if a case got slower than in the baseline by more than the
+threshold, so that it can be used as a regression check.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from argparse import ArgumentParser
+import json
+import logging
+import os
+import platform
+from statistics import mean, median
+import sys
+from time import perf_counter
+
+# Benchmarks
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from environment import BenchmarkEnvironment
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def parse_args(argv=None):
+    parser = ArgumentParser(
+        description="Benchmark Source.Python Admin hot paths offline.")
+    parser.add_argument(
+        'cases', nargs='*',
+        help="Cases to run (prefixes are accepted), all by default")
+    parser.add_argument(
+        '--players', type=int, default=32,
+        help="Players on the server (default: %(default)s)")
+    parser.add_argument(
+        '--left-players', type=int, default=64,
+        help="Players who have left the server (default: %(default)s)")
+    parser.add_argument(
+        '--bans', type=int, default=5000,
+        help="SteamID and IP address bans each (default: %(default)s)")
+    parser.add_argument(
+        '--records', type=int, default=20000,
+        help="Tracking records (default: %(default)s)")
+    parser.add_argument(
+        '--repeat', type=int, default=20,
+        help="Timed runs per case (default: %(default)s)")
+    parser.add_argument(
+        '--output', help="Write the results to the given JSON file")
+    parser.add_argument(
+        '--baseline', help="Compare to the results in the given JSON file")
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help="Allowed slowdown of the median compared to the baseline "
+             "(default: %(default)s, i.e. 20%%)")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="Show the log messages of Source.Python Admin")
+
+    return parser.parse_args(argv)
+
+
+def get_timings(operation, repeat):
+    """Time the operation the given number of times after a warm-up run.
+
+    :return: Timings in milliseconds.
+    :rtype: dict
+    """
+    operation()
+
+    samples = []
+    for _ in range(repeat):
+        start_time = perf_counter()
+        operation()
+        samples.append((perf_counter() - start_time) * 1000)
+
+    samples.sort()
+    return {
+        'runs': repeat,
+        'min_ms': samples[0],
+        'median_ms': median(samples),
+        'mean_ms': mean(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max_ms': samples[-1],
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return the lines of the comparison and the regressed case names."""
+    lines = []
+    regressions = []
+    for name, timings in results.items():
+        baseline_timings = baseline.get(name)
+        if baseline_timings is None:
+            continue
+
+        ratio = timings['median_ms'] / max(baseline_timings['median_ms'], 1e-9)
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+
+        lines.append("  {:<32} {:>9.3f} -> {:>9.3f} ms  x{:.2f}{}".format(
+            name, baseline_timings['median_ms'], timings['median_ms'], ratio,
+            "  REGRESSION" if regressed else ""))
+
+    return lines, regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    with BenchmarkEnvironment() as env:
+        from cases import cases
+
+        selected = [
+            name for name in cases
+            if not args.cases or any(
+                name.startswith(prefix) for prefix in args.cases)
+        ]
+        if not selected:
+            print("No cases match {}".format(', '.join(args.cases)))
+            return 2
+
+        env.seed_bans(args.bans)
+        env.seed_tracking_records(args.records, players=args.players)
+        env.refresh_bans()
+        env.seed_players(args.players)
+        env.seed_left_players(args.left_players)
+        env.wait_for_jobs()
+
+        results = {}
+        print("{:<34} {:>10} {:>10} {:>10} {:>10}".format(
+            "case", "min ms", "median ms", "p95 ms", "max ms"))
+
+        for name in selected:
+            timings = results[name] = get_timings(
+                cases[name](env), args.repeat)
+            env.wait_for_jobs()
+
+            print("{:<34} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f}".format(
+                name, timings['min_ms'], timings['median_ms'],
+                timings['p95_ms'], timings['max_ms']))
+
+    if env.world.listener_exceptions:
+        print("{} exceptions in listeners, see the output above".format(
+            env.world.listener_exceptions))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'parameters': {
+                    'players': args.players,
+                    'left_players': args.left_players,
+                    'bans': args.bans,
+                    'records': args.records,
+                    'repeat': args.repeat,
+                },
+                'python': platform.python_version(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    lines, regressions = compare(results, baseline, args.threshold)
+    print("")
+    print("Compared to {} (median):".format(args.baseline))
+    print("\n".join(lines))
+
+    if regressions:
+        print("")
+        print("{} case(s) regressed by more than {:.0%}: {}".format(
+            len(regressions), args.threshold, ', '.join(regressions)))
+        return 1
+
+    return 0
+
+
+# =============================================================================
+# >> MAIN
+# =============================================================================
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,698 @@
+"""Replay connect/disconnect storms and gameplay events through the real
+listeners of Source.Python Admin and its included plugins.
+
+Usage:
+    python benchmarks/simulate.py map_change [--players N] ...
+    python benchmarks/simulate.py bot_flood [--flood-guard] [--flood-rate N]
+                                            ...
+    python benchmarks/simulate.py churn [--duration S] [--connect-rate N] ...
+    python benchmarks/simulate.py script --script events.jsonl
+
+Event streams are made of connect (OnClientConnect), validate
+(OnNetworkidValidated), activate (OnClientActive), disconnect
+(OnClientDisconnect), spawn, death, changename (the game events of the same
+names) and challenge (the CheckChallengeType hook of the engine) events.
+Each event is dispatched between the server frames of the stand-in world
+and timed, as are the frames themselves (OnTick, Delay, Repeat, callbacks
+of finished jobs). Database statements are counted by kind, including the
+ones issued by worker threads.
+
+Script files have an event per line:
+    {"time": 0.5, "event": "connect", "player": 5}
+    {"time": 0.7, "event": "changename", "player": 5, "name": "New name"}
+"player" is an account ID (see environment.get_steamid2). Events without
+it (except for connect and challenge) go to a random player on the server.
+connect and challenge also accept "address", connect accepts "name".
+
+By default the stream is replayed as fast as possible, but Delay timers,
+the connection flood guard and the decision caches work in real time. Use
+--realtime to replay the stream at its own pace, e.g. for bot_flood.
+
+The flood guard is disabled in the shipped config. --flood-guard enables it
+along with its automatic IP address bans.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from argparse import ArgumentParser
+from collections import Counter, defaultdict
+from heapq import heapify, heappop, heappush
+from itertools import count
+import json
+import logging
+import os
+import platform
+from random import Random
+import sys
+from threading import Lock
+from time import perf_counter, sleep
+
+# Benchmarks
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from environment import (BenchmarkEnvironment, get_ip_address,
+                         get_steamid2, OFFLINE_ACCOUNT_ID_OFFSET)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+EVENT_KINDS = (
+    'challenge', 'connect', 'validate', 'activate', 'disconnect', 'spawn',
+    'death', 'changename',
+)
+
+# SteamID the engine reports before the SteamID validation
+PENDING_STEAMID = 'STEAM_ID_PENDING'
+
+FLOOD_GUARD_CONFIG_PATH = os.path.join(
+    'cfg', 'source-python', 'admin', 'included_plugins', 'admin_kick_ban',
+    'config.ini')
+
+# Account IDs of flooding clients, the first of them are banned
+FLOOD_ACCOUNT_ID_OFFSET = OFFLINE_ACCOUNT_ID_OFFSET
+
+# Account IDs of players who join during the churn scenario
+CHURN_ACCOUNT_ID_OFFSET = 2 * OFFLINE_ACCOUNT_ID_OFFSET
+
+# Scenario name -> function generating its events
+scenarios = {}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def scenario(name):
+    """Register the decorated function as the scenario of the given name."""
+    def decorator(func):
+        scenarios[name] = func
+        return func
+
+    return decorator
+
+
+def get_percentile(samples, percentile):
+    """Return the percentile of the sorted samples (nearest rank)."""
+    if not samples:
+        return 0.0
+
+    rank = max(0, min(
+        len(samples) - 1, int(round(len(samples) * percentile / 100)) - 1))
+    return samples[rank]
+
+
+def _add_join(stream, args, random, time, account_id, **extra):
+    """Add connect, validate, activate and spawn events of a player.
+
+    The SteamID validation usually comes before the activation, but with
+    the --pending-rate probability it comes after it.
+    """
+    stream.add(time, 'connect', account_id, **extra)
+
+    time_validate = time + random.uniform(0.05, 1.0)
+    time_activate = time + random.uniform(0.2, 2.0)
+    if random.random() < args.pending_rate:
+        time_validate, time_activate = (
+            max(time_validate, time_activate) + 0.5,
+            min(time_validate, time_activate))
+    elif time_validate > time_activate:
+        time_validate, time_activate = time_activate, time_validate
+
+    stream.add(time_validate, 'validate', account_id)
+    stream.add(time_activate, 'activate', account_id)
+    stream.add(time_activate + random.uniform(0.5, 5.0), 'spawn', account_id)
+
+
+def _add_gameplay(stream, args, random, start_time, end_time):
+    """Add deaths, spawns and name changes of random players."""
+    for kind, rate in (
+            ('death', args.death_rate),
+            ('spawn', args.death_rate),
+            ('changename', args.changename_rate)):
+
+        if rate <= 0:
+            continue
+
+        time = start_time + random.expovariate(rate)
+        while time < end_time:
+            stream.add(time, kind)
+            time += random.expovariate(rate)
+
+
+# =============================================================================
+# >> SCENARIOS
+# =============================================================================
+@scenario('map_change')
+def generate_map_change(args, random):
+    """Everybody leaves at once and joins again during the reconnect
+    window, as on a map change.
+    """
+    stream = EventStream()
+
+    for account_id in range(1, args.players + 1):
+        stream.add(random.uniform(0, 0.1), 'disconnect', account_id)
+        _add_join(
+            stream, args, random,
+            0.5 + random.uniform(0, args.reconnect_window), account_id)
+
+    _add_gameplay(stream, args, random, 0.5, args.duration)
+    return stream
+
+
+@scenario('bot_flood')
+def generate_bot_flood(args, random):
+    """Clients with random SteamIDs hammer the server from a few addresses.
+
+    Every attempt goes through the challenge hook first. A share of them
+    uses banned SteamIDs, the rest join and leave shortly after.
+    """
+    stream = EventStream()
+
+    time = random.expovariate(args.flood_rate)
+    number = 0
+    while time < args.duration:
+        if random.random() < args.flood_banned_share and args.bans:
+            account_id = FLOOD_ACCOUNT_ID_OFFSET + random.randrange(args.bans)
+        else:
+            account_id = CHURN_ACCOUNT_ID_OFFSET + number
+
+        address = get_ip_address(
+            200000 + random.randrange(args.flood_addresses)) + ':27005'
+
+        stream.add(time, 'challenge', account_id, address=address)
+        stream.add(time, 'connect', account_id, address=address)
+        stream.add(time + random.uniform(0.01, 0.2), 'validate', account_id)
+        stream.add(time + random.uniform(0.2, 0.5), 'activate', account_id)
+        stream.add(time + random.uniform(0.5, 5.0), 'disconnect', account_id)
+
+        number += 1
+        time += random.expovariate(args.flood_rate)
+
+    _add_gameplay(stream, args, random, 0, args.duration)
+    return stream
+
+
+@scenario('churn')
+def generate_churn(args, random):
+    """Players keep joining and leaving at the given rates."""
+    stream = EventStream()
+    end_time = args.duration
+
+    if args.connect_rate > 0:
+        time = random.expovariate(args.connect_rate)
+        number = 0
+        while time < end_time:
+            _add_join(
+                stream, args, random, time, CHURN_ACCOUNT_ID_OFFSET + number)
+
+            number += 1
+            time += random.expovariate(args.connect_rate)
+
+    if args.disconnect_rate > 0:
+        time = random.expovariate(args.disconnect_rate)
+        while time < end_time:
+            stream.add(time, 'disconnect')
+            time += random.expovariate(args.disconnect_rate)
+
+    _add_gameplay(stream, args, random, 0, end_time)
+    return stream
+
+
+@scenario('script')
+def load_script(args, random):
+    """Read the events from the --script file."""
+    if args.script is None:
+        raise ValueError("The script scenario needs a --script file")
+
+    stream = EventStream()
+    with open(args.script, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            data = json.loads(line)
+            kind = data.pop('event')
+            if kind not in EVENT_KINDS:
+                raise ValueError("Unknown event '{}' on line {}".format(
+                    kind, line_number))
+
+            stream.add(
+                data.pop('time'), kind, data.pop('player', None), **data)
+
+    return stream
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class EventStream(list):
+    """Heap of (time, sequence, kind, account ID, extra) tuples."""
+    def __init__(self):
+        super().__init__()
+
+        self._sequence = count()
+
+    def add(self, time, kind, account_id=None, **extra):
+        heappush(self, (time, next(self._sequence), kind, account_id, extra))
+
+    def pop_due(self, time):
+        """Pop the events that are due at the given time, in order."""
+        while self and self[0][0] <= time:
+            yield heappop(self)
+
+
+class _DatabaseCounter:
+    """Count the statements executed on the engine by their kind."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = Counter()
+        self._lock = Lock()
+
+    def __enter__(self):
+        from sqlalchemy import event
+
+        event.listen(
+            self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *args):
+        from sqlalchemy import event
+
+        event.remove(
+            self.engine, 'before_cursor_execute', self._on_execute)
+        return False
+
+    def _on_execute(self, conn, cursor, statement, parameters, context,
+                    executemany):
+
+        kind = statement.lstrip().split(None, 1)[0].upper()
+        with self._lock:
+            self.statements[kind] += 1
+
+    @property
+    def writes(self):
+        return sum(
+            self.statements[kind] for kind in ('INSERT', 'UPDATE', 'DELETE'))
+
+
+class Simulator:
+    """Dispatch the events of a stream between server frames."""
+    def __init__(self, env, seed=0):
+        self.env = env
+        self.world = env.world
+        self.random = Random(seed)
+
+        # Account ID -> index of the players on the server
+        self.indexes = {}
+        for index in env.player_indexes:
+            state = self.world.get_player(index)
+            self.indexes[self._get_account_id(state.steamid)] = index
+
+        # Event kind -> latencies in milliseconds
+        self.latencies = defaultdict(list)
+        self.frame_times = []
+
+        # Events that couldn't be dispatched, e.g. death of a player who
+        # has left already
+        self.skipped = Counter()
+        self.rejected = Counter()
+
+        # Account IDs whose last challenge has been rejected
+        self._rejected_challenges = set()
+
+    @staticmethod
+    def _get_account_id(steamid):
+        try:
+            _, y, z = steamid.split(':')
+        except ValueError:
+            return None
+
+        return int(z) * 2 + int(y)
+
+    def run(self, stream, tickrate=64, realtime=False):
+        """Replay the stream, then drain the scheduled jobs.
+
+        :return: Duration of the replay in seconds.
+        :rtype: float
+        """
+        heapify(stream)
+        interval = 1 / tickrate
+
+        start_time = perf_counter()
+        sim_time = 0.0
+        while stream:
+            sim_time += interval
+            for _, _, kind, account_id, extra in stream.pop_due(sim_time):
+                self.dispatch(kind, account_id, **extra)
+
+            frame_start_time = perf_counter()
+            self.world.run_frame()
+            self.frame_times.append(
+                (perf_counter() - frame_start_time) * 1000)
+
+            if realtime:
+                delay = start_time + sim_time - perf_counter()
+                if delay > 0:
+                    sleep(delay)
+
+        self.env.wait_for_jobs()
+        return perf_counter() - start_time
+
+    def dispatch(self, kind, account_id=None, **extra):
+        if account_id is None and kind not in ('connect', 'challenge'):
+            if not self.indexes:
+                self.skipped[kind] += 1
+                return
+
+            account_id = self.random.choice(tuple(self.indexes))
+
+        handler = getattr(self, '_on_' + kind)
+        start_time = perf_counter()
+        dispatched = handler(account_id, **extra)
+        if dispatched is False:
+            self.skipped[kind] += 1
+            return
+
+        self.latencies[kind].append((perf_counter() - start_time) * 1000)
+
+    def _get_state(self, account_id):
+        index = self.indexes.get(account_id)
+        if index is None:
+            return None
+
+        # The player might have been kicked by a listener or a delay
+        state = self.world.players.get(index)
+        if state is None or self._get_account_id(
+                state.steamid) not in (account_id, None):
+
+            del self.indexes[account_id]
+            return None
+
+        return state
+
+    # Event handlers, return False if the event has been skipped
+    def _on_challenge(self, account_id, address=None):
+        from memory import Pointer
+        from standin import PlayerState
+        from admin.core.memory import custom_server
+
+        if account_id is None:
+            account_id = CHURN_ACCOUNT_ID_OFFSET + self.random.randrange(
+                OFFLINE_ACCOUNT_ID_OFFSET)
+
+        address = address or get_ip_address(account_id) + ':27005'
+        state = PlayerState(
+            0, 0, 'Player {}'.format(account_id), get_steamid2(account_id),
+            address)
+
+        if custom_server.check_challenge_type(
+                None, Pointer(state), 0, Pointer(address)) is False:
+
+            self.rejected['challenge'] += 1
+            self._rejected_challenges.add(account_id)
+        else:
+            self._rejected_challenges.discard(account_id)
+
+    def _on_connect(self, account_id, name=None, address=None):
+        if account_id is None:
+            account_id = CHURN_ACCOUNT_ID_OFFSET + self.random.randrange(
+                OFFLINE_ACCOUNT_ID_OFFSET)
+
+        if (
+                self._get_state(account_id) is not None or
+                account_id in self._rejected_challenges):
+
+            return False
+
+        try:
+            self.world.get_free_index()
+        except ValueError:
+            self.rejected['server full'] += 1
+            return
+
+        state = self.world.connect(
+            name or 'Player {}'.format(account_id), PENDING_STEAMID,
+            address or get_ip_address(account_id) + ':27005')
+
+        if state is None:
+            self.rejected['connect'] += 1
+            return
+
+        self.indexes[account_id] = state.index
+
+    def _on_validate(self, account_id):
+        state = self._get_state(account_id)
+        if state is None or state.steamid != PENDING_STEAMID:
+            return False
+
+        self.world.validate_networkid(state.index, get_steamid2(account_id))
+
+    def _on_activate(self, account_id):
+        state = self._get_state(account_id)
+        if state is None or state.active:
+            return False
+
+        self.world.activate(state.index)
+
+    def _on_disconnect(self, account_id):
+        state = self._get_state(account_id)
+        if state is None:
+            return False
+
+        del self.indexes[account_id]
+        self.world.disconnect(state.index)
+
+    def _on_spawn(self, account_id):
+        state = self._get_state(account_id)
+        if state is None or not state.active or not state.dead:
+            return False
+
+        state.dead = False
+        self.world.fire_event('player_spawn', userid=state.userid)
+
+    def _on_death(self, account_id):
+        state = self._get_state(account_id)
+        if state is None or not state.active or state.dead:
+            return False
+
+        state.dead = True
+        attacker = self.random.choice(tuple(self.world.players.values()))
+        self.world.fire_event(
+            'player_death', userid=state.userid, attacker=attacker.userid)
+
+    def _on_changename(self, account_id, name=None):
+        state = self._get_state(account_id)
+        if state is None or not state.active:
+            return False
+
+        name = name or 'Player {} ({})'.format(
+            account_id, self.random.randrange(1000))
+
+        # The event comes before the engine updates the name
+        self.world.fire_event(
+            'player_changename', userid=state.userid, oldname=state.name,
+            newname=name)
+        state.name = name
+
+    def get_results(self):
+        results = {}
+        for kind in EVENT_KINDS + ('frame', ):
+            if kind == 'frame':
+                samples = sorted(self.frame_times)
+            else:
+                samples = sorted(self.latencies.get(kind, ()))
+
+            results[kind] = {
+                'count': len(samples),
+                'skipped': self.skipped.get(kind, 0),
+                'total_ms': sum(samples),
+                'p50_ms': get_percentile(samples, 50),
+                'p95_ms': get_percentile(samples, 95),
+                'p99_ms': get_percentile(samples, 99),
+                'max_ms': samples[-1] if samples else 0.0,
+            }
+
+        return results
+
+
+# =============================================================================
+# >> MAIN
+# =============================================================================
+def parse_args(argv=None):
+    parser = ArgumentParser(
+        description="Replay connect/disconnect storms through Source.Python "
+                    "Admin offline.")
+    parser.add_argument('scenario', choices=sorted(scenarios))
+    parser.add_argument(
+        '--script', help="Event file of the script scenario (JSON lines)")
+    parser.add_argument(
+        '--players', type=int, default=64,
+        help="Players on the server at the start (default: %(default)s)")
+    parser.add_argument(
+        '--max-players', type=int, default=64,
+        help="Server slots (default: %(default)s)")
+    parser.add_argument(
+        '--bans', type=int, default=5000,
+        help="SteamID and IP address bans each (default: %(default)s)")
+    parser.add_argument(
+        '--records', type=int, default=20000,
+        help="Tracking records (default: %(default)s)")
+    parser.add_argument(
+        '--duration', type=float, default=30.0,
+        help="Seconds of generated events (default: %(default)s)")
+    parser.add_argument(
+        '--tickrate', type=int, default=64,
+        help="Server frames per second (default: %(default)s)")
+    parser.add_argument(
+        '--realtime', action='store_true',
+        help="Replay at the pace of the stream instead of at full speed")
+    parser.add_argument(
+        '--reconnect-window', type=float, default=20.0,
+        help="map_change: seconds over which players join again "
+             "(default: %(default)s)")
+    parser.add_argument(
+        '--pending-rate', type=float, default=0.0,
+        help="Share of players activated before their SteamID is "
+             "validated (default: %(default)s)")
+    parser.add_argument(
+        '--flood-guard', action='store_true',
+        help="Enable the connection flood guard and its automatic bans")
+    parser.add_argument(
+        '--flood-rate', type=float, default=50.0,
+        help="bot_flood: connection attempts per second "
+             "(default: %(default)s)")
+    parser.add_argument(
+        '--flood-addresses', type=int, default=4,
+        help="bot_flood: distinct addresses of the attempts "
+             "(default: %(default)s)")
+    parser.add_argument(
+        '--flood-banned-share', type=float, default=0.3,
+        help="bot_flood: share of attempts with banned SteamIDs "
+             "(default: %(default)s)")
+    parser.add_argument(
+        '--connect-rate', type=float, default=2.0,
+        help="churn: joins per second (default: %(default)s)")
+    parser.add_argument(
+        '--disconnect-rate', type=float, default=2.0,
+        help="churn: leaves per second (default: %(default)s)")
+    parser.add_argument(
+        '--death-rate', type=float, default=5.0,
+        help="Deaths (and as many spawns) per second (default: %(default)s)")
+    parser.add_argument(
+        '--changename-rate', type=float, default=0.5,
+        help="Name changes per second (default: %(default)s)")
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help="Seed of the generated events (default: %(default)s)")
+    parser.add_argument(
+        '--output', help="Write the results to the given JSON file")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="Show the log messages of Source.Python Admin")
+
+    args = parser.parse_args(argv)
+    if args.players > args.max_players:
+        parser.error("--players can't be greater than --max-players")
+
+    return args
+
+
+def print_results(results, statements, duration, exceptions, rejected):
+    print("{:<12} {:>7} {:>7} {:>9} {:>9} {:>9} {:>9} {:>10}".format(
+        "event", "count", "skipped", "p50 ms", "p95 ms", "p99 ms", "max ms",
+        "total ms"))
+
+    for kind, data in results.items():
+        if not data['count'] and not data['skipped']:
+            continue
+
+        print(
+            "{:<12} {:>7} {:>7} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f} "
+            "{:>10.1f}".format(
+                kind, data['count'], data['skipped'], data['p50_ms'],
+                data['p95_ms'], data['p99_ms'], data['max_ms'],
+                data['total_ms']))
+
+    print("")
+    print("Database statements: {}".format(', '.join(
+        "{} {}".format(kind, number)
+        for kind, number in sorted(statements.items())) or 'none'))
+
+    if rejected:
+        print("Rejected: {}".format(', '.join(
+            "{} {}".format(kind, number)
+            for kind, number in sorted(rejected.items()))))
+
+    print("Replayed in {:.2f} s".format(duration))
+
+    if exceptions:
+        print("{} exceptions in listeners and event handlers, see the "
+              "output above".format(exceptions))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    stream = scenarios[args.scenario](args, Random(args.seed))
+    if not stream:
+        print("The scenario has no events")
+        return 2
+
+    config_overrides = {}
+    if args.flood_guard:
+        config_overrides[FLOOD_GUARD_CONFIG_PATH] = {
+            'flood_guard': {'enabled': 1, 'auto_ban_threshold': 30},
+        }
+
+    with BenchmarkEnvironment(
+            seed=args.seed, config_overrides=config_overrides) as env:
+        from events.manager import event_registry
+        from admin.core.orm import engine
+
+        env.world.max_clients = args.max_players
+        env.seed_bans(args.bans)
+        env.seed_tracking_records(args.records, players=args.players)
+        env.refresh_bans()
+        env.seed_players(args.players)
+        env.wait_for_jobs()
+
+        simulator = Simulator(env, seed=args.seed)
+        with _DatabaseCounter(engine) as database_counter:
+            duration = simulator.run(stream, args.tickrate, args.realtime)
+
+        exceptions = (
+            env.world.listener_exceptions + event_registry.handler_exceptions)
+
+    results = simulator.get_results()
+    print_results(
+        results, database_counter.statements, duration, exceptions,
+        simulator.rejected)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'scenario': args.scenario,
+                'parameters': {
+                    key: value for key, value in vars(args).items()
+                    if key not in ('output', 'verbose')
+                },
+                'python': platform.python_version(),
+                'duration_seconds': duration,
+                'events': results,
+                'database_statements': dict(database_counter.statements),
+                'database_writes': database_counter.writes,
+                'rejected': dict(simulator.rejected),
+                'exceptions': exceptions,
+            }, f, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
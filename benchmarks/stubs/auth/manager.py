@@ -0,0 +1,34 @@
+"""Stand-in of the Source.Python auth.manager module.
+
+Admins (see standin.world.admin_steamids) have all permissions.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _AllPermissions:
+    def __contains__(self, permission):
+        return True
+
+
+class _AuthManager:
+    _all_permissions = _AllPermissions()
+
+    def is_player_authorized(self, index, permission):
+        return world.get_player(index).steamid in world.admin_steamids
+
+    def get_player_permissions_from_steamid(self, steamid):
+        if steamid in world.admin_steamids:
+            return self._all_permissions
+
+        return None
+
+# The singleton object of the _AuthManager class.
+auth_manager = _AuthManager()
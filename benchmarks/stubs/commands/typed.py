@@ -0,0 +1,27 @@
+"""Stand-in of the Source.Python commands.typed module."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _TypedCommand:
+    def __init__(self, commands, permission=None, **kwargs):
+        self.commands = commands
+        self.permission = permission
+        self.callback = None
+
+    def __call__(self, callback):
+        self.callback = callback
+        return callback
+
+
+class TypedClientCommand(_TypedCommand):
+    pass
+
+
+class TypedSayCommand(_TypedCommand):
+    pass
+
+
+class TypedServerCommand(_TypedCommand):
+    pass
@@ -0,0 +1,41 @@
+"""Stand-in of the Source.Python config.manager module."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _ConVar:
+    def __init__(self, name, default, description=''):
+        self.name = name
+        self.default = default
+        self.description = description
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def get_int(self):
+        return int(self.default)
+
+    def get_string(self):
+        return str(self.default)
+
+
+class ConfigManager:
+    def __init__(self, filepath, cvar_prefix='', indention=3,
+                 max_line_length=79):
+        self.filepath = filepath
+        self.cvar_prefix = cvar_prefix
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def cvar(self, name, default=0, description='', flags=0, min_value=None,
+             max_value=None):
+
+        return _ConVar(self.cvar_prefix + name, default, description)
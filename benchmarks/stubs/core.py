@@ -0,0 +1,6 @@
+"""Stand-in of the Source.Python core module."""
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+GAME_NAME = 'csgo'
@@ -0,0 +1,34 @@
+"""Stand-in of the Source.Python engines.server module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from players import Client
+
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _EmptyClient:
+    name = ''
+    steamid = ''
+
+
+class _Server:
+    @property
+    def num_clients(self):
+        return world.max_clients
+
+    def get_client(self, slot):
+        state = world.players.get(slot + 1)
+        if state is None:
+            return _EmptyClient()
+
+        return Client(state)
+
+# The singleton object of the _Server class.
+server = _Server()
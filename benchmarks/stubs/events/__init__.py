@@ -0,0 +1,24 @@
+"""Stand-in of the Source.Python events package."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from events.manager import event_registry
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Event:
+    """Register the decorated function for the given game events."""
+    def __init__(self, *event_names):
+        self._event_names = event_names
+        self.callback = None
+
+    def __call__(self, callback):
+        self.callback = callback
+        for event_name in self._event_names:
+            event_registry.register_for_event(event_name, callback)
+
+        return callback
@@ -0,0 +1,47 @@
+"""Stand-in of the Source.Python events.custom module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from events.manager import event_registry
+from events.variable import _EventVariable
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CustomEvent:
+    """Custom event, fired when the with-block is left."""
+    def __init__(self, **variables):
+        self._values = {}
+        for name, value in variables.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, attr, value):
+        if isinstance(getattr(type(self), attr, None), _EventVariable):
+            self._values[attr] = value
+        else:
+            super().__setattr__(attr, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.fire()
+
+        return False
+
+    @classmethod
+    def get_variables(cls):
+        variables = {}
+        for base in reversed(cls.__mro__):
+            for name, value in vars(base).items():
+                if isinstance(value, _EventVariable):
+                    variables[name] = value
+
+        return variables
+
+    def fire(self):
+        event_registry.fire(type(self).__name__.lower(), self._values)
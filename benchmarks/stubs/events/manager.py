@@ -0,0 +1,68 @@
+"""Stand-in of the Source.Python events.manager module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import defaultdict
+from traceback import print_exc
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class GameEvent:
+    """Game event of the given name carrying the given variables."""
+    def __init__(self, name, variables):
+        self.name = name
+        self.variables = dict(variables)
+
+    def __getitem__(self, variable):
+        return self.variables[variable]
+
+    def __setitem__(self, variable, value):
+        self.variables[variable] = value
+
+    def get_bool(self, variable, default=False):
+        return bool(self.variables.get(variable, default))
+
+    def get_float(self, variable, default=0.0):
+        return float(self.variables.get(variable, default))
+
+    def get_int(self, variable, default=0):
+        return int(self.variables.get(variable, default))
+
+    def get_string(self, variable, default=''):
+        return str(self.variables.get(variable, default))
+
+
+class _EventRegistry(defaultdict):
+    """Map event names to lists of their handlers."""
+    def __init__(self):
+        super().__init__(list)
+
+        self.fire_count = 0
+        self.handler_exceptions = 0
+
+    def register_for_event(self, event_name, callback):
+        if callback not in self[event_name]:
+            self[event_name].append(callback)
+
+    def unregister_for_event(self, event_name, callback):
+        if callback in self.get(event_name, ()):
+            self[event_name].remove(callback)
+
+    def fire(self, event_name, variables):
+        """Call the handlers of the event, report their exceptions."""
+        self.fire_count += 1
+
+        game_event = GameEvent(event_name, variables)
+        for callback in tuple(self.get(event_name, ())):
+            try:
+                callback(game_event)
+            except Exception:
+                self.handler_exceptions += 1
+                print_exc()
+
+# The singleton object of the _EventRegistry class.
+event_registry = _EventRegistry()
@@ -0,0 +1,37 @@
+"""Stand-in of the Source.Python events.resource module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from paths import EVENT_PATH
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class ResourceFile:
+    """Res file of the given custom events."""
+    def __init__(self, file_path, *events):
+        self.full_path = EVENT_PATH / file_path + '.res'
+        self.events = events
+
+    def write(self):
+        if not self.full_path.parent.isdir():
+            self.full_path.parent.makedirs()
+
+        lines = ['"{}"'.format(self.full_path.namebase), '{']
+        for event in self.events:
+            lines.append('    "{}"'.format(event.__name__.lower()))
+            lines.append('    {')
+            for name, variable in event.get_variables().items():
+                lines.append('        "{}" "{}"'.format(name, variable._type))
+            lines.append('    }')
+        lines.append('}')
+
+        with open(self.full_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def load_events(self):
+        if not self.full_path.isfile():
+            raise FileNotFoundError(self.full_path)
@@ -0,0 +1,35 @@
+"""Stand-in of the Source.Python events.variable module."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _EventVariable:
+    _type = None
+
+    def __init__(self, description=''):
+        self._description = description
+
+
+class BoolVariable(_EventVariable):
+    _type = 'bool'
+
+
+class ByteVariable(_EventVariable):
+    _type = 'byte'
+
+
+class FloatVariable(_EventVariable):
+    _type = 'float'
+
+
+class LongVariable(_EventVariable):
+    _type = 'long'
+
+
+class ShortVariable(_EventVariable):
+    _type = 'short'
+
+
+class StringVariable(_EventVariable):
+    _type = 'string'
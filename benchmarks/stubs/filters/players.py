@@ -0,0 +1,76 @@
+"""Stand-in of the Source.Python filters.players module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from players.entity import Player
+
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PlayerIter:
+    filters = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Every iterator class has its own filters
+        cls.filters = {}
+
+    def __init__(self, is_filters=(), not_filters=()):
+        if isinstance(is_filters, str):
+            is_filters = [is_filters]
+
+        if isinstance(not_filters, str):
+            not_filters = [not_filters]
+
+        self.is_filters = [self.filters[name] for name in is_filters]
+        self.not_filters = [self.filters[name] for name in not_filters]
+
+    def __iter__(self):
+        for item in self.iterator():
+            if not all(check(item) for check in self.is_filters):
+                continue
+
+            if any(check(item) for check in self.not_filters):
+                continue
+
+            yield item
+
+    @staticmethod
+    def iterator():
+        for index in sorted(world.players):
+            if world.players[index].active:
+                yield Player(index)
+
+    @classmethod
+    def register_filter(cls, filter_name, function):
+        if filter_name in cls.filters:
+            raise ValueError(
+                'Filter "{}" is already registered.'.format(filter_name))
+
+        cls.filters[filter_name] = function
+
+    @classmethod
+    def unregister_filter(cls, filter_name):
+        del cls.filters[filter_name]
+
+
+# =============================================================================
+# >> FILTERS
+# =============================================================================
+PlayerIter.register_filter('all', lambda player: True)
+PlayerIter.register_filter('bot', lambda player: player.is_fake_client())
+PlayerIter.register_filter(
+    'human', lambda player: not player.is_fake_client())
+PlayerIter.register_filter('alive', lambda player: not player.dead)
+PlayerIter.register_filter('dead', lambda player: player.dead)
+PlayerIter.register_filter('un', lambda player: player.team == 0)
+PlayerIter.register_filter('spec', lambda player: player.team == 1)
+PlayerIter.register_filter('t', lambda player: player.team == 2)
+PlayerIter.register_filter('ct', lambda player: player.team == 3)
@@ -0,0 +1,69 @@
+"""Stand-in of the Source.Python listeners package."""
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class ListenerManager(list):
+    def register_listener(self, callback):
+        if callback in self:
+            raise ValueError('Listener already registered.')
+
+        self.append(callback)
+
+    def unregister_listener(self, callback):
+        self.remove(callback)
+
+    def is_registered(self, callback):
+        return callback in self
+
+    def notify(self, *args):
+        from standin import world
+
+        world.notify(self, *args)
+
+
+class ListenerManagerDecorator:
+    manager = None
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.manager.register_listener(self.callback)
+
+    def __call__(self, *args, **kwargs):
+        return self.callback(*args, **kwargs)
+
+    def _unload_instance(self):
+        self.manager.unregister_listener(self.callback)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+on_client_active_listener_manager = ListenerManager()
+on_client_connect_listener_manager = ListenerManager()
+on_client_disconnect_listener_manager = ListenerManager()
+on_networkid_validated_listener_manager = ListenerManager()
+on_tick_listener_manager = ListenerManager()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+class OnClientActive(ListenerManagerDecorator):
+    manager = on_client_active_listener_manager
+
+
+class OnClientConnect(ListenerManagerDecorator):
+    manager = on_client_connect_listener_manager
+
+
+class OnClientDisconnect(ListenerManagerDecorator):
+    manager = on_client_disconnect_listener_manager
+
+
+class OnNetworkidValidated(ListenerManagerDecorator):
+    manager = on_networkid_validated_listener_manager
+
+
+class OnTick(ListenerManagerDecorator):
+    manager = on_tick_listener_manager
@@ -0,0 +1,100 @@
+"""Stand-in of the Source.Python listeners.tick module.
+
+Timers run in the frames of the stand-in world, see
+standin.world.run_frame.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from math import inf
+from threading import Thread
+from time import perf_counter
+
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class GameThread(Thread):
+    pass
+
+
+class Delay:
+    def __init__(self, delay, callback, args=(), kwargs=None,
+                 cancel_on_level_end=False):
+
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.running = True
+
+        world.add_timer(perf_counter() + delay, self._execute)
+
+    def _execute(self):
+        if not self.running:
+            return
+
+        self.running = False
+        self.callback(*self.args, **self.kwargs)
+
+    def cancel(self):
+        if not self.running:
+            raise ValueError('Delay already executed.')
+
+        self.running = False
+
+
+class Repeat:
+    def __init__(self, callback, args=(), kwargs=None,
+                 cancel_on_level_end=False):
+
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+
+        self.interval = None
+        self.remaining = 0
+        self._generation = 0
+
+    @property
+    def running(self):
+        return self.interval is not None
+
+    def start(self, interval, limit=inf, execute_on_start=False):
+        if self.running:
+            return
+
+        self.interval = interval
+        self.remaining = limit
+        self._generation += 1
+
+        if execute_on_start:
+            self._execute(self._generation)
+        else:
+            self._schedule()
+
+    def stop(self):
+        self.interval = None
+        self._generation += 1
+
+    def _schedule(self):
+        generation = self._generation
+        world.add_timer(
+            perf_counter() + self.interval,
+            lambda: self._execute(generation))
+
+    def _execute(self, generation):
+        if generation != self._generation or not self.running:
+            return
+
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.interval = None
+        else:
+            self._schedule()
+
+        self.callback(*self.args, **self.kwargs)
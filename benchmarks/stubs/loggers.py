@@ -0,0 +1,57 @@
+"""Stand-in of the Source.Python loggers module.
+
+Messages go to the standard logging module, so they are hidden unless the
+benchmarks run with --verbose.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import logging
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _LogInstance:
+    def __init__(self, name):
+        self.name = name
+        self._logger = logging.getLogger(name)
+        self._children = {}
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+
+        child = self._children.get(attr)
+        if child is None:
+            child = self._children[attr] = _LogInstance(
+                self.name + '.' + attr)
+
+        return child
+
+    def log_critical(self, msg, *args, **kwargs):
+        self._logger.critical(msg, *args, **kwargs)
+
+    def log_debug(self, msg, *args, **kwargs):
+        self._logger.debug(msg, *args, **kwargs)
+
+    def log_exception(self, msg, *args, **kwargs):
+        self._logger.exception(msg, *args, **kwargs)
+
+    def log_info(self, msg, *args, **kwargs):
+        self._logger.info(msg, *args, **kwargs)
+
+    def log_message(self, msg, *args, **kwargs):
+        self._logger.info(msg, *args, **kwargs)
+
+    def log_warning(self, msg, *args, **kwargs):
+        self._logger.warning(msg, *args, **kwargs)
+
+
+class LogManager(_LogInstance):
+    def __init__(self, name, level, areas, filepath=None, log_format=None,
+                 date_format=None):
+
+        super().__init__(name)
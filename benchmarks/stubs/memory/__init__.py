@@ -0,0 +1,30 @@
+"""Stand-in of the Source.Python memory package.
+
+Pointers wrap Python objects, so that make_object can give them back.
+"""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Pointer:
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    # Offsets into the object are ignored, e.g. the IClient part of a
+    # CBaseClient is the same object here
+    def __add__(self, offset):
+        return self
+
+    __radd__ = __add__
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_object_pointer(obj):
+    return Pointer(obj)
+
+
+def make_object(cls, ptr):
+    return cls(ptr.obj)
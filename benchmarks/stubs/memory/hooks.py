@@ -0,0 +1,26 @@
+"""Stand-in of the Source.Python memory.hooks module."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PreHook:
+    def __init__(self, *functions):
+        self._functions = functions
+
+    def __call__(self, callback):
+        for function in self._functions:
+            function.add_pre_hook(callback)
+
+        return callback
+
+
+class PostHook:
+    def __init__(self, *functions):
+        self._functions = functions
+
+    def __call__(self, callback):
+        for function in self._functions:
+            function.add_post_hook(callback)
+
+        return callback
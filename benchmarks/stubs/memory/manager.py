@@ -0,0 +1,66 @@
+"""Stand-in of the Source.Python memory.manager module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+from configobj import ConfigObj
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Function:
+    """Virtual function that does nothing but call its hooks."""
+    def __init__(self, name):
+        self.name = name
+        self.call_count = 0
+        self.pre_hooks = []
+        self.post_hooks = []
+
+    def __call__(self, *args):
+        self.call_count += 1
+
+        for callback in self.pre_hooks:
+            result = callback(args)
+            if result is not None:
+                return result
+
+        return_value = None
+        for callback in self.post_hooks:
+            result = callback(args, return_value)
+            if result is not None:
+                return_value = result
+
+        return return_value
+
+    def add_pre_hook(self, callback):
+        self.pre_hooks.append(callback)
+
+    def add_post_hook(self, callback):
+        self.post_hooks.append(callback)
+
+    def remove_pre_hook(self, callback):
+        self.pre_hooks.remove(callback)
+
+    def remove_post_hook(self, callback):
+        self.post_hooks.remove(callback)
+
+
+class _CustomType:
+    def __init__(self, obj=None):
+        self._obj = obj
+
+
+class TypeManager(dict):
+    def create_type_from_file(self, type_name, file_path):
+        namespace = {}
+        for section in ConfigObj(file_path).values():
+            if not isinstance(section, dict):
+                continue
+
+            for name in section:
+                namespace[name] = Function(name)
+
+        cls = self[type_name] = type(type_name, (_CustomType, ), namespace)
+        return cls
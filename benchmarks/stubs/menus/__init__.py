@@ -0,0 +1,121 @@
+"""Stand-in of the Source.Python menus package.
+
+Menus are built and rendered (options translated to the recipient's
+language) right away instead of on the next frame.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _render(text, language):
+    if hasattr(text, 'get_string'):
+        return text.get_string(language)
+
+    return str(text)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _BaseMenu(list):
+    def __init__(self, data=None, select_callback=None, build_callback=None,
+                 close_callback=None):
+
+        super().__init__(data or ())
+
+        self.select_callback = select_callback
+        self.build_callback = build_callback
+        self.close_callback = close_callback
+
+        # Rendered options of the last send, by player index
+        self.rendered = {}
+
+    def register_select_callback(self, callback):
+        self.select_callback = callback
+        return callback
+
+    def register_build_callback(self, callback):
+        self.build_callback = callback
+        return callback
+
+    def register_close_callback(self, callback):
+        self.close_callback = callback
+        return callback
+
+    def send(self, *indexes):
+        for index in indexes:
+            if self.build_callback is not None:
+                self.build_callback(self, index)
+
+            self.rendered[index] = self._render(
+                world.get_player(index).language)
+
+    def close(self, *indexes):
+        for index in indexes:
+            self.rendered.pop(index, None)
+
+    def select(self, index, option):
+        """Simulate the selection of the given option by the player."""
+        if self.select_callback is not None:
+            return self.select_callback(self, index, option)
+
+    def _render(self, language):
+        return [
+            _render(getattr(option, 'text', option), language)
+            for option in self
+        ]
+
+
+class PagedMenu(_BaseMenu):
+    def __init__(self, data=None, select_callback=None, build_callback=None,
+                 close_callback=None, description=None, title=None,
+                 top_separator='-' * 30, bottom_separator='-' * 30,
+                 fill=True, parent_menu=None):
+
+        super().__init__(data, select_callback, build_callback, close_callback)
+
+        self.title = title
+        self.description = description
+        self.parent_menu = parent_menu
+
+    def _render(self, language):
+        rendered = super()._render(language)
+        if self.title is not None:
+            rendered.insert(0, _render(self.title, language))
+
+        return rendered
+
+
+class SimpleMenu(_BaseMenu):
+    pass
+
+
+class Text:
+    def __init__(self, text):
+        self.text = text
+
+
+class PagedOption:
+    def __init__(self, text, value=None, highlight=True, selectable=True):
+        self.text = text
+        self.value = value
+        self.highlight = highlight
+        self.selectable = selectable
+
+
+class SimpleOption:
+    def __init__(self, choice_index, text, value=None, highlight=True,
+                 selectable=True):
+
+        self.choice_index = choice_index
+        self.text = text
+        self.value = value
+        self.highlight = highlight
+        self.selectable = selectable
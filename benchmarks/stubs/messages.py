@@ -0,0 +1,51 @@
+"""Stand-in of the Source.Python messages module.
+
+Messages are not sent anywhere, but translated for every recipient as the
+real user messages are.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _UserMessage:
+    def __init__(self, message='', *args, **kwargs):
+        self.message = message
+
+    def send(self, *player_indexes, **tokens):
+        from filters.players import PlayerIter
+
+        indexes = []
+        for item in player_indexes:
+            if isinstance(item, int):
+                indexes.append(item)
+            else:
+                indexes.extend(player.index for player in item)
+
+        if not player_indexes:
+            indexes.extend(player.index for player in PlayerIter('human'))
+
+        for index in indexes:
+            if hasattr(self.message, 'get_string'):
+                self.message.get_string(
+                    world.get_player(index).language, **tokens)
+
+            world.messages_sent += 1
+
+
+class SayText(_UserMessage):
+    pass
+
+
+class SayText2(_UserMessage):
+    pass
+
+
+class TextMsg(_UserMessage):
+    pass
@@ -0,0 +1,62 @@
+"""Stand-in of the MOTDPlayer package.
+
+Pages are "opened" right away and the data they send is JSON-encoded and
+dropped, as the browser side doesn't exist here.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PageMeta(type):
+    # page_id -> page class
+    pages = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+
+        if not namespace.get('abstract', False):
+            PageMeta.pages[cls.page_id] = cls
+
+
+class Page(metaclass=PageMeta):
+    abstract = True
+
+    plugin_id = None
+    page_id = None
+    ws_support = False
+
+    def __init__(self, index, page_request_type):
+        self.index = index
+        self.page_request_type = page_request_type
+
+        self.bytes_sent = 0
+
+    @property
+    def is_websocket(self):
+        return self.page_request_type == 'WEBSOCKET'
+
+    @classmethod
+    def send(cls, index):
+        page = cls(index, 'INIT')
+        page.on_data_received({'spa_action': 'init'})
+        return page
+
+    def send_data(self, data):
+        self.bytes_sent += len(json.dumps(data))
+        world.messages_sent += 1
+
+    def on_data_received(self, data):
+        pass
+
+    def on_error(self, error):
+        pass
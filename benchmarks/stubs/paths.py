@@ -0,0 +1,32 @@
+"""Stand-in of the Source.Python paths module.
+
+Plugins are imported from the repository, everything else lives in the
+temporary game directory given by the SPA_BENCHMARK_GAME_PATH environment
+variable (see benchmarks/environment.py).
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import os
+
+# Site-Package
+from path import Path
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+REPOSITORY_SRCDS_PATH = Path(__file__).abspath().parent.parent.parent / 'srcds'
+
+GAME_PATH = Path(os.environ['SPA_BENCHMARK_GAME_PATH'])
+BASE_PATH = GAME_PATH / 'addons' / 'source-python'
+DATA_PATH = BASE_PATH / 'data'
+PLUGIN_DATA_PATH = DATA_PATH / 'plugins'
+PLUGIN_PATH = REPOSITORY_SRCDS_PATH / 'addons' / 'source-python' / 'plugins'
+CFG_PATH = GAME_PATH / 'cfg' / 'source-python'
+LOG_PATH = GAME_PATH / 'logs' / 'source-python'
+SOUND_PATH = GAME_PATH / 'sound' / 'source-python'
+TRANSLATION_PATH = GAME_PATH / 'resource' / 'source-python' / 'translations'
+EVENT_PATH = GAME_PATH / 'resource' / 'source-python' / 'events'
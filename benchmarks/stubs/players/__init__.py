@@ -0,0 +1,33 @@
+"""Stand-in of the Source.Python players package."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-in
+from listeners.tick import Delay
+from standin import world
+
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Client:
+    """Stand-in of the engine's server-side client (IClient)."""
+    def __init__(self, state):
+        self._state = state
+
+    @property
+    def name(self):
+        return self._state.name
+
+    @property
+    def steamid(self):
+        return self._state.steamid
+
+    def disconnect(self, message=''):
+        Delay(0, self._disconnect)
+
+    def _disconnect(self):
+        if world.players.get(self._state.index) is self._state:
+            world.disconnect(self._state.index)
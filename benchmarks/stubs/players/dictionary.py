@@ -0,0 +1,59 @@
+"""Stand-in of the Source.Python players.dictionary module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from weakref import WeakSet
+
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_dictionaries = WeakSet()
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PlayerDictionary(dict):
+    def __init__(self, factory=None, *args, **kwargs):
+        super().__init__()
+
+        self._factory = factory
+        self._args = args
+        self._kwargs = kwargs
+
+        _dictionaries.add(self)
+
+    def __missing__(self, index):
+        # Validate the index the same way the entity conversion does
+        world.get_player(index)
+
+        instance = self[index] = self._factory(
+            index, *self._args, **self._kwargs)
+        return instance
+
+    def __hash__(self):
+        return id(self)
+
+    def from_userid(self, userid):
+        return self[world.index_from_userid(userid)]
+
+    def on_automatically_removed(self, index):
+        pass
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _on_player_removed(index):
+    for dictionary in tuple(_dictionaries):
+        if index in dictionary:
+            dictionary.on_automatically_removed(index)
+            dictionary.pop(index, None)
+
+world.removal_callbacks.append(_on_player_removed)
@@ -0,0 +1,81 @@
+"""Stand-in of the Source.Python players.entity module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from listeners.tick import Delay
+
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Player:
+    def __init__(self, index):
+        self._state = world.get_player(index)
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, Player) and other.index == self.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    @classmethod
+    def from_userid(cls, userid):
+        return cls(world.index_from_userid(userid))
+
+    @property
+    def userid(self):
+        return self._state.userid
+
+    @property
+    def steamid(self):
+        return self._state.steamid
+
+    @property
+    def name(self):
+        return self._state.name
+
+    @property
+    def address(self):
+        return self._state.address
+
+    @property
+    def language(self):
+        return self._state.language
+
+    @property
+    def team(self):
+        return self._state.team
+
+    @property
+    def dead(self):
+        return self._state.dead
+
+    def is_fake_client(self):
+        return self._state.fake_client
+
+    def is_hltv(self):
+        return self._state.hltv
+
+    def kick(self, message=''):
+        Delay(0, self._kick)
+
+    def _kick(self):
+        if world.players.get(self.index) is self._state:
+            world.disconnect(self.index)
+
+    def spawn(self, force=False):
+        self._state.dead = False
+
+    def slay(self):
+        self._state.dead = True
+
+    def delay(self, delay, callback, args=(), kwargs=None,
+              cancel_on_level_end=False):
+
+        return Delay(delay, callback, args, kwargs, cancel_on_level_end)
@@ -0,0 +1,22 @@
+"""Stand-in of the Source.Python players.helpers module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Stand-in
+from standin import world
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_client_language(index):
+    return world.get_player(index).language
+
+
+def index_from_userid(userid):
+    return world.index_from_userid(userid)
+
+
+def userid_from_index(index):
+    return world.get_player(index).userid
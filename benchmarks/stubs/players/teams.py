@@ -0,0 +1,7 @@
+"""Stand-in of the Source.Python players.teams module."""
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+teams_by_number = {0: 'un', 1: 'spec', 2: 't', 3: 'ct'}
+teams_by_name = {name: number for number, name in teams_by_number.items()}
@@ -0,0 +1,57 @@
+"""Stand-in of the Source.Python plugins.command module.
+
+Sub-commands are only registered, the benchmarks call them directly via
+SubCommandManager.execute.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python
+from translations.strings import LangStrings
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CommandInfo:
+    def __init__(self, index=None):
+        self.index = index
+
+
+class SubCommandManager:
+    def __init__(self, manager, command, logger=None):
+        self.manager = manager
+        self.command = command
+        self.logger = logger
+        self.prefix = '[{}] '.format(command.upper())
+        self.translations = LangStrings('_core/plugin_strings')
+
+        self.server_sub_commands = {}
+        self.client_sub_commands = {}
+
+    def server_sub_command(self, commands):
+        def decorator(callback):
+            self.server_sub_commands[tuple(commands)] = callback
+            return callback
+
+        return decorator
+
+    def client_sub_command(self, commands, permission=None):
+        def decorator(callback):
+            self.client_sub_commands[tuple(commands)] = callback
+            return callback
+
+        return decorator
+
+    def execute(self, commands, *args, index=None):
+        """Call the sub-command like the server console or a client would.
+
+        :param commands: Sub-command names, e.g. ('plugin', 'load').
+        """
+        if index is None:
+            callback = self.server_sub_commands[tuple(commands)]
+        else:
+            callback = self.client_sub_commands[tuple(commands)]
+
+        return callback(CommandInfo(index), *args)
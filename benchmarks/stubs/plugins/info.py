@@ -0,0 +1,28 @@
+"""Stand-in of the Source.Python plugins.info module."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PluginInfo(dict):
+    def __init__(self, name, verbose_name=None, author=None,
+                 description=None, version=None, url=None, permissions=None,
+                 public_convar=True, display_in_listing=None, **kwargs):
+
+        super().__init__(**kwargs)
+
+        self.name = name
+        self.verbose_name = verbose_name or name
+        self.author = author
+        self.description = description
+        self.version = version or 'unversioned'
+        self.url = url
+        self.permissions = permissions or []
+        self.public_convar = None
+        self.display_in_listing = display_in_listing or []
+
+    def __getattr__(self, attr):
+        try:
+            return self[attr]
+        except KeyError:
+            raise AttributeError(attr) from None
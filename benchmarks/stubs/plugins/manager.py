@@ -0,0 +1,87 @@
+"""Stand-in of the Source.Python plugins.manager module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from importlib import import_module
+import sys
+from traceback import print_exc
+
+# Source.Python
+from plugins.info import PluginInfo
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Plugin:
+    def __init__(self, name, manager):
+        self.name = name
+        self.module = None
+        self.info = None
+
+        import_name = manager._base_import + name + '.' + name
+        self.module = import_module(import_name)
+
+        info_module = sys.modules.get(manager._base_import + name + '.info')
+        self.info = getattr(info_module, 'info', None) or PluginInfo(name)
+
+        if hasattr(self.module, 'load'):
+            self.module.load()
+
+    def unload(self):
+        if hasattr(self.module, 'unload'):
+            self.module.unload()
+
+
+class PluginManager(dict):
+    def __init__(self, base_import=''):
+        super().__init__()
+
+        self._base_import = base_import
+        self._current_plugin = None
+
+    def load(self, plugin_name):
+        if plugin_name in self:
+            return self[plugin_name]
+
+        self._current_plugin = plugin_name
+        try:
+            plugin = Plugin(plugin_name, self)
+        except Exception:
+            # Report and carry on as Source.Python does
+            print_exc()
+            self._remove_modules(plugin_name)
+            return None
+
+        self[plugin_name] = plugin
+        return plugin
+
+    def unload(self, plugin_name):
+        if plugin_name not in self:
+            return
+
+        self[plugin_name].unload()
+        self._current_plugin = plugin_name
+        self._remove_modules(plugin_name)
+        dict.__delitem__(self, plugin_name)
+
+    def __delitem__(self, plugin_name):
+        self.unload(plugin_name)
+
+    def get_plugin_info(self, name):
+        return PluginInfo(name.split('.')[0])
+
+    def _remove_modules(self, plugin_name):
+        base_name = self._base_import + plugin_name
+        for module in list(sys.modules):
+            if self._is_related_module(base_name, module):
+                del sys.modules[module]
+
+    @staticmethod
+    def _is_related_module(base_name, module):
+        return module == base_name or module.startswith(base_name + '.')
+
+# The singleton object of the PluginManager class.
+plugin_manager = PluginManager()
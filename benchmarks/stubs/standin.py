@@ -0,0 +1,205 @@
+"""Stand-in engine state shared by the Source.Python stubs.
+
+Holds the players that are "on the server", the timers of Delay/Repeat
+and the permissions of admins. Provides the engine side of connecting,
+activating and disconnecting players, firing game events and running
+server frames.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from heapq import heappop, heappush
+from itertools import count
+from threading import Lock
+from time import perf_counter
+from traceback import print_exc
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class PlayerState:
+    """Engine-side data of a single player."""
+    def __init__(self, index, userid, name, steamid, address,
+                 fake_client=False, hltv=False, language='en'):
+
+        self.index = index
+        self.userid = userid
+        self.name = name
+        self.steamid = steamid
+        self.address = address
+        self.fake_client = fake_client
+        self.hltv = hltv
+        self.language = language
+
+        self.team = 0
+        self.dead = True
+        self.active = False
+
+
+class _Pointer:
+    """Stand-in of memory.Pointer for the OnClientConnect arguments."""
+    def __init__(self, value=None):
+        self.value = value
+
+    def set_bool(self, value):
+        self.value = value
+
+    def set_string_array(self, value):
+        self.value = value
+
+
+class _World:
+    """State of the stand-in server."""
+    def __init__(self, max_clients=64):
+        self.max_clients = max_clients
+
+        self.players = {}
+        self.userids = {}
+        self.admin_steamids = set()
+
+        # Called with the index after OnClientDisconnect listeners, as the
+        # entity deletion comes after them
+        self.removal_callbacks = []
+
+        self.messages_sent = 0
+        self.listener_exceptions = 0
+        self.frame_count = 0
+
+        self._userid_counter = count(2)
+        self._timers = []
+        self._timer_counter = count()
+        self._timer_lock = Lock()
+
+    # Players
+    def get_player(self, index):
+        player = self.players.get(index)
+        if player is None:
+            raise ValueError(
+                "Conversion from \"Index\" ({}) to \"Player\" "
+                "failed.".format(index))
+        return player
+
+    def index_from_userid(self, userid):
+        try:
+            return self.userids[userid]
+        except KeyError:
+            raise ValueError(
+                "Conversion from \"Userid\" ({}) to \"Index\" "
+                "failed.".format(userid)) from None
+
+    def get_free_index(self):
+        for index in range(1, self.max_clients + 1):
+            if index not in self.players:
+                return index
+
+        raise ValueError("The server is full")
+
+    def connect(self, name, steamid, address, fake_client=False,
+                hltv=False, language='en'):
+        """Let a player connect, notify the OnClientConnect listeners.
+
+        :return: PlayerState instance or None if a listener has rejected
+            the connection.
+        :rtype: PlayerState
+        """
+        from listeners import on_client_connect_listener_manager
+
+        index = self.get_free_index()
+        player = PlayerState(
+            index, next(self._userid_counter), name, steamid, address,
+            fake_client, hltv, language)
+
+        allow_connect = _Pointer(True)
+        self.notify(
+            on_client_connect_listener_manager, allow_connect, index, name,
+            address, _Pointer(), 255)
+
+        if not allow_connect.value:
+            return None
+
+        self.players[index] = player
+        self.userids[player.userid] = index
+        return player
+
+    def activate(self, index):
+        """Put the player into the game, notify OnClientActive listeners."""
+        from listeners import on_client_active_listener_manager
+
+        player = self.get_player(index)
+        player.active = True
+        self.notify(on_client_active_listener_manager, index)
+
+    def validate_networkid(self, index, steamid=None):
+        """Finish the SteamID validation of the player."""
+        from listeners import on_networkid_validated_listener_manager
+
+        player = self.get_player(index)
+        if steamid is not None:
+            player.steamid = steamid
+
+        self.notify(
+            on_networkid_validated_listener_manager, player.name,
+            player.steamid)
+
+    def disconnect(self, index):
+        """Remove the player, notify OnClientDisconnect listeners."""
+        from listeners import on_client_disconnect_listener_manager
+
+        player = self.get_player(index)
+        self.notify(on_client_disconnect_listener_manager, index)
+        self.notify(self.removal_callbacks, index)
+
+        del self.players[index]
+        del self.userids[player.userid]
+
+    def fire_event(self, event_name, **variables):
+        """Call the handlers of the given game event."""
+        from events.manager import event_registry
+
+        event_registry.fire(event_name, variables)
+
+    def notify(self, manager, *args):
+        """Notify the listeners, report exceptions as Source.Python does."""
+        for callback in tuple(manager):
+            try:
+                callback(*args)
+            except Exception:
+                self.listener_exceptions += 1
+                print_exc()
+
+    # Timers
+    def add_timer(self, run_at, callback):
+        with self._timer_lock:
+            heappush(
+                self._timers, (run_at, next(self._timer_counter), callback))
+
+    def run_frame(self):
+        """Run a server frame: OnTick listeners, then the due timers."""
+        from listeners import on_tick_listener_manager
+
+        self.frame_count += 1
+        self.notify(on_tick_listener_manager)
+
+        now = perf_counter()
+        while True:
+            with self._timer_lock:
+                if not self._timers or self._timers[0][0] > now:
+                    break
+
+                callback = heappop(self._timers)[2]
+
+            try:
+                callback()
+            except Exception:
+                self.listener_exceptions += 1
+                print_exc()
+
+    @property
+    def pending_timers(self):
+        return len(self._timers)
+
+# The singleton object of the _World class.
+world = _World()
@@ -0,0 +1,52 @@
+"""Stand-in of the Source.Python steam module."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import re
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_STEAMID2_RE = re.compile(r'^STEAM_[0-5]:([01]):(\d+)$')
+_STEAMID3_RE = re.compile(r'^\[U:1:(\d+)\]$')
+
+# Base value of 64-bit SteamIDs of individual public accounts
+_STEAMID64_BASE = 76561197960265728
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class SteamID:
+    def __init__(self, account_id):
+        self.account_id = account_id
+
+    @classmethod
+    def parse(cls, steamid):
+        steamid = str(steamid)
+
+        match = _STEAMID2_RE.match(steamid)
+        if match is not None:
+            return cls(int(match.group(2)) * 2 + int(match.group(1)))
+
+        match = _STEAMID3_RE.match(steamid)
+        if match is not None:
+            return cls(int(match.group(1)))
+
+        if steamid.isdigit() and int(steamid) >= _STEAMID64_BASE:
+            return cls(int(steamid) - _STEAMID64_BASE)
+
+        raise ValueError('Invalid SteamID "{}".'.format(steamid))
+
+    def to_uint64(self):
+        return _STEAMID64_BASE + self.account_id
+
+    def to_steamid2(self):
+        return 'STEAM_1:{}:{}'.format(
+            self.account_id % 2, self.account_id // 2)
+
+    def to_steamid3(self):
+        return '[U:1:{}]'.format(self.account_id)
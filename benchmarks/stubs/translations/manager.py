@@ -0,0 +1,15 @@
+"""Stand-in of the Source.Python translations.manager module."""
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _LanguageManager(dict):
+    default = 'en'
+    fallback = 'en'
+
+    def get_language(self, language):
+        return language
+
+# The singleton object of the _LanguageManager class.
+language_manager = _LanguageManager()
@@ -0,0 +1,68 @@
+"""Stand-in of the Source.Python translations.strings module.
+
+Reads the same translation files from resource/source-python/translations.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+from configobj import ConfigObj
+
+# Source.Python
+from paths import TRANSLATION_PATH
+from translations.manager import language_manager
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class TranslationStrings(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.tokens = {}
+
+    def get_string(self, language=None, **tokens):
+        # Players are accepted in place of their languages
+        language = getattr(language, 'language', language)
+        language = language or language_manager.default
+        text = self.get(language, self.get(language_manager.fallback))
+        if text is None:
+            return ''
+
+        tokens = dict(self.tokens, **tokens)
+        for key, value in tokens.items():
+            if isinstance(value, TranslationStrings):
+                tokens[key] = value.get_string(language)
+
+        try:
+            return text.format(**tokens)
+        except (IndexError, KeyError, ValueError):
+            return text
+
+    def tokenized(self, **tokens):
+        result = TranslationStrings(self)
+        result.tokens = dict(self.tokens, **tokens)
+        return result
+
+
+class LangStrings(dict):
+    def __init__(self, infile, encoding='utf_8'):
+        super().__init__()
+
+        path = TRANSLATION_PATH / (infile + '.ini')
+        if not path.isfile():
+            return
+
+        for key, section in ConfigObj(path, encoding=encoding).items():
+            if not isinstance(section, dict):
+                continue
+
+            self[key] = TranslationStrings(section)
+
+    def __missing__(self, key):
+        # Keep going with the string name, as the engine would print it
+        strings = self[key] = TranslationStrings({
+            language_manager.fallback: key})
+        return strings
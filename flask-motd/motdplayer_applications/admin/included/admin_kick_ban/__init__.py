@@ -14,6 +14,20 @@ MAX_BAN_ID_ABS_VALUE = 3000000000
 MAX_REASON_LENGTH = 255
 MAX_BAN_DURATION = 315360000  # 10 years. For a permanent ban use -1
 MIN_BAN_DURATION = -1
+MAX_METADATA_ETAG_LENGTH = 64
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def filter_metadata_etag(metadata_etag):
+    if not isinstance(metadata_etag, str):
+        return None
+
+    if len(metadata_etag) > MAX_METADATA_ETAG_LENGTH:
+        return None
+
+    return metadata_etag
 
 
 # =============================================================================
@@ -222,6 +236,7 @@ def callback(ex_data_func, data):
     if data['action'] == "get-ban-data":
         return ex_data_func({
             'action': "get-ban-data",
+            'metadataEtag': filter_metadata_etag(data.get('metadataEtag')),
         })
 
 
@@ -272,4 +287,5 @@ def callback(data):
     if data['action'] == "get-ban-data":
         return {
             'action': "get-ban-data",
+            'metadataEtag': filter_metadata_etag(data.get('metadataEtag')),
         }
@@ -98,6 +98,55 @@ var PLUGIN = function () {
         };
         stockBanReasons = [];
 
+        // Stock reasons and durations only change with the server config or
+        // the language, so we keep them for the whole session and only ask
+        // the server to send them again when its ETag differs from ours
+        var METADATA_STORAGE_KEY = 'admin_kick_ban.review_ban_metadata';
+        var metadataEtag = null;
+
+        var setMetadata = function (reasons, durations) {
+            stockBanReasons = [];
+            reasons.forEach(function (val, i, arr) {
+                stockBanReasons.push(new StockBanReason(val['hidden'], val['title'], val['duration-value'], val['duration-title']));
+            });
+            stockBanDurations = [];
+            durations.forEach(function (val, i, arr) {
+                stockBanDurations.push(new StockBanDuration(val['value'], val['title']));
+            });
+        };
+        var loadStoredMetadata = function () {
+            try {
+                var stored = JSON.parse(window.sessionStorage.getItem(METADATA_STORAGE_KEY));
+                if (!stored)
+                    return;
+
+                setMetadata(stored['reasons'], stored['durations']);
+                metadataEtag = stored['etag'];
+            }
+            catch (e) {
+                metadataEtag = null;
+            }
+        };
+        var applyMetadata = function (data) {
+            if (!('reasons' in data && 'durations' in data))
+                return;
+
+            setMetadata(data['reasons'], data['durations']);
+            metadataEtag = data['metadataEtag'];
+
+            try {
+                window.sessionStorage.setItem(METADATA_STORAGE_KEY, JSON.stringify({
+                    etag: metadataEtag,
+                    reasons: data['reasons'],
+                    durations: data['durations'],
+                }));
+            }
+            catch (e) {
+                // Storage is unavailable, we'll just fetch metadata next time
+            }
+        };
+        loadStoredMetadata();
+
         var mode = 'unknown';
         this.tryWS = function (wsSuccessCallback, wsMessageCallback, wsCloseCallback, wsErrorCallback) {
             MOTDPlayer.openWSConnection(function () {
@@ -111,12 +160,7 @@ var PLUGIN = function () {
                         data['bans'].forEach(function (val, i, arr) {
                             addBan(val['uniqueid'], val['banId'], val['name']);
                         });
-                        data['reasons'].forEach(function (val, i, arr) {
-                            stockBanReasons.push(new StockBanReason(val['hidden'], val['title'], val['duration-value'], val['duration-title']));
-                        });
-                        data['durations'].forEach(function (val, i, arr) {
-                            stockBanDurations.push(new StockBanDuration(val['value'], val['title']));
-                        });
+                        applyMetadata(data);
                         break;
                     case 'remove-ban-id':
                         removeBanId(data['banId']);
@@ -143,19 +187,13 @@ var PLUGIN = function () {
                 case 'ajax':
                     MOTDPlayer.post({
                         action: 'get-ban-data',
+                        metadataEtag: metadataEtag,
                     }, function (data) {
                         clearBans();
                         data['bans'].forEach(function (val, i, arr) {
                             addBan(val['uniqueid'], val['banId'], val['name']);
                         });
-                        stockBanReasons = [];
-                        data['reasons'].forEach(function (val, i, arr) {
-                            stockBanReasons.push(new StockBanReason(val['hidden'], val['title'], val['duration-value'], val['duration-title']));
-                        });
-                        stockBanDurations = [];
-                        data['durations'].forEach(function (val, i, arr) {
-                            stockBanDurations.push(new StockBanDuration(val['value'], val['title']));
-                        });
+                        applyMetadata(data);
                     }, function (err) {
                         // TODO: Display error
                     });
@@ -164,6 +202,7 @@ var PLUGIN = function () {
                 case 'ws':
                     MOTDPlayer.sendWSData({
                         action: 'get-ban-data',
+                        metadataEtag: metadataEtag,
                     });
                     break;
             }
@@ -7,15 +7,24 @@
 from commands.typed import TypedClientCommand, TypedSayCommand
 
 # Source.Python Admin
+# Has to be imported first to be able to time other imports
+from .core.startup_profiler import startup_profiler
+
 from .core import models
+from .core.actions import action_queue
+from .core.audit import audit_log
 from .core.clients import clients
 from .core.events.storage import admin_resource_list
 from .core.listeners import (on_spa_loaded_listener_manager,
                              on_spa_unloaded_listener_manager)
 from .core.frontends.menus import AdminMenuSection
 from .core.frontends.motd import MainPage
-from .core.orm import Base, engine
+from .core.metrics import metrics
+from .core.orm import Base, engine, query_stats
+from .core.sampling_profiler import sampling_profiler
 from .core.plugins.command import admin_command_manager
+from .core.plugins.queue import plugin_queue
+from .core.scheduler import job_scheduler
 from .core.strings import strings_common
 from .info import info
 
@@ -23,7 +32,8 @@ from .info import info
 # =============================================================================
 # >> DATABASE CREATION
 # =============================================================================
-Base.metadata.create_all(engine)
+with startup_profiler.phase("database tables"):
+    Base.metadata.create_all(engine)
 
 
 # =============================================================================
@@ -32,18 +42,39 @@ Base.metadata.create_all(engine)
 main_menu = AdminMenuSection(None, strings_common['title main'], 'admin')
 
 
+# =============================================================================
+# >> METRICS
+# =============================================================================
+metrics.register_collector('scheduler', job_scheduler.get_metrics)
+metrics.register_collector('actions', action_queue.get_metrics)
+metrics.register_collector('audit_log', audit_log.get_metrics)
+metrics.register_collector('database', query_stats.get_metrics)
+
+
 # =============================================================================
 # >> LOAD & UNLOAD FUNCTIONS
 # =============================================================================
 def load():
-    admin_resource_list.load_all_events()
-    on_spa_loaded_listener_manager.notify()
+    with startup_profiler.phase("event loading"):
+        admin_resource_list.load_all_events()
+
+    with startup_profiler.phase("loaded listeners"):
+        on_spa_loaded_listener_manager.notify()
+
     clients.broadcast(strings_common['load'])
+    metrics.start_dumping()
+
+    # Keep timing the imports of the plugins that are loaded on startup
+    plugin_queue.call_when_idle(startup_profiler.finish)
 
 
 def unload():
     admin_command_manager.unload_all_plugins()
     on_spa_unloaded_listener_manager.notify()
+    metrics.stop_dumping()
+    sampling_profiler.stop()
+    job_scheduler.stop()
+    audit_log.stop()
     clients.broadcast(strings_common['unload'])
 
 
@@ -62,3 +93,30 @@ def _admin_command(command_info):
 @TypedSayCommand(['/ascreen'], 'admin.motd')
 def _admin_command(command_info):
     MainPage.send(command_info.index)
+
+
+# =============================================================================
+# >> SUB-COMMANDS
+# =============================================================================
+@admin_command_manager.server_sub_command(['profile', 'startup'])
+def _admin_profile_startup(command_info):
+    admin_command_manager.logger.log_message(startup_profiler.get_report())
+
+
+@admin_command_manager.server_sub_command(['profile', 'start'])
+def _admin_profile_start(command_info, seconds: float = 60):
+    if not sampling_profiler.start(seconds):
+        admin_command_manager.logger.log_message(
+            "The profiler is already running")
+
+
+@admin_command_manager.server_sub_command(['profile', 'stop'])
+def _admin_profile_stop(command_info):
+    if not sampling_profiler.stop():
+        admin_command_manager.logger.log_message(
+            "The profiler is not running")
+
+
+@admin_command_manager.server_sub_command(['stats'])
+def _admin_stats(command_info):
+    admin_command_manager.logger.log_message(metrics.get_report())
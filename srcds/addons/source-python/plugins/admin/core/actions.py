@@ -0,0 +1,207 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import deque
+from threading import get_ident
+from time import perf_counter
+
+# Source.Python
+from listeners import OnTick
+from messages import SayText2
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .strings import strings_common
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# How much time queued admin actions may take per server frame
+ACTION_TICK_BUDGET = config.getfloat(
+    'actions', 'tick_budget_milliseconds', fallback=2.0) / 1000
+
+actions_logger = admin_core_logger.actions
+
+# Identifier of the game thread
+_game_thread_ident = get_ident()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _send_summary(messages):
+    message = messages[0]
+    if len(messages) > 1:
+        message = strings_common['batch_summary'].tokenized(
+            message=message, count=len(messages) - 1)
+
+    SayText2(strings_common['chat_base'].tokenized(message=message)).send()
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _ActionBatch:
+    """Admin actions that were requested at once, e.g. by selecting several
+    players. Chat broadcasts they produce are merged into one message.
+    """
+    def __init__(self, actions, owner):
+        self.actions = deque(actions)
+        self.owner = owner
+        self.broadcasts = []
+
+
+class _ActionQueue:
+    """Run admin actions on the game thread within a per-tick time budget.
+
+    At least one action runs every tick, so a batch always makes progress.
+    """
+    def __init__(self, tick_budget=ACTION_TICK_BUDGET):
+        self.tick_budget = tick_budget
+
+        # Appending to a deque is thread-safe, so batches may be added from
+        # any thread
+        self._batches = deque()
+        self._current_batch = None
+
+        self.last_tick_time = 0.0
+        self.peak_tick_time = 0.0
+        self.executed_actions = 0
+        self.failed_actions = 0
+
+    def add_batch(self, actions, owner=None):
+        """Schedule the given actions.
+
+        :param actions: Iterable of (callback, args) tuples.
+        :param owner: Optional client that requested the actions. The rest
+        of the batch is dropped if that client disconnects.
+        """
+        actions = tuple(actions)
+        if actions:
+            self._batches.append(_ActionBatch(actions, owner))
+
+    def collect_broadcast(self, message):
+        """Hold back a chat broadcast made by the running action.
+
+        :param message: TranslationStrings instance to broadcast.
+        :return: Whether the broadcast was taken over by the queue.
+        :rtype: bool
+        """
+        if self._current_batch is None or get_ident() != _game_thread_ident:
+            return False
+
+        self._current_batch.broadcasts.append(message)
+        return True
+
+    @property
+    def queued_actions(self):
+        return sum(len(batch.actions) for batch in tuple(self._batches))
+
+    def _run_action(self, batch):
+        callback, args = batch.actions.popleft()
+
+        self._current_batch = batch
+        try:
+            callback(*args)
+        except Exception:
+            self.failed_actions += 1
+            actions_logger.log_exception(
+                "Admin action {!r} has failed".format(callback))
+        else:
+            self.executed_actions += 1
+        finally:
+            self._current_batch = None
+
+    @staticmethod
+    def _flush_broadcasts(batch):
+        if batch.broadcasts:
+            _send_summary(batch.broadcasts)
+
+    def on_tick(self):
+        if not self._batches:
+            return
+
+        start_time = perf_counter()
+        while self._batches:
+            batch = self._batches[0]
+            if getattr(batch.owner, 'disconnected', False):
+                batch.actions.clear()
+
+            if batch.actions:
+                self._run_action(batch)
+
+            if not batch.actions:
+                self._batches.popleft()
+                self._flush_broadcasts(batch)
+
+            if perf_counter() - start_time >= self.tick_budget:
+                break
+
+        self.last_tick_time = perf_counter() - start_time
+        self.peak_tick_time = max(self.peak_tick_time, self.last_tick_time)
+
+    def get_metrics(self):
+        """Return a snapshot of the queue state.
+
+        :rtype: dict
+        """
+        return {
+            'queued_batches': len(self._batches),
+            'queued_actions': self.queued_actions,
+            'executed': self.executed_actions,
+            'failed': self.failed_actions,
+            'tick_budget_ms': self.tick_budget * 1000,
+            'last_tick_ms': self.last_tick_time * 1000,
+            'peak_tick_ms': self.peak_tick_time * 1000,
+        }
+
+# The singleton object of the _ActionQueue class.
+action_queue = _ActionQueue()
+
+
+class _BroadcastGrouper(dict):
+    """Group chat broadcasts of the same template made by the same admin
+    within one tick.
+
+    Maps (template, admin name) pairs to the list of messages to broadcast.
+    Templates are translation strings without tokens.
+    """
+    @staticmethod
+    def _get_key(message):
+        # Never credit one admin's action to another admin
+        return (
+            tuple(sorted(message.items())),
+            message.tokens.get('admin_name'),
+        )
+
+    def add(self, message):
+        """Schedule a broadcast of the given message.
+
+        :param message: TranslationStrings instance to broadcast.
+        """
+        self.setdefault(self._get_key(message), []).append(message)
+
+    def flush(self):
+        if not self:
+            return
+
+        groups = tuple(self.values())
+        self.clear()
+
+        for messages in groups:
+            _send_summary(messages)
+
+# The singleton object of the _BroadcastGrouper class.
+broadcast_grouper = _BroadcastGrouper()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+def listener_on_tick():
+    broadcast_grouper.flush()
+    action_queue.on_tick()
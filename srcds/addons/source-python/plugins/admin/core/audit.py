@@ -0,0 +1,225 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import deque
+import json
+from os import replace
+from threading import Event, Lock
+from time import localtime, strftime, time
+
+# Source.Python
+from listeners.tick import Delay, GameThread
+from translations.manager import language_manager
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .paths import ADMIN_LOG_PATH
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# 'text' or 'jsonl'
+AUDIT_LOG_FORMAT = config.get('audit_log', 'format', fallback='text')
+
+# How many entries to keep in memory between flushes
+AUDIT_LOG_BUFFER_SIZE = config.getint(
+    'audit_log', 'buffer_size', fallback=4096)
+
+# How often the writer thread flushes entries to disk
+AUDIT_LOG_FLUSH_INTERVAL = config.getfloat(
+    'audit_log', 'flush_interval_seconds', fallback=1.0)
+
+# Rotate the file once it grows past this size
+AUDIT_LOG_MAX_FILE_SIZE = config.getint(
+    'audit_log', 'max_file_size_kilobytes', fallback=1024) * 1024
+
+# How many rotated files to keep
+AUDIT_LOG_BACKUP_COUNT = config.getint(
+    'audit_log', 'backup_count', fallback=5)
+
+# Whether to also pass every action to the "admin.performed_actions"
+# logger, which writes on the game thread
+AUDIT_LOG_ECHO = config.getboolean('audit_log', 'echo', fallback=False)
+
+AUDIT_LOG_FILE = ADMIN_LOG_PATH / (
+    "performed_actions.jsonl" if AUDIT_LOG_FORMAT == 'jsonl' else
+    "performed_actions.log")
+
+AUDIT_LOG_TIME_FORMAT = "%m-%d-%Y %H:%M:%S"
+
+audit_logger = admin_core_logger.performed_actions
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _AuditLog:
+    """Buffer performed admin actions and write them to disk in batches
+    from a separate thread.
+
+    If echo is enabled, every batch is also passed to the
+    "admin.performed_actions" logger on the game thread, so that the
+    logging level and areas settings cover admin actions, too.
+
+    If the writer can't keep up, the oldest buffered entries are dropped.
+    """
+    def __init__(self, path=AUDIT_LOG_FILE, file_format=AUDIT_LOG_FORMAT,
+                 buffer_size=AUDIT_LOG_BUFFER_SIZE,
+                 flush_interval=AUDIT_LOG_FLUSH_INTERVAL,
+                 max_file_size=AUDIT_LOG_MAX_FILE_SIZE,
+                 backup_count=AUDIT_LOG_BACKUP_COUNT, echo=AUDIT_LOG_ECHO):
+
+        self.path = path
+        self.file_format = file_format
+        self.flush_interval = flush_interval
+        self.max_file_size = max_file_size
+        self.backup_count = backup_count
+        self.echo = echo
+
+        self._buffer = deque(maxlen=buffer_size)
+        self._lock = Lock()
+        self._wake_event = Event()
+        self._writer = None
+        self._stopping = False
+
+        self.written_entries = 0
+        self.dropped_entries = 0
+        self._unreported_drops = 0
+
+    def log(self, message):
+        """Add a performed action to the log.
+
+        :param message: TranslationStrings instance or str describing the
+        action. It is translated to the default language by the writer.
+        """
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped_entries += 1
+                self._unreported_drops += 1
+
+            self._buffer.append((time(), message))
+
+        if self._writer is None:
+            self.start()
+
+    def start(self):
+        with self._lock:
+            if self._writer is not None:
+                return
+
+            self._stopping = False
+            self._writer = GameThread(target=self._write_loop)
+            self._writer.daemon = True
+            self._writer.start()
+
+    def stop(self, timeout=1.0):
+        """Flush buffered entries and stop the writer thread."""
+        writer = self._writer
+        if writer is None:
+            return
+
+        self._stopping = True
+        self._wake_event.set()
+        writer.join(timeout)
+        self._writer = None
+
+    def _write_loop(self):
+        while not self._stopping:
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+            self.flush()
+
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            entries = tuple(self._buffer)
+            self._buffer.clear()
+            dropped, self._unreported_drops = self._unreported_drops, 0
+
+        if not entries and not dropped:
+            return
+
+        lines = []
+        messages = []
+        if dropped:
+            message = "{} audit log entries were dropped".format(dropped)
+            lines.append(self._format_entry(time(), message))
+            messages.append(message)
+
+        for timestamp, message in entries:
+            if not isinstance(message, str):
+                message = message.get_string(language_manager.default)
+
+            lines.append(self._format_entry(timestamp, message))
+            messages.append(message)
+
+        # Source.Python loggers may echo to the server console, which is
+        # only safe to do from the game thread
+        if self.echo:
+            Delay(0, self._forward, (messages, ))
+
+        # Losing entries is worth a warning even if actions aren't echoed
+        elif dropped:
+            Delay(0, audit_logger.log_warning, (messages[0], ))
+
+        try:
+            self._write_lines(lines)
+        except OSError:
+            audit_logger.log_exception("Unable to write the audit log")
+        else:
+            self.written_entries += len(entries)
+
+    @staticmethod
+    def _forward(messages):
+        for message in messages:
+            audit_logger.log_message(message)
+
+    def _format_entry(self, timestamp, message):
+        if self.file_format == 'jsonl':
+            return json.dumps(
+                {'time': timestamp, 'message': message}, ensure_ascii=False)
+
+        return "{} - {}".format(
+            strftime(AUDIT_LOG_TIME_FORMAT, localtime(timestamp)), message)
+
+    def _write_lines(self, lines):
+        if not self.path.parent.isdir():
+            self.path.parent.makedirs()
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+            size = f.tell()
+
+        if self.max_file_size > 0 and size >= self.max_file_size:
+            self._rotate()
+
+    def _rotate(self):
+        if self.backup_count <= 0:
+            self.path.remove()
+            return
+
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.path + ".{}".format(i)
+            if source.isfile():
+                replace(source, self.path + ".{}".format(i + 1))
+
+        replace(self.path, self.path + ".1")
+
+    def get_metrics(self):
+        """Return a snapshot of the audit log state.
+
+        :rtype: dict
+        """
+        return {
+            'buffered': len(self._buffer),
+            'written': self.written_entries,
+            'dropped': self.dropped_entries,
+        }
+
+# The singleton object of the _AuditLog class.
+audit_log = _AuditLog()
@@ -3,13 +3,17 @@
 # =============================================================================
 # Source.Python
 from auth.manager import auth_manager
+from engines.server import server
 from filters.players import PlayerIter
+from listeners import (
+    OnClientActive, OnClientConnect, OnClientDisconnect, OnNetworkidValidated)
 from listeners.tick import Delay
 from messages import SayText2
 from players.dictionary import PlayerDictionary
 from players.entity import Player
 
 # Source.Python Admin
+from .scheduler import job_scheduler, JobPriority
 from .strings import strings_common
 
 
@@ -17,6 +21,12 @@ from .strings import strings_common
 # >> CLASSES
 # =============================================================================
 class BaseClient:
+    disconnected = False
+
+    def __init__(self):
+        self._last_apply_token = 0
+        self._pending_apply = None
+
     def has_permission(self, permission):
         raise NotImplementedError
 
@@ -31,6 +41,70 @@ class BaseClient:
     def sync_execution(self, callback, args=(), kwargs=None):
         raise NotImplementedError
 
+    def compute_and_apply(self, worker, apply, args=(), kwargs=None,
+                          priority=JobPriority.INTERACTIVE):
+        """Call the worker on a worker thread, then pass its result to the
+        apply callback on the game thread.
+
+        If several results for this client arrive within the same tick,
+        only the most recently requested one is applied. Results that got
+        stale in the meantime (see _is_apply_state_stale) are dropped.
+
+        :param worker: Callable to run off the game thread. It must not
+        touch game state or shared plugin state.
+        :param apply: Callable that receives the worker's result.
+        :param tuple args: Positional arguments to pass to the worker.
+        :param dict kwargs: Keyword arguments to pass to the worker.
+        :param JobPriority priority: Scheduler lane to use.
+        :rtype: admin.core.scheduler.JobFuture
+        """
+        self._last_apply_token += 1
+        token = self._last_apply_token
+        state = self._get_apply_state()
+
+        def callback(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+
+            self._queue_apply(token, state, apply, future.result())
+
+        return job_scheduler.submit(
+            worker, args, kwargs, priority=priority, callback=callback)
+
+    def _queue_apply(self, token, state, apply, result):
+        if self._pending_apply is None:
+            self.sync_execution(self._flush_apply)
+
+        elif self._pending_apply[0] > token:
+            return
+
+        self._pending_apply = (token, state, apply, result)
+
+    def _flush_apply(self):
+        if self._pending_apply is None:
+            return
+
+        token, state, apply, result = self._pending_apply
+        self._pending_apply = None
+
+        # A newer request has been made since, wait for its result instead
+        if token != self._last_apply_token:
+            return
+
+        if self._is_apply_state_stale(state):
+            return
+
+        apply(result)
+
+    def _get_apply_state(self):
+        """Return what the client is looking at when work is requested."""
+        return None
+
+    def _is_apply_state_stale(self, state):
+        """Return whether a result requested in the given state should be
+        dropped."""
+        return False
+
 
 class RemoteClient(BaseClient):
     name = None
@@ -61,6 +135,7 @@ class Client(BaseClient):
 
         self.player = Player(index)
         self.active_popup = None
+        self.disconnected = False
 
     def has_permission(self, permission):
         return auth_manager.is_player_authorized(self.player.index, permission)
@@ -79,6 +154,12 @@ class Client(BaseClient):
     def sync_execution(self, callback, args=(), kwargs=None):
         self.player.delay(0, callback, args, kwargs)
 
+    def _get_apply_state(self):
+        return self.active_popup
+
+    def _is_apply_state_stale(self, state):
+        return self.disconnected or self.active_popup is not state
+
     @property
     def name(self):
         return self.player.name
@@ -89,6 +170,9 @@ class Client(BaseClient):
 
 
 class ClientDictionary(PlayerDictionary):
+    def on_automatically_removed(self, index):
+        self[index].disconnected = True
+
     @staticmethod
     def broadcast(message):
         say_text2 = SayText2(strings_common['chat_base'].tokenized(
@@ -97,3 +181,122 @@ class ClientDictionary(PlayerDictionary):
         say_text2.send(PlayerIter('human'))
 
 clients = ClientDictionary(Client)
+
+
+class _ServerClientIndex(dict):
+    """Map SteamIDs of the clients on the server to their server slots.
+
+    The index is kept up to date by the connection listeners, so a SteamID
+    that isn't in it belongs to nobody on the server.
+    """
+    def __init__(self):
+        super().__init__()
+
+        # Slots of connected clients that don't have a valid SteamID yet
+        self._pending_slots = set()
+
+        # Reverse mapping: slot -> SteamID
+        self._steamids = {}
+
+    @staticmethod
+    def is_valid_steamid(steamid):
+        """Return whether clients with the given SteamID can be indexed."""
+        # The SteamID may still be empty in OnClientConnect
+        return steamid not in (
+            '', 'BOT', 'STEAM_ID_PENDING', 'STEAM_ID_LAN')
+
+    def add_slot(self, slot):
+        """Index the client in the given slot by its SteamID."""
+        steamid = server.get_client(slot).steamid
+        if not self.is_valid_steamid(steamid):
+            self._pending_slots.add(slot)
+            return
+
+        self._pending_slots.discard(slot)
+        self._index(steamid, slot)
+
+    def _index(self, steamid, slot):
+        self[steamid] = slot
+        self._steamids[slot] = steamid
+
+    def remove_slot(self, slot):
+        """Forget the client in the given slot."""
+        self._pending_slots.discard(slot)
+
+        steamid = self._steamids.pop(slot, None)
+        if steamid is not None and self.get(steamid) == slot:
+            del self[steamid]
+
+    def validate(self, steamid):
+        """Index the pending client whose SteamID has just been validated.
+        """
+        for slot in self._pending_slots:
+            if server.get_client(slot).steamid == steamid:
+                self._pending_slots.discard(slot)
+                self._index(steamid, slot)
+                break
+
+    def find(self, steamid):
+        """Return the server client with the given SteamID.
+
+        :param str steamid: SteamID of the client.
+        :return: Client or None if it's not on the server.
+        :rtype: players.Client
+        """
+        slot = self.get(steamid)
+        if slot is None:
+            return None
+
+        return server.get_client(slot)
+
+    def find_index(self, steamid):
+        """Return the player index of the client with the given SteamID.
+
+        :param str steamid: SteamID of the client.
+        :return: Player index or None if the client isn't on the server.
+        :rtype: int
+        """
+        slot = self.get(steamid)
+        if slot is None:
+            return None
+
+        return slot + 1
+
+    def refresh(self):
+        """Rebuild the index from the clients that are on the server."""
+        self.clear()
+        self._pending_slots.clear()
+        self._steamids.clear()
+
+        for player in PlayerIter():
+            self.add_slot(player.index - 1)
+
+# The singleton object of the _ServerClientIndex class.
+server_client_index = _ServerClientIndex()
+server_client_index.refresh()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnClientConnect
+def listener_on_client_connect(
+        allow_connect, index, name, address, reject_message, max_reject_len):
+
+    server_client_index.remove_slot(index - 1)
+    server_client_index.add_slot(index - 1)
+
+
+@OnNetworkidValidated
+def listener_on_networkid_validated(name, steamid):
+    server_client_index.validate(steamid)
+
+
+@OnClientActive
+def listener_on_client_active(index):
+    server_client_index.add_slot(index - 1)
+
+
+@OnClientDisconnect
+def listener_on_client_disconnect(index):
+    server_client_index.remove_slot(index - 1)
@@ -10,8 +10,8 @@ from importlib import import_module
 from path import Path
 
 # Source.Python Admin
-from ..paths import ADMIN_PLUGINS_PATH
 from ..plugins.valid import valid_plugins
+from .storage import admin_resource_list
 
 
 # =============================================================================
@@ -28,16 +28,20 @@ for event_file in Path(__file__).parent.joinpath('included').files():
 
 
 # =============================================================================
-# >> SUB-PLUGIN CUSTOM EVENT REGISTRATION
+# >> FUNCTIONS
 # =============================================================================
-for plugin_name in valid_plugins.all:
-    plugin_type = valid_plugins.get_plugin_type(plugin_name)
-    if ADMIN_PLUGINS_PATH.joinpath(
-        plugin_type, plugin_name, 'custom_events.py',
-    ).isfile():
-        import_module(
-            'admin.plugins.{plugin_type}.{plugin_name}.custom_events'.format(
-                plugin_type=plugin_type,
-                plugin_name=plugin_name,
-            )
-        )
+def load_plugin_custom_events(plugin_name):
+    """Register the plugin's custom events.
+
+    Custom events are only imported when the plugin is about to be loaded.
+    """
+    plugin = valid_plugins.all[plugin_name]
+    if not plugin.has_custom_events:
+        return
+
+    resource_count = len(admin_resource_list)
+
+    import_module(plugin.get_module_name('custom_events'))
+
+    for resource in admin_resource_list[resource_count:]:
+        resource.load_events()
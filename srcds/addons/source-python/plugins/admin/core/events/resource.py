@@ -3,6 +3,10 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from hashlib import sha1
+import json
+
 # Site-Package
 from path import Path
 
@@ -10,6 +14,7 @@ from path import Path
 from events.resource import ResourceFile
 
 # Source.Python Admin
+from ..paths import ADMIN_DATA_PATH
 from .storage import admin_resource_list
 
 
@@ -21,13 +26,129 @@ __all__ = (
 )
 
 
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Hashes of the resource files as they were last written
+RESOURCE_HASHES_FILE = ADMIN_DATA_PATH / 'event_resources.json'
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _get_file_hash(path):
+    try:
+        with open(path, 'rb') as f:
+            return sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _get_events_signature(events):
+    """Return a hash of everything the generated res content depends on."""
+    signature = []
+    for event in events:
+        variables = []
+        for cls in reversed(event.__mro__):
+            for name, value in vars(cls).items():
+                if type(value).__module__ != 'events.variable':
+                    continue
+
+                variables.append((
+                    name,
+                    type(value).__name__,
+                    sorted(
+                        (key, repr(item))
+                        for key, item in vars(value).items()
+                    ),
+                ))
+
+        signature.append((event.__name__, variables))
+
+    return sha1(repr(signature).encode('utf-8')).hexdigest()
+
+
 # =============================================================================
 # >> CLASSES
 # =============================================================================
+class _ResourceHashes(dict):
+    """Remember which content of each resource file is already on disk.
+
+    Maps full paths of res files to (events signature, file hash, file
+    modification time) tuples. Kept in memory and in a JSON file to skip
+    rewriting unchanged res files on reloads and restarts.
+    """
+    def __init__(self):
+        super().__init__()
+
+        try:
+            with open(RESOURCE_HASHES_FILE, encoding='utf-8') as f:
+                self.update({
+                    path: tuple(entry) for path, entry in json.load(f).items()
+                })
+        except (OSError, ValueError):
+            pass
+
+    def is_up_to_date(self, path, signature):
+        """Return whether the file already contains the content generated
+        from the events with the given signature.
+        """
+        entry = self.get(str(path))
+        if entry is None or entry[0] != signature:
+            return False
+
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return False
+
+        # The file hasn't been touched since we've last checked it
+        if entry[2] == mtime:
+            return True
+
+        if _get_file_hash(path) != entry[1]:
+            return False
+
+        self[str(path)] = (signature, entry[1], mtime)
+        return True
+
+    def update_file(self, path, signature):
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return
+
+        self[str(path)] = (signature, _get_file_hash(path), mtime)
+
+        try:
+            if not RESOURCE_HASHES_FILE.parent.isdir():
+                RESOURCE_HASHES_FILE.parent.makedirs()
+
+            with open(RESOURCE_HASHES_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self, f, indent=2, sort_keys=True)
+        except OSError:
+            pass
+
+# The singleton object of the _ResourceHashes class.
+resource_hashes = _ResourceHashes()
+
+
 class AdminResourceFile(ResourceFile):
     """Class used for Source.Python Admin res files."""
 
     def __init__(self, file_path, *events):
         """Add 'admin' to the path before initialization."""
+        self._events_signature = _get_events_signature(events)
+
         super().__init__(Path('admin') / file_path, *events)
         admin_resource_list.append(self)
+
+    def write(self):
+        """Write the res file unless it already has the same content."""
+        if resource_hashes.is_up_to_date(
+                self.full_path, self._events_signature):
+
+            return
+
+        super().write()
+        resource_hashes.update_file(self.full_path, self._events_signature)
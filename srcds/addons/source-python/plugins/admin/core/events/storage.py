@@ -1,6 +1,13 @@
 """Event storage functionality."""
 
 
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Admin
+from ..startup_profiler import startup_profiler
+
+
 # =============================================================================
 # >> ALL DECLARATION
 # =============================================================================
@@ -19,7 +26,9 @@ class _AdminResourceList(list):
     def append(self, resource):
         """Add the res file and write it."""
         super().append(resource)
-        resource.write()
+
+        with startup_profiler.phase("event resource writes"):
+            resource.write()
 
     def write_all_events(self):
         """Write all files in the list."""
@@ -2,6 +2,7 @@
 # >> IMPORTS
 # =============================================================================
 from .clients import clients
+from .metrics import wrap_methods
 
 
 # =============================================================================
@@ -23,6 +24,9 @@ class FeatureMeta(type):
             raise ValueError("Class '{}' has its 'flag' "
                              "attribute set to None".format(cls))
 
+        wrap_methods(
+            cls, ('execute', 'filter'), "features." + cls.flag + ".{method}")
+
 
 class BaseFeature(metaclass=FeatureMeta):
     feature_abstract = True
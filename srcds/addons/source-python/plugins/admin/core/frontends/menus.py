@@ -4,11 +4,14 @@
 # Source.Python
 from filters.players import PlayerIter
 from menus import PagedMenu, PagedOption
+from players.entity import Player
 from translations.strings import LangStrings
 
 # Source.Python Admin
+from ..actions import action_queue
 from ..clients import clients
 from ..helpers import format_player_name
+from ..metrics import metrics
 from ..strings import strings_common
 
 
@@ -68,6 +71,7 @@ class AdminMenuSection(AdminMenuEntry, list):
             option.value.select(clients[index])
 
         @self.popup.register_build_callback
+        @metrics.timed("menus.section.build")
         def build_callback(popup, index):
             client = clients[index]
             popup.clear()
@@ -410,6 +414,7 @@ class BasePlayerBasedAdminCommand(AdminCommand):
                 self._player_select(client, frame.player_ids)
 
         @self.popup.register_build_callback
+        @metrics.timed("menus." + feature.flag + ".build")
         def build_callback(popup, index):
 
             # Clear the popup
@@ -473,6 +478,21 @@ class BasePlayerBasedAdminCommand(AdminCommand):
     def _iter(self):
         raise NotImplementedError
 
+    def _get_player(self, player_id):
+        """Return the player with the given ID if it's still listed.
+
+        Subclasses should override this with a direct lookup.
+
+        :param player_id: ID returned by _get_player_id.
+        :return: Player or None if the player is gone or doesn't fit the
+        base filter anymore.
+        """
+        for player in self._iter():
+            if self._get_player_id(player) == player_id:
+                return player
+
+        return None
+
     def _filter_player_ids(self, client, player_ids):
         """Filter out invalid IDs from the given list.
 
@@ -504,8 +524,18 @@ class BasePlayerBasedAdminCommand(AdminCommand):
 
         client.active_popup = None
 
-        for player in self._filter_player_ids(client, player_ids):
-            self.feature.execute(client, player)
+        players = self._filter_player_ids(client, player_ids)
+
+        # Spread actions on multiple players across several ticks
+        if len(players) > 1:
+            action_queue.add_batch((
+                (self._execute_delayed, (client, self._get_player_id(player)))
+                for player in players
+            ), owner=client)
+
+        else:
+            for player in players:
+                self.feature.execute(client, player)
 
         # Does client still not have an active popup?
         if client.active_popup is None:
@@ -513,6 +543,14 @@ class BasePlayerBasedAdminCommand(AdminCommand):
             # Display our parent menu
             self._parent.select(client)
 
+    def _execute_delayed(self, client, player_id):
+        # The player might have left or changed since they were selected
+        player = self._get_player(player_id)
+        if player is None or not self.feature.filter(client, player):
+            return
+
+        self.feature.execute(client, player)
+
     @staticmethod
     def render_player_name(player):
         """Return a name of the given player as it should appear in the menu.
@@ -539,3 +577,14 @@ class PlayerBasedAdminCommand(BasePlayerBasedAdminCommand):
 
     def _iter(self):
         yield from PlayerIter(self.base_filter)
+
+    def _get_player(self, userid):
+        try:
+            player = Player.from_userid(userid)
+        except (OverflowError, ValueError):
+            return None
+
+        if not PlayerIter.filters[self.base_filter](player):
+            return None
+
+        return player
@@ -15,7 +15,9 @@ from players.helpers import get_client_language
 # Source.Python Admin
 from ...info import info
 from .. import admin_core_logger
+from ..actions import action_queue
 from ..clients import clients
+from ..metrics import wrap_methods
 from ..strings import strings_common
 
 # Custom Package
@@ -78,6 +80,10 @@ class PageMeta(base_page_meta):
         cls.page_id = "{}.{}.{}".format(
             cls.admin_plugin_type, cls.admin_plugin_id, cls.page_id)
 
+        wrap_methods(
+            cls, ('on_page_data_received', ),
+            "pages." + cls.page_id + ".{method}")
+
         # Only after we set the attribute, call parent meta's __init__
         super().__init__(name, bases, namespace)
 
@@ -235,6 +241,8 @@ class BasePlayerBasedFeaturePage(BaseFeaturePage):
         :return: Filtered list of :class:`players.entity.Player` instances.
         :rtype: list
         """
+        player_ids = set(player_ids)
+
         players = []
         for player in self._iter():
             if self._get_player_id(player) not in player_ids:
@@ -260,9 +268,10 @@ class BasePlayerBasedFeaturePage(BaseFeaturePage):
         if data['action'] == "execute":
             player_ids = data['player_ids']
 
-            for player in self._filter_player_ids(client, player_ids):
-                client.sync_execution(
-                    self._execute, (client, self._get_player_id(player)))
+            action_queue.add_batch((
+                (self._execute, (client, self._get_player_id(player)))
+                for player in self._filter_player_ids(client, player_ids)
+            ), owner=client)
 
             self.send_data({
                 'feature-executed': "scheduled"
@@ -1,13 +1,12 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
-# Source.Python
-from messages import SayText2
-from translations.manager import language_manager
+# Python
+from functools import lru_cache
 
 # Source.Python Admin
-from . import admin_core_logger
-from .strings import strings_common
+from .actions import action_queue, broadcast_grouper
+from .audit import audit_log
 
 
 # =============================================================================
@@ -16,10 +15,8 @@ from .strings import strings_common
 MAX_NAME_LENGTH_BYTES = 24
 THREE_DOTS = "…"
 
-# =============================================================================
-# >> GLOBAL VARIABLES
-# =============================================================================
-admin_performed_actions_logger = admin_core_logger.performed_actions
+# How many formatted player names to remember
+FORMATTED_NAMES_CACHE_SIZE = 512
 
 
 # =============================================================================
@@ -31,11 +28,12 @@ def extract_ip_address(address):
     return address[:address.rfind(':')]
 
 
+@lru_cache(maxsize=FORMATTED_NAMES_CACHE_SIZE)
 def format_player_name(player_name):
-    if len(player_name.encode('utf-8')) <= MAX_NAME_LENGTH_BYTES:
+    player_name_encoded = player_name.encode('utf-8')
+    if len(player_name_encoded) <= MAX_NAME_LENGTH_BYTES:
         return player_name
 
-    player_name_encoded = player_name.encode('utf-8')
     player_name_encoded = player_name_encoded[
         :MAX_NAME_LENGTH_BYTES-len(THREE_DOTS)]
 
@@ -43,6 +41,9 @@ def format_player_name(player_name):
 
 
 def log_admin_action(message):
-    SayText2(strings_common['chat_base'].tokenized(message=message)).send()
-    admin_performed_actions_logger.log_message(
-        message.get_string(language_manager.default))
+    # Actions run by the action queue get one merged broadcast per batch,
+    # others are grouped with the same actions performed within this tick
+    if not action_queue.collect_broadcast(message):
+        broadcast_grouper.add(message)
+
+    audit_log.log(message)
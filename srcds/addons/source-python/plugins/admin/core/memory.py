@@ -9,6 +9,7 @@ from memory.manager import TypeManager
 
 # Source.Python Admin
 from .paths import ADMIN_DATA_PATH
+from .startup_profiler import startup_profiler
 
 
 # =============================================================================
@@ -17,9 +18,10 @@ from .paths import ADMIN_DATA_PATH
 manager = TypeManager()
 server_ptr = get_object_pointer(server)
 
-CustomServer = manager.create_type_from_file(
-    'CBaseServer',
-    ADMIN_DATA_PATH / 'memory' / GAME_NAME / 'CBaseServer.ini'
-)
+with startup_profiler.phase("memory types"):
+    CustomServer = manager.create_type_from_file(
+        'CBaseServer',
+        ADMIN_DATA_PATH / 'memory' / GAME_NAME / 'CBaseServer.ini'
+    )
 
 custom_server = make_object(CustomServer, server_ptr)
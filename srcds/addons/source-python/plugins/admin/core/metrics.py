@@ -0,0 +1,393 @@
+"""Lightweight metrics of Source.Python Admin: counters, gauges and
+fixed-bucket latency histograms.
+
+Features, MoTD pages and menus are timed automatically, see "admin stats".
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from bisect import bisect_left
+from functools import wraps
+import json
+from os import replace
+from threading import local
+from time import perf_counter, time
+
+# Source.Python
+from listeners.tick import Repeat
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .paths import ADMIN_LOG_PATH
+from .scheduler import job_scheduler, JobPriority
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+METRICS_ENABLED = config.getboolean('metrics', 'enabled', fallback=True)
+
+# How often to dump the metrics to the file, 0 disables dumping
+METRICS_DUMP_INTERVAL = config.getfloat(
+    'metrics', 'dump_interval_seconds', fallback=0.0)
+
+METRICS_DUMP_FILE = ADMIN_LOG_PATH / "metrics.json"
+
+# Upper bounds of histogram buckets in milliseconds, the last bucket is
+# unbounded
+HISTOGRAM_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# How many histograms to show in "admin stats"
+REPORT_HISTOGRAMS_LIMIT = 30
+
+metrics_logger = admin_core_logger.metrics
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def wrap_methods(cls, method_names, name_format):
+    """Time the given methods of the class in the metrics registry.
+
+    Methods inherited from another timed class are re-wrapped so that every
+    class gets its own histogram.
+
+    :param cls: Class to wrap the methods of.
+    :param method_names: Names of the methods.
+    :param str name_format: Format of the metric name, gets the method name
+    as {method}.
+    """
+    if not metrics.enabled:
+        return
+
+    for method_name in method_names:
+        method = getattr(cls, method_name, None)
+        if method is None:
+            continue
+
+        # Don't time the same call twice
+        if hasattr(method, 'metric_name'):
+            method = method.__wrapped__
+
+        setattr(cls, method_name, metrics.timed(
+            name_format.format(method=method_name))(method))
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Counter:
+    """Monotonically increasing value."""
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def get_snapshot(self):
+        return self.value
+
+
+class Gauge:
+    """Value that can go up and down."""
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def get_snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Distribution of durations over fixed buckets."""
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, milliseconds):
+        self.bucket_counts[bisect_left(self.buckets, milliseconds)] += 1
+        self.count += 1
+        self.sum += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def get_percentile(self, percentile):
+        """Return the upper bound of the bucket the percentile falls into.
+
+        :param float percentile: Percentile from 0 to 100.
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+
+        threshold = self.count * percentile / 100
+        cumulative = 0
+        for i, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                break
+
+        if i < len(self.buckets):
+            return min(self.buckets[i], self.max)
+
+        return self.max
+
+    def get_snapshot(self):
+        return {
+            'count': self.count,
+            'sum_ms': self.sum,
+            'max_ms': self.max,
+            'p50_ms': self.get_percentile(50),
+            'p95_ms': self.get_percentile(95),
+            'p99_ms': self.get_percentile(99),
+            'buckets': [
+                [bound, bucket_count] for bound, bucket_count in zip(
+                    self.buckets + ('inf', ), self.bucket_counts)
+            ],
+        }
+
+
+class _MetricsRegistry:
+    """Store metrics by their dotted names."""
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+        # Name -> callable returning a dict of values, e.g. get_metrics of
+        # the job scheduler
+        self.collectors = {}
+
+        self.started_at = time()
+        self._dump_repeat = Repeat(self.dump)
+
+        # Name of the innermost timed call in progress, per thread
+        self._context = local()
+
+    def counter(self, name):
+        """Return the counter of the given name, create it if needed."""
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = Counter()
+        return counter
+
+    def gauge(self, name):
+        """Return the gauge of the given name, create it if needed."""
+        gauge = self.gauges.get(name)
+        if gauge is None:
+            gauge = self.gauges[name] = Gauge()
+        return gauge
+
+    def histogram(self, name):
+        """Return the histogram of the given name, create it if needed."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def register_collector(self, name, callback):
+        """Include the values returned by the callback in the snapshots.
+
+        :param str name: Name to show the values under.
+        :param callback: Callable that returns a dict.
+        """
+        self.collectors[name] = callback
+
+    def unregister_collector(self, name):
+        """Stop including the values of the given collector in the
+        snapshots.
+
+        Plugins must call this for their collectors when they unload.
+
+        :param str name: Name the collector was registered under.
+        """
+        self.collectors.pop(name, None)
+
+    def timed(self, name):
+        """Return a decorator that times calls of a function in the
+        histogram of the given name. Exceptions are counted in the
+        "<name>.errors" counter.
+
+        Functions are returned untouched if metrics are disabled.
+        """
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            histogram = self.histogram(name)
+            errors = self.counter(name + '.errors')
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                context = self._context
+                outer_name = getattr(context, 'name', None)
+                context.name = name
+
+                start_time = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    histogram.observe((perf_counter() - start_time) * 1000)
+                    context.name = outer_name
+
+            wrapper.metric_name = name
+            return wrapper
+
+        return decorator
+
+    def get_current_timed(self):
+        """Return the name of the innermost timed call in progress on the
+        current thread, or None.
+        """
+        return getattr(self._context, 'name', None)
+
+    def set_current_timed(self, name):
+        """Set the name of the timed call in progress on the current
+        thread, e.g. for jobs that are done on behalf of one.
+        """
+        self._context.name = name
+
+    def get_snapshot(self):
+        """Return all the metrics as JSON-serializable data.
+
+        :rtype: dict
+        """
+        collectors = {}
+        for name, callback in tuple(self.collectors.items()):
+            try:
+                collectors[name] = callback()
+            except Exception:
+                metrics_logger.log_exception(
+                    "Metrics collector '{}' has failed".format(name))
+
+        return {
+            'time': time(),
+            'uptime_seconds': time() - self.started_at,
+            'counters': {
+                name: counter.get_snapshot()
+                for name, counter in tuple(self.counters.items())
+            },
+            'gauges': {
+                name: gauge.get_snapshot()
+                for name, gauge in tuple(self.gauges.items())
+            },
+            'histograms': {
+                name: histogram.get_snapshot()
+                for name, histogram in tuple(self.histograms.items())
+            },
+            'collectors': collectors,
+        }
+
+    def get_report(self):
+        """Return the metrics as text, the slowest paths go first.
+
+        :rtype: str
+        """
+        if not self.enabled:
+            return (
+                "Metrics are disabled, set [metrics] enabled=1 in the "
+                "config.ini of Source.Python Admin to enable them")
+
+        snapshot = self.get_snapshot()
+
+        lines = ["Source.Python Admin metrics ({:.0f} s)".format(
+            snapshot['uptime_seconds'])]
+
+        lines.append("")
+        lines.append(
+            "Timings (total ms, calls, p50, p95, p99, max), top {}:".format(
+                REPORT_HISTOGRAMS_LIMIT))
+
+        for name, data in sorted(
+                snapshot['histograms'].items(),
+                key=lambda item: -item[1]['sum_ms'])[:REPORT_HISTOGRAMS_LIMIT]:
+
+            if not data['count']:
+                continue
+
+            lines.append(
+                "  {:>9.1f}  {:>7}  {:>6.2f}  {:>6.2f}  {:>6.2f}  {:>7.2f}  "
+                "{}".format(
+                    data['sum_ms'], data['count'], data['p50_ms'],
+                    data['p95_ms'], data['p99_ms'], data['max_ms'], name))
+
+        values = dict(snapshot['counters'])
+        values.update(snapshot['gauges'])
+        if any(values.values()):
+            lines.append("")
+            lines.append("Counters and gauges:")
+            for name, value in sorted(values.items()):
+                if value:
+                    lines.append("  {}: {}".format(name, value))
+
+        for collector_name, data in sorted(snapshot['collectors'].items()):
+            lines.append("")
+            lines.append(collector_name + ":")
+            for name, value in sorted(data.items()):
+                if isinstance(value, float):
+                    value = "{:.2f}".format(value)
+
+                lines.append("  {}: {}".format(name, value))
+
+        return "\n".join(lines)
+
+    def start_dumping(self, interval=METRICS_DUMP_INTERVAL):
+        if not self.enabled or interval <= 0:
+            return
+
+        self._dump_repeat.start(interval)
+
+    def stop_dumping(self):
+        self._dump_repeat.stop()
+
+    def dump(self, path=METRICS_DUMP_FILE):
+        """Write a snapshot to the given file on a worker thread."""
+        job_scheduler.submit(
+            target=self._write_snapshot,
+            args=(path, self.get_snapshot()),
+            priority=JobPriority.BACKGROUND
+        )
+
+    @staticmethod
+    def _write_snapshot(path, snapshot):
+        try:
+            if not path.parent.isdir():
+                path.parent.makedirs()
+
+            # Replace the file at once so that readers never see half of it
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, indent=2, sort_keys=True)
+
+            replace(temp_path, path)
+        except OSError:
+            metrics_logger.log_exception(
+                "Unable to dump metrics to {}".format(path))
+
+# The singleton object of the _MetricsRegistry class.
+metrics = _MetricsRegistry()
+
+# Attribute the work of jobs to the timed call that has submitted them
+job_scheduler.register_context(
+    metrics.get_current_timed, metrics.set_current_timed)
+
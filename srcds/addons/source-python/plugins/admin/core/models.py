@@ -5,21 +5,30 @@
 from importlib import import_module
 
 # Source.Python Admin
-from .paths import ADMIN_PLUGINS_PATH
+from .orm import Base, engine
 from .plugins.valid import valid_plugins
 
 
 # =============================================================================
-# >> SUB-PLUGIN CUSTOM MODEL REGISTRATION
+# >> GLOBAL VARIABLES
 # =============================================================================
-for plugin_name in valid_plugins.all:
-    plugin_type = valid_plugins.get_plugin_type(plugin_name)
-    if ADMIN_PLUGINS_PATH.joinpath(
-        plugin_type, plugin_name, 'models.py',
-    ).isfile():
-        import_module(
-            'admin.plugins.{plugin_type}.{plugin_name}.models'.format(
-                plugin_type=plugin_type,
-                plugin_name=plugin_name,
-            )
-        )
+# Plugins whose models are already registered
+_plugins_with_models = set()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def load_plugin_models(plugin_name):
+    """Register the plugin's custom models and create their tables.
+
+    Models are only imported when the plugin is about to be loaded.
+    """
+    plugin = valid_plugins.all[plugin_name]
+    if not plugin.has_models or plugin_name in _plugins_with_models:
+        return
+
+    import_module(plugin.get_module_name('models'))
+    Base.metadata.create_all(engine)
+
+    _plugins_with_models.add(plugin_name)
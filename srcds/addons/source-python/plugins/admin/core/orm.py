@@ -1,21 +1,204 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from collections import Counter
+import sys
+from threading import Lock
+from time import perf_counter
+
 # Site-Package
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Source.Python Admin
+from . import admin_core_logger
 from .config import config
+from .metrics import metrics
 from .paths import ADMIN_DATA_PATH
 
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
+QUERY_STATS_ENABLED = config.getboolean(
+    'database', 'query_stats', fallback=True)
+
+# Statements that take longer are logged with their call site, 0 disables
+# the log
+SLOW_QUERY_THRESHOLD = config.getfloat(
+    'database', 'slow_query_milliseconds', fallback=100.0)
+
+# How much of a slow statement to log
+SLOW_QUERY_LOG_LENGTH = 500
+
+orm_logger = admin_core_logger.orm
+
 engine = create_engine(config['database']['uri'].format(
     admin_data_path=ADMIN_DATA_PATH,
 ))
 Base = declarative_base()
 Session = sessionmaker(bind=engine)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _get_call_site():
+    """Return the innermost Source.Python Admin frame that has led to the
+    statement, as (module name, function name, file name, line number).
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module_name = frame.f_globals.get('__name__', '')
+        if (
+                module_name != __name__ and
+                (module_name == 'admin' or module_name.startswith('admin.'))):
+
+            return (
+                module_name, frame.f_code.co_name, frame.f_code.co_filename,
+                frame.f_lineno)
+
+        frame = frame.f_back
+
+    return None
+
+
+def _get_origin(call_site):
+    """Return the name of the timed feature, page or menu that the statement
+    comes from, including jobs that it has submitted to the scheduler.
+    Statements that come from elsewhere (e.g. periodic maintenance jobs) are
+    named after their calling function.
+    """
+    origin = metrics.get_current_timed()
+    if origin is not None:
+        return origin
+
+    if call_site is None:
+        return 'other'
+
+    module_name, function_name = call_site[:2]
+    for prefix in (
+            'admin.plugins.included.', 'admin.plugins.custom.', 'admin.'):
+
+        if module_name.startswith(prefix):
+            module_name = module_name[len(prefix):]
+            break
+
+    return module_name + '.' + function_name
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _QueryStats:
+    """Count and time the statements executed on the engine.
+
+    Durations go to the "database.<origin>" histograms of the metrics
+    registry, totals are shown under "database" in "admin stats".
+    """
+    def __init__(self, slow_query_threshold=SLOW_QUERY_THRESHOLD):
+        self.slow_query_threshold = slow_query_threshold
+
+        self.queries = 0
+        self.failed_queries = 0
+        self.slow_queries = 0
+        self.total_time = 0.0
+        self.statements = Counter()
+
+        self._lock = Lock()
+
+    def attach(self, engine):
+        event.listen(
+            engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(
+            engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                               executemany):
+
+        conn.info.setdefault('query_start_times', []).append(perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters,
+                              context, executemany):
+
+        duration = (
+            perf_counter() - conn.info['query_start_times'].pop()) * 1000
+
+        is_slow = 0 < self.slow_query_threshold <= duration
+
+        # Origins are only needed for histograms and the slow query log.
+        # Walking the stack is only needed for untimed or slow statements.
+        call_site = origin = None
+        if metrics.enabled or is_slow:
+            origin = metrics.get_current_timed()
+            if origin is None or is_slow:
+                call_site = _get_call_site()
+                origin = _get_origin(call_site)
+
+        kind = (statement.split(None, 1) or ('?', ))[0].upper()
+        with self._lock:
+            self.queries += 1
+            self.total_time += duration
+            self.statements[kind] += 1
+
+            if is_slow:
+                self.slow_queries += 1
+
+            if metrics.enabled:
+                metrics.histogram('database.' + origin).observe(duration)
+
+        if is_slow:
+            self._log_slow_query(statement, duration, origin, call_site)
+
+    def _handle_error(self, exception_context):
+        conn = exception_context.connection
+        if conn is None or not conn.info.get('query_start_times'):
+            return
+
+        conn.info['query_start_times'].pop()
+        with self._lock:
+            self.failed_queries += 1
+
+    @staticmethod
+    def _log_slow_query(statement, duration, origin, call_site):
+        if call_site is None:
+            location = "unknown location"
+        else:
+            location = "{2}:{3} ({0}.{1})".format(*call_site)
+
+        statement = " ".join(statement.split())
+        if len(statement) > SLOW_QUERY_LOG_LENGTH:
+            statement = statement[:SLOW_QUERY_LOG_LENGTH] + "..."
+
+        orm_logger.log_warning(
+            "Slow query ({:.1f} ms) from {}, {}:\n{}".format(
+                duration, origin, location, statement))
+
+    def get_metrics(self):
+        """Return the totals of the executed statements.
+
+        :rtype: dict
+        """
+        with self._lock:
+            result = {
+                'queries': self.queries,
+                'failed_queries': self.failed_queries,
+                'slow_queries': self.slow_queries,
+                'slow_query_threshold_ms': self.slow_query_threshold,
+                'total_ms': self.total_time,
+            }
+
+            for kind, count in self.statements.items():
+                result['statements.' + kind.lower()] = count
+
+        return result
+
+# The singleton object of the _QueryStats class.
+query_stats = _QueryStats()
+
+if QUERY_STATS_ENABLED:
+    query_stats.attach(engine)
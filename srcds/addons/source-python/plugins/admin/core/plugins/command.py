@@ -151,6 +151,18 @@ class _AdminSubCommandManager(SubCommandManager):
         # Add the plugin to the reload queue
         plugin_queue['reload'].add(plugin_name)
 
+    def refresh_plugins(self, index=None):
+        """Discover plugins again to pick up new or removed ones."""
+        added, removed = valid_plugins.refresh(keep=self.manager)
+
+        self._send_message(
+            self.prefix + command_strings['plugins_refreshed'].get_string(
+                added=', '.join(added) or '-',
+                removed=', '.join(removed) or '-',
+            ),
+            index,
+        )
+
     def print_plugins(self, index=None):
         """List all currently loaded plugins."""
         # Get header messages
@@ -298,6 +310,13 @@ def _admin_plugin_reload(command_info, plugin):
     admin_command_manager.reload_plugin(plugin, command_info.index)
 
 
+@admin_command_manager.server_sub_command(['plugin', 'refresh'])
+@admin_command_manager.client_sub_command(
+    ['plugin', 'refresh'], 'admin.refresh')
+def _admin_plugin_refresh(command_info):
+    admin_command_manager.refresh_plugins(command_info.index)
+
+
 @admin_command_manager.server_sub_command(['plugin', 'list'])
 @admin_command_manager.client_sub_command(['plugin', 'list'])
 def _admin_plugin_list(command_info):
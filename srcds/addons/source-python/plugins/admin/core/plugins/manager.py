@@ -9,8 +9,11 @@ from plugins.manager import PluginManager
 # Source.Python Admin
 from . import admin_plugins_logger
 from .valid import valid_plugins
+from ..events import load_plugin_custom_events
 from ..events.included.plugins import (Admin_Plugin_Loaded,
                                        Admin_Plugin_Unloaded)
+from ..models import load_plugin_models
+from ..startup_profiler import startup_profiler
 
 
 # =============================================================================
@@ -57,7 +60,24 @@ class _AdminPluginManager(PluginManager):
                 'Loading'
             ].get_string(plugin=plugin_name)
         )
-        super().load(plugin_name)
+
+        with startup_profiler.phase("plugin load: " + plugin_name):
+
+            # Models and custom events of plugins are only imported on demand
+            loaded_resources = True
+            if plugin_name in valid_plugins.all:
+                try:
+                    load_plugin_models(plugin_name)
+                    load_plugin_custom_events(plugin_name)
+                except Exception:
+                    self.logger.log_exception(
+                        'Unable to load models or custom events of plugin '
+                        '"{plugin_name}"'.format(plugin_name=plugin_name))
+
+                    loaded_resources = False
+
+            if loaded_resources:
+                super().load(plugin_name)
 
         # Was the plugin unable to be loaded?
         if plugin_name not in self:
@@ -0,0 +1,61 @@
+"""Provides off-thread preparation of sub-plugins before they are loaded.
+
+A sub-plugin can have a prepare.py module with a prepare() function. It is
+called on a worker thread right before the plugin is loaded, concurrently
+with other plugins that don't depend on each other. It must only do work
+that is safe off the game thread (e.g. database queries). Its return value
+is available to the plugin during the load via pop_prepared_data.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from importlib import import_module
+
+# Source.Python Admin
+from .valid import valid_plugins
+
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = (
+    'pop_prepared_data',
+    'prepare_plugin',
+    'set_prepared_data',
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_prepared_data = {}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def prepare_plugin(plugin_name):
+    """Call prepare() of the given plugin and return its result.
+
+    Called from a worker thread.
+    """
+    module = import_module(
+        valid_plugins.all[plugin_name].get_module_name('prepare'))
+
+    return module.prepare()
+
+
+def set_prepared_data(plugin_name, data):
+    _prepared_data[plugin_name] = data
+
+
+def pop_prepared_data(plugin_name, default=None):
+    """Return the result of the plugin's preparation.
+
+    :param str plugin_name: Name of the plugin.
+    :param default: Value to return if the plugin wasn't prepared (e.g. its
+    preparation has failed).
+    """
+    return _prepared_data.pop(plugin_name, default)
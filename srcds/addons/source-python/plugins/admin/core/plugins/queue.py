@@ -4,7 +4,7 @@
 # >> IMPORTS
 # =============================================================================
 # Python
-from contextlib import suppress
+from collections import deque
 from warnings import warn
 
 # Source.Python
@@ -13,7 +13,10 @@ from listeners.tick import Delay
 # Source.Python Admin
 from . import admin_plugins_logger
 from .manager import admin_plugin_manager
-from .valid import plugin_requirements, valid_plugins
+from .prepare import prepare_plugin, set_prepared_data
+from .valid import plugin_conflicts, plugin_requirements, valid_plugins
+from ..models import load_plugin_models
+from ..scheduler import job_scheduler, JobPriority
 
 
 # =============================================================================
@@ -21,6 +24,7 @@ from .valid import plugin_requirements, valid_plugins
 # =============================================================================
 __all__ = (
     '_PluginQueue',
+    'get_load_order',
     'plugin_queue',
 )
 
@@ -31,16 +35,75 @@ __all__ = (
 admin_plugins_queue_logger = admin_plugins_logger.queue
 
 
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_load_order(plugin_names):
+    """Sort the given plugins by their requirements.
+
+    Requirements outside of the given plugins are ignored.
+
+    :param plugin_names: Names of valid plugins.
+    :return: List of levels (sorted lists of plugins that don't depend on
+        each other, every level only depends on the previous ones) and a
+        sorted list of plugins that are a part of or depend on a
+        requirement cycle.
+    :rtype: tuple
+    """
+    plugin_names = set(plugin_names)
+    dependencies = {
+        plugin_name: {
+            other for other in valid_plugins.all[plugin_name].required
+            if other in plugin_names
+        } for plugin_name in plugin_names
+    }
+
+    levels = []
+    while dependencies:
+        level = {
+            plugin_name for plugin_name, others in dependencies.items()
+            if not others
+        }
+
+        # Everything that is left is in a cycle or depends on one
+        if not level:
+            break
+
+        levels.append(sorted(level))
+
+        for plugin_name in level:
+            del dependencies[plugin_name]
+
+        for others in dependencies.values():
+            others -= level
+
+    return levels, sorted(dependencies)
+
+
 # =============================================================================
 # >> CLASSES
 # =============================================================================
 class _PluginQueue(dict):
-    """Plugin queue class used to load/unload plugins."""
+    """Plugin queue class used to load/unload plugins.
+
+    Plugins are loaded level by level in their dependency order. Plugins of
+    the same level are prepared (see prepare.py) concurrently on worker
+    threads, then loaded one by one on the game thread.
+    """
 
     manager = admin_plugin_manager
     logger = admin_plugins_queue_logger
     prefix = None
 
+    def __init__(self):
+        super().__init__()
+
+        self._pending_levels = deque()
+        self._loading = False
+
+        # Callbacks to call once no plugins are queued or being loaded
+        self._idle_callbacks = []
+
     def __missing__(self, item):
         """Add the item to its queue and loop through queues after 1 tick."""
         if item not in ('load', 'unload', 'reload'):
@@ -56,25 +119,55 @@ class _PluginQueue(dict):
 
     def _loop_through_queues(self):
         """Loop through all queues to properly load/unload plugins."""
+        # Queues will be looped through again once the loading is done
+        if self._loading:
+            return
+
         if 'unload' in self:
             self._unload_plugins()
             del self['unload']
+
+        if 'reload' in self:
+            reload_plugins = self.pop('reload')
+        else:
+            reload_plugins = None
+
         if 'load' in self:
-            self._load_plugins()
-            del self['load']
-        if 'reload' not in self:
+            self._load_plugins(self.pop('load'))
+
+        # Load the reloaded plugins on the next loop. Adding to a non-empty
+        # queue doesn't schedule one, and extra loops do no harm.
+        if reload_plugins is not None:
+            self['load'] |= reload_plugins
+            Delay(0, self._loop_through_queues)
+
+        self._check_idle()
+
+    def call_when_idle(self, callback):
+        """Call the given callback once no plugins are queued or being
+        loaded.
+
+        Plugins queued during the current tick are waited for, too.
+        """
+        self._idle_callbacks.append(callback)
+        Delay(0, self._check_idle)
+
+    def _check_idle(self):
+        if self._loading or self or not self._idle_callbacks:
             return
-        self['load'] = set(self['reload'])
-        del self['reload']
+
+        callbacks, self._idle_callbacks = self._idle_callbacks, []
+        for callback in callbacks:
+            callback()
 
     def _unload_plugins(self):
         """Unload all plugins in the unload queue."""
-        # Loop through all plugins to unload
-        for plugin_name in self['unload']:
+        unload_plugins = self['unload']
 
+        for plugin_name in unload_plugins:
             if plugin_name in plugin_requirements:
                 for other in plugin_requirements[plugin_name]:
-                    if other in self.manager and other not in self['unload']:
+                    if other in self.manager and other not in unload_plugins:
                         warn(
                             'Plugin "{plugin_name}" is required by "{other}". '
                             'Please unload "{other}" or load {plugin_name} '
@@ -84,60 +177,178 @@ class _PluginQueue(dict):
                             )
                         )
 
-            # Unload the plugin
-            self.manager.set_base_import(
-                value=valid_plugins.get_plugin_type(plugin_name)
-            )
-            self.manager.unload(plugin_name)
+        # Unload the plugins that require others first
+        levels, cyclic = get_load_order(
+            plugin_name for plugin_name in unload_plugins
+            if plugin_name in valid_plugins.all
+        )
+        for level in [cyclic] + list(reversed(levels)):
+            for plugin_name in level:
 
-    def _load_plugins(self):
-        """Load all plugins in the load queue."""
-        # Loop through all plugins to load
-        for plugin_name in self['load']:
+                # Unload the plugin
+                self.manager.set_base_import(
+                    value=valid_plugins.get_plugin_type(plugin_name)
+                )
+                self.manager.unload(plugin_name)
 
-            # Retrieve the plugin's type
-            try:
-                plugin_type = valid_plugins.get_plugin_type(plugin_name)
-            except ValueError:
+    def _load_plugins(self, load_plugins):
+        """Start loading the given plugins."""
+        plugin_names = set()
+        for plugin_name in load_plugins:
+            if plugin_name not in valid_plugins.all:
                 warn(
                     'Plugin "{plugin_name}" is invalid.'.format(
                         plugin_name=plugin_name,
                     )
                 )
                 continue
-            plugin_info = getattr(valid_plugins, plugin_type)[plugin_name].info
 
-            # Check for conflicts
-            with suppress(KeyError):
-                conflict = False
-                for other in plugin_info.conflicts:
-                    if other in self.manager:
-                        warn(
-                            'Loaded plugin "{other}" conflicts with plugin '
-                            '"{plugin_name}". Unable to load.'.format(
-                                other=other,
-                                plugin_name=plugin_name,
-                            )
-                        )
-                        conflict = True
-                if conflict:
-                    continue
-
-            # Check for requirements
-            with suppress(KeyError):
-                for other in plugin_info.required:
-                    if other not in self.manager and other not in self['load']:
-                        warn(
-                            'Plugin "{other}" is required by "{plugin_name}". '
-                            'Please load "{other}" to avoid issues.'.format(
-                                other=other,
-                                plugin_name=plugin_name,
-                            )
+            plugin_names.add(plugin_name)
+
+        levels, cyclic = get_load_order(plugin_names)
+        for plugin_name in cyclic:
+            warn(
+                'Plugin "{plugin_name}" is a part of or requires a cycle of '
+                'required plugins. Unable to load.'.format(
+                    plugin_name=plugin_name,
+                )
+            )
+
+        if not levels:
+            return
+
+        self._pending_levels.extend(levels)
+        self._loading = True
+        self._load_next_level()
+
+    def _finish_loading(self):
+        """Stop loading and process whatever was queued in the meantime."""
+        self._pending_levels.clear()
+        self._loading = False
+
+        if self:
+            Delay(0, self._loop_through_queues)
+        else:
+            self._check_idle()
+
+    def _load_next_level(self):
+        """Prepare the plugins of the next level, then load them."""
+        try:
+            self._prepare_next_level()
+        except Exception:
+            self.logger.log_exception("Unable to load plugins")
+            self._finish_loading()
+
+    def _prepare_next_level(self):
+        if not self._pending_levels:
+            self._finish_loading()
+            return
+
+        level = []
+        preparing = set()
+        for plugin_name in self._pending_levels.popleft():
+
+            # Register models before anything can use them off-thread
+            try:
+                load_plugin_models(plugin_name)
+            except Exception:
+                self.logger.log_exception(
+                    'Unable to load models of plugin "{plugin_name}", it '
+                    'will not be loaded.'.format(plugin_name=plugin_name))
+
+                continue
+
+            level.append(plugin_name)
+
+            if valid_plugins.all[plugin_name].has_prepare:
+                preparing.add(plugin_name)
+
+        if not preparing:
+            self._load_level(level)
+            return
+
+        for plugin_name in sorted(preparing):
+            job_scheduler.submit(
+                target=prepare_plugin,
+                args=(plugin_name, ),
+                priority=JobPriority.INTERACTIVE,
+                callback=self._get_prepare_callback(
+                    level, preparing, plugin_name),
+            )
+
+    def _get_prepare_callback(self, level, preparing, plugin_name):
+        def callback(future):
+            try:
+                if future.exception() is None:
+                    set_prepared_data(plugin_name, future.result())
+
+                else:
+                    self.logger.log_message(
+                        'Unable to prepare plugin "{plugin_name}", it will '
+                        'prepare itself while loading.'.format(
+                            plugin_name=plugin_name,
                         )
+                    )
+
+            except Exception:
+                self.logger.log_exception(
+                    'Unable to store prepared data of plugin '
+                    '"{plugin_name}"'.format(plugin_name=plugin_name))
+
+            preparing.discard(plugin_name)
+            if not preparing:
+                self._load_level(level)
+
+        return callback
+
+    def _load_level(self, level):
+        """Load the prepared plugins one by one."""
+        for plugin_name in level:
+            try:
+                self._load_plugin(plugin_name)
+            except Exception:
+                self.logger.log_exception(
+                    'Unable to load plugin "{plugin_name}"'.format(
+                        plugin_name=plugin_name))
+
+        self._load_next_level()
+
+    def _load_plugin(self, plugin_name):
+        """Load the given plugin if it doesn't conflict with loaded ones."""
+        if plugin_name in self.manager:
+            return
+
+        # Check for conflicts
+        conflicts = [
+            other for other in sorted(plugin_conflicts[plugin_name])
+            if other in self.manager
+        ]
+        for other in conflicts:
+            warn(
+                'Loaded plugin "{other}" conflicts with plugin '
+                '"{plugin_name}". Unable to load.'.format(
+                    other=other,
+                    plugin_name=plugin_name,
+                )
+            )
+        if conflicts:
+            return
+
+        # Check for requirements
+        for other in valid_plugins.all[plugin_name].required:
+            if other not in self.manager:
+                warn(
+                    'Plugin "{other}" is required by "{plugin_name}". '
+                    'Please load "{other}" to avoid issues.'.format(
+                        other=other,
+                        plugin_name=plugin_name,
+                    )
+                )
 
-            # Load the plugin and get its instance
-            self.manager.set_base_import(plugin_type)
-            self.manager.load(plugin_name)
+        # Load the plugin and get its instance
+        self.manager.set_base_import(
+            valid_plugins.get_plugin_type(plugin_name))
+        self.manager.load(plugin_name)
 
 # Get the _PluginQueue instance
 plugin_queue = _PluginQueue()
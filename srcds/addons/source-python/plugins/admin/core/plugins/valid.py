@@ -4,15 +4,21 @@
 # >> IMPORTS
 # =============================================================================
 # Python
+import ast
 from collections import defaultdict
-from importlib import import_module
+import json
 from warnings import warn
 
+# Site-Package
+from configobj import ConfigObj
+
 # Source.Python
 from plugins.info import PluginInfo
 
 # Source.Python Admin
-from ..paths import ADMIN_PLUGINS_PATH
+from . import admin_plugins_logger
+from ..paths import ADMIN_DATA_PATH, ADMIN_PLUGINS_PATH
+from ..startup_profiler import startup_profiler
 
 
 # =============================================================================
@@ -21,6 +27,7 @@ from ..paths import ADMIN_PLUGINS_PATH
 __all__ = (
     'ValidPlugin',
     '_ValidPlugins',
+    'plugin_conflicts',
     'plugin_requirements',
     'valid_plugins',
 )
@@ -30,6 +37,86 @@ __all__ = (
 # >> GLOBAL VARIABLES
 # =============================================================================
 plugin_requirements = defaultdict(list)
+plugin_conflicts = defaultdict(set)
+
+# Discovery results of the last startup
+MANIFEST_FILE = ADMIN_DATA_PATH / 'plugin_manifest.json'
+
+# Bump this whenever the manifest structure changes
+MANIFEST_VERSION = 2
+
+admin_plugins_discovery_logger = admin_plugins_logger.discovery
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _get_mtime(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _get_stamp(plugin_type):
+    """Return modification times of everything discovery depends on."""
+    type_path = ADMIN_PLUGINS_PATH.joinpath(plugin_type)
+    stamp = {'': _get_mtime(type_path)}
+    for plugin in type_path.dirs():
+        if plugin.namebase == '__pycache__':
+            continue
+
+        for path in (
+            plugin,
+            plugin.joinpath('__init__.py'),
+            plugin.joinpath('info.ini'),
+        ):
+            stamp[str(type_path.relpathto(path))] = _get_mtime(path)
+
+    return stamp
+
+
+def _as_list(value):
+    """Return the info.ini value as a list (single values are strings)."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _get_docstring(path):
+    """Return the docstring of a module without importing it."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return ast.get_docstring(ast.parse(f.read(), path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_FILE, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+
+    return manifest
+
+
+def _save_manifest(manifest):
+    try:
+        if not MANIFEST_FILE.parent.isdir():
+            MANIFEST_FILE.parent.makedirs()
+
+        with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    except OSError:
+        admin_plugins_discovery_logger.log_message(
+            "Unable to save plugin manifest to {}".format(MANIFEST_FILE))
 
 
 # =============================================================================
@@ -38,10 +125,38 @@ plugin_requirements = defaultdict(list)
 class ValidPlugin(object):
     """Stores a valid plugin with its information."""
 
-    def __init__(self, info, description):
+    def __init__(self, name, plugin_type, info_data, description,
+                 has_models=False, has_custom_events=False,
+                 has_prepare=False):
         """Store the info and description."""
-        self.info = info
+        self.name = name
+        self.plugin_type = plugin_type
+        self.info_data = info_data
         self.description = description
+        self.has_models = has_models
+        self.has_custom_events = has_custom_events
+        self.has_prepare = has_prepare
+        self.required = _as_list(info_data.get('required'))
+        self.conflicts = _as_list(info_data.get('conflicts'))
+        self._info = None
+
+    @property
+    def info(self):
+        """Return the plugin's info, built from its info.ini on demand."""
+        if self._info is None:
+            self._info = PluginInfo(self.name, **self.info_data)
+        return self._info
+
+    def get_module_name(self, module=None):
+        """Return the full import path of the plugin or one of its modules.
+        """
+        name = 'admin.plugins.{plugin_type}.{plugin_name}'.format(
+            plugin_type=self.plugin_type,
+            plugin_name=self.name,
+        )
+        if module is None:
+            return name
+        return name + '.' + module
 
 
 class _ValidPlugins(object):
@@ -49,34 +164,145 @@ class _ValidPlugins(object):
 
     def __init__(self):
         """Store all plugins by their type."""
-        self.included = self._get_plugins_by_type('included')
-        self.custom = self._get_plugins_by_type('custom')
-        for plugin in list(self.custom):
-            if plugin in self.included:
-                del self.custom[plugin]
+        self.included = {}
+        self.custom = {}
+        self.all = {}
+
+        # Plugin name -> (plugin type, ValidPlugin instance)
+        self._index = {}
+
+        self.refresh()
+
+    def refresh(self, keep=()):
+        """Discover the plugins again, e.g. to pick up new custom plugins.
+
+        :param keep: Names of plugins to keep even if they are no longer
+            valid (e.g. plugins that are still loaded).
+        :return: Sorted lists of names of added and removed plugins.
+        :rtype: tuple
+        """
+        manifest = _load_manifest()
+        new_manifest = {'version': MANIFEST_VERSION}
+
+        included = self._get_plugins_by_type(
+            'included', manifest, new_manifest)
+        custom = self._get_plugins_by_type(
+            'custom', manifest, new_manifest)
+
+        if new_manifest != manifest:
+            _save_manifest(new_manifest)
+
+        for plugin in list(custom):
+            if plugin in included:
+                del custom[plugin]
                 warn(
                     'Custom plugin "{plugin_name}" is invalid, as there is '
                     'already an included plugin of the same name.'.format(
                         plugin_name=plugin,
                     )
                 )
+
+        plugins_by_type = {'included': included, 'custom': custom}
+        for plugin_name in keep:
+            if plugin_name in included or plugin_name in custom:
+                continue
+
+            plugin = self.all.get(plugin_name)
+            if plugin is not None:
+                plugins_by_type[plugin.plugin_type][plugin_name] = plugin
+
+        old_names = set(self.all)
+
+        self.included = {
+            plugin_name: self._reuse(plugin)
+            for plugin_name, plugin in included.items()
+        }
+        self.custom = {
+            plugin_name: self._reuse(plugin)
+            for plugin_name, plugin in custom.items()
+        }
         self.all = dict(self.included)
         self.all.update(self.custom)
 
+        self._index = {
+            plugin_name: (plugin.plugin_type, plugin)
+            for plugin_name, plugin in self.all.items()
+        }
+
+        # Rebuild the relations in place, they're imported by other modules
+        plugin_requirements.clear()
+        plugin_conflicts.clear()
+        for plugin_name, plugin in self.all.items():
+            for other in plugin.required:
+                plugin_requirements[other].append(plugin_name)
+
+            for other in plugin.conflicts:
+                plugin_conflicts[plugin_name].add(other)
+                plugin_conflicts[other].add(plugin_name)
+
+        return (
+            sorted(set(self.all) - old_names),
+            sorted(old_names - set(self.all)),
+        )
+
+    def _reuse(self, plugin):
+        """Return the already known instance of an unchanged plugin."""
+        old_plugin = self.all.get(plugin.name)
+        if (
+            old_plugin is not None and
+            old_plugin.plugin_type == plugin.plugin_type and
+            old_plugin.info_data == plugin.info_data and
+            old_plugin.description == plugin.description and
+            old_plugin.has_models == plugin.has_models and
+            old_plugin.has_custom_events == plugin.has_custom_events and
+            old_plugin.has_prepare == plugin.has_prepare
+        ):
+            return old_plugin
+
+        return plugin
+
     def get_plugin_type(self, plugin_name):
         """Return the type (included or custom) for the given plugin."""
-        for plugin_type in ('included', 'custom'):
-            if plugin_name in getattr(self, plugin_type):
-                return plugin_type
-        raise ValueError(
-            'No such plugin "{plugin_name}".'.format(
-                plugin_name=plugin_name,
-            )
-        )
+        try:
+            return self._index[plugin_name][0]
+        except KeyError:
+            raise ValueError(
+                'No such plugin "{plugin_name}".'.format(
+                    plugin_name=plugin_name,
+                )
+            ) from None
+
+    @classmethod
+    def _get_plugins_by_type(cls, plugin_type, manifest, new_manifest):
+        """Store each plugin for the given type.
+
+        Entries of the manifest are reused if none of the plugin
+        directories, their __init__.py and info.ini files have changed.
+        """
+        stamp = _get_stamp(plugin_type)
+        cached = manifest.get(plugin_type)
+        if cached is None or cached['stamp'] != stamp:
+            entries = cls._discover_plugins(plugin_type)
+        else:
+            entries = cached['plugins']
+
+        new_manifest[plugin_type] = {'stamp': stamp, 'plugins': entries}
+
+        return {
+            plugin_name: ValidPlugin(
+                plugin_name,
+                plugin_type,
+                entry['info'],
+                entry['description'],
+                entry['has_models'],
+                entry['has_custom_events'],
+                entry['has_prepare'],
+            ) for plugin_name, entry in entries.items()
+        }
 
     @staticmethod
-    def _get_plugins_by_type(plugin_type):
-        """Store each plugin for the given type."""
+    def _discover_plugins(plugin_type):
+        """Find plugins of the given type without importing them."""
         # Create a dictionary to store plugins by name
         plugins = dict()
 
@@ -109,45 +335,31 @@ class _ValidPlugins(object):
                 )
                 continue
 
-            # Get the plugin's description
-            description = import_module(
-                'admin.plugins.{plugin_type}.{plugin_name}'.format(
-                    plugin_type=plugin_type,
-                    plugin_name=plugin.namebase,
-                )
-            ).__doc__
-
-            # Get the plugin's info
-            info = import_module(
-                'admin.plugins.{plugin_type}.{plugin_name}.info'.format(
-                    plugin_type=plugin_type,
-                    plugin_name=plugin.namebase,
-                )
-            )
-
-            # Does the info have an info attribute?
-            if not (
-                hasattr(info, 'info') and isinstance(info.info, PluginInfo)
-            ):
+            # Does the info.ini file not exist?
+            ini_file = plugin.joinpath('info.ini')
+            if not ini_file.isfile():
                 warn(
-                    '{plugin_type} plugin "{plugin_name}" info.py does not '
-                    'contain a PluginInfo object.'.format(
+                    '{plugin_type} plugin "{plugin_name}" is missing '
+                    'info.ini file.'.format(
                         plugin_type=plugin_type.title(),
-                        plugin_name=plugin,
+                        plugin_name=plugin.namebase,
                     )
                 )
                 continue
 
             # Add the plugin to the dictionary
-            plugins[str(plugin.namebase)] = ValidPlugin(info.info, description)
-
-            required = info.info.get('required', [])
-
-            for other in required:
-                plugin_requirements[other].append(str(plugin.namebase))
+            plugins[str(plugin.namebase)] = {
+                'info': ConfigObj(ini_file).dict(),
+                'description': _get_docstring(plugin.joinpath('__init__.py')),
+                'has_models': plugin.joinpath('models.py').isfile(),
+                'has_custom_events': plugin.joinpath(
+                    'custom_events.py').isfile(),
+                'has_prepare': plugin.joinpath('prepare.py').isfile(),
+            }
 
         # Return the dictionary
         return plugins
 
 # Get the _ValidPlugins instance
-valid_plugins = _ValidPlugins()
+with startup_profiler.phase("plugin discovery"):
+    valid_plugins = _ValidPlugins()
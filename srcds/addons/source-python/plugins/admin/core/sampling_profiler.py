@@ -0,0 +1,207 @@
+"""On-demand sampling profiler of Source.Python Admin code running on the
+game thread.
+
+While running, a separate thread periodically takes the stack of the game
+thread. Samples that include Source.Python Admin frames (listeners, event
+handlers, menu callbacks, MoTD data handlers and everything they call) are
+aggregated by stack and written in the collapsed stack format that
+flamegraph.pl, speedscope and similar tools accept. Nothing runs while the
+profiler is stopped.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import Counter
+import sys
+from threading import Event, get_ident, Lock
+from time import perf_counter, strftime
+
+# Source.Python
+from listeners.tick import GameThread
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .paths import ADMIN_LOG_PATH
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# How often to take a sample of the game thread
+SAMPLING_INTERVAL = config.getfloat(
+    'profiling', 'sampling_interval_milliseconds', fallback=5.0) / 1000
+
+# Profiles longer than that are stopped automatically
+MAX_PROFILE_DURATION = 600.0
+
+# How many functions to show in the summary
+SUMMARY_FUNCTIONS_LIMIT = 10
+
+PROFILES_PATH = ADMIN_LOG_PATH / "profiles"
+
+sampling_profiler_logger = admin_core_logger.sampling_profiler
+
+# Identifier of the game thread
+_game_thread_ident = get_ident()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _is_admin_module(module_name):
+    return module_name == 'admin' or module_name.startswith('admin.')
+
+
+def _get_stack(frame):
+    """Return the collapsed stack of the frame (outermost frame first) and
+    the label of the innermost Source.Python Admin frame.
+
+    Stacks without Source.Python Admin frames are ignored, (None, None) is
+    returned for them.
+    """
+    labels = []
+    admin_label = None
+    while frame is not None:
+        module_name = frame.f_globals.get('__name__', '?')
+        label = "{}:{}".format(module_name, frame.f_code.co_name)
+        labels.append(label)
+
+        if admin_label is None and _is_admin_module(module_name):
+            admin_label = label
+
+        frame = frame.f_back
+
+    if admin_label is None:
+        return None, None
+
+    return ";".join(reversed(labels)), admin_label
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _SamplingProfiler:
+    """Sample the game thread stack from a separate thread."""
+    def __init__(self, interval=SAMPLING_INTERVAL):
+        self.interval = interval
+
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._sampler = None
+
+    @property
+    def running(self):
+        return self._sampler is not None
+
+    def start(self, duration):
+        """Start profiling.
+
+        :param float duration: Seconds to profile for.
+        :return: Whether the profiler was started (it might be running
+            already).
+        :rtype: bool
+        """
+        with self._lock:
+            if self._sampler is not None:
+                return False
+
+            duration = min(max(duration, self.interval), MAX_PROFILE_DURATION)
+
+            self._stop_event.clear()
+            self._sampler = GameThread(
+                target=self._sample_loop, args=(duration, ))
+            self._sampler.daemon = True
+            self._sampler.start()
+
+        sampling_profiler_logger.log_message(
+            "Profiling the game thread for {:.0f} seconds".format(duration))
+
+        return True
+
+    def stop(self, timeout=1.0):
+        """Stop profiling early, the profile is written nevertheless.
+
+        :return: Whether the profiler was running.
+        :rtype: bool
+        """
+        sampler = self._sampler
+        if sampler is None:
+            return False
+
+        self._stop_event.set()
+        sampler.join(timeout)
+        return True
+
+    def _sample_loop(self, duration):
+        stacks = Counter()
+        functions = Counter()
+        total_samples = 0
+
+        start_time = perf_counter()
+        while not self._stop_event.wait(self.interval):
+            if perf_counter() - start_time >= duration:
+                break
+
+            frame = sys._current_frames().get(_game_thread_ident)
+            total_samples += 1
+            if frame is None:
+                continue
+
+            stack, admin_label = _get_stack(frame)
+            del frame
+
+            if stack is None:
+                continue
+
+            stacks[stack] += 1
+            functions[admin_label] += 1
+
+        try:
+            self._write_profile(
+                stacks, functions, total_samples,
+                perf_counter() - start_time)
+        finally:
+            self._sampler = None
+
+    def _write_profile(self, stacks, functions, total_samples, duration):
+        path = PROFILES_PATH / "profile_{}.folded".format(
+            strftime("%Y%m%d_%H%M%S"))
+
+        try:
+            if not PROFILES_PATH.isdir():
+                PROFILES_PATH.makedirs()
+
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in stacks.most_common():
+                    f.write("{} {}\n".format(stack, count))
+        except OSError:
+            sampling_profiler_logger.log_exception(
+                "Unable to write the profile to {}".format(path))
+            return
+
+        admin_samples = sum(stacks.values())
+        lines = [
+            "Profile written to {}".format(path),
+            "{:.1f} s, {} samples, {} in Source.Python Admin code".format(
+                duration, total_samples, admin_samples),
+        ]
+
+        if admin_samples:
+            lines.append("")
+            lines.append(
+                "Innermost Source.Python Admin functions (samples, share), "
+                "top {}:".format(SUMMARY_FUNCTIONS_LIMIT))
+
+            for label, count in functions.most_common(
+                    SUMMARY_FUNCTIONS_LIMIT):
+
+                lines.append("  {:>7}  {:>5.1f}%  {}".format(
+                    count, count * 100 / admin_samples, label))
+
+        sampling_profiler_logger.log_message("\n".join(lines))
+
+# The singleton object of the _SamplingProfiler class.
+sampling_profiler = _SamplingProfiler()
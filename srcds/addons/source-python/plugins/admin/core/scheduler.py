@@ -0,0 +1,387 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import deque
+from enum import IntEnum
+from itertools import count
+from queue import Empty, PriorityQueue
+from threading import current_thread, Event, Lock
+
+# Source.Python
+from listeners.tick import Delay, GameThread
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Maximum number of worker threads running jobs at the same time
+MAX_WORKERS = config.getint('scheduler', 'max_workers', fallback=4)
+
+# How long an idle worker waits for a new job before exiting
+WORKER_IDLE_TIMEOUT = config.getfloat(
+    'scheduler', 'worker_idle_timeout_seconds', fallback=30.0)
+
+scheduler_logger = admin_core_logger.scheduler
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class JobPriority(IntEnum):
+    """Priority lanes of the scheduler, the lower the value the sooner
+    the job is picked up."""
+
+    # Lookups an admin is waiting for (popups, pages)
+    INTERACTIVE = 0
+
+    # Admin actions that don't have to show anything (bans, lifts)
+    NORMAL = 1
+
+    # Maintenance work (record saving, retention, imports)
+    BACKGROUND = 2
+
+# Queue entries with this priority tell workers to exit
+_STOP_PRIORITY = max(JobPriority) + 1
+
+
+class JobCancelledError(Exception):
+    pass
+
+
+class JobFuture:
+    """Result of a job submitted to the scheduler.
+
+    Done callbacks are always called on the game thread.
+    """
+    def __init__(self, target, args, kwargs, priority, context=(),
+                 serial_key=None):
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.serial_key = serial_key
+
+        # (getter, setter, value) of the thread-local values to apply on
+        # the thread that runs the job
+        self.context = context
+
+        self._lock = Lock()
+        self._done_event = Event()
+        self._started = False
+        self._cancelled = False
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+    def cancel(self):
+        """Cancel the job if it has not started yet.
+
+        :return: Whether the job was cancelled.
+        :rtype: bool
+        """
+        with self._lock:
+            if self._started or self._done_event.is_set():
+                return self._cancelled
+
+            self._cancelled = True
+
+        self._set_done()
+        return True
+
+    def cancelled(self):
+        return self._cancelled
+
+    def running(self):
+        return self._started and not self._done_event.is_set()
+
+    def done(self):
+        return self._done_event.is_set()
+
+    def result(self, timeout=None):
+        """Return the value returned by the job.
+
+        Never call this with no timeout on the game thread before the job
+        is done - use done callbacks instead.
+
+        :param float timeout: How long to wait for the job to finish.
+        :raise JobCancelledError: If the job was cancelled.
+        :raise TimeoutError: If the job didn't finish in time.
+        """
+        if not self._done_event.wait(timeout):
+            raise TimeoutError("Job didn't finish in time")
+
+        if self._cancelled:
+            raise JobCancelledError("Job was cancelled")
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self._result
+
+    def exception(self, timeout=None):
+        if not self._done_event.wait(timeout):
+            raise TimeoutError("Job didn't finish in time")
+
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """Add a callback to call on the game thread once the job is done.
+
+        :param callback: Callable that receives this future.
+        """
+        with self._lock:
+            if not self._done_event.is_set():
+                self._callbacks.append(callback)
+                return
+
+        Delay(0, callback, (self, ))
+
+    def _run(self):
+        with self._lock:
+            if self._cancelled:
+                return False
+
+            self._started = True
+
+        outer_context = tuple(
+            (setter, getter()) for getter, setter, _ in self.context)
+
+        for _, setter, value in self.context:
+            setter(value)
+
+        try:
+            self._result = self.target(*self.args, **self.kwargs)
+        except Exception as exception:
+            self._exception = exception
+            scheduler_logger.log_exception(
+                "Job {!r} raised an exception".format(self.target))
+        finally:
+            for setter, value in outer_context:
+                setter(value)
+
+        self._set_done()
+        return True
+
+    def _set_done(self):
+        with self._lock:
+            self._done_event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            Delay(0, callback, (self, ))
+
+
+class _JobScheduler:
+    """Run jobs on a bounded pool of worker threads.
+
+    Workers are spawned on demand and exit after staying idle for a while.
+    Jobs of the same priority start in the order they were submitted, but
+    may finish in any order. Jobs that share a serial key run one at a time
+    and finish in the order they were submitted.
+    """
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max(1, max_workers)
+
+        self._queue = PriorityQueue()
+        self._sequence = count()
+        self._lock = Lock()
+        self._workers = set()
+        self._idle_workers = 0
+        self._stopping = False
+
+        # (getter, setter) pairs of thread-local values to carry over from
+        # the submitting thread to the job
+        self._contexts = []
+
+        # Jobs waiting for the running job with the same serial key
+        self._serial_lanes = {}
+
+        self._queued = {priority: 0 for priority in JobPriority}
+        self._running = 0
+        self.peak_queue_depth = 0
+        self.submitted_jobs = 0
+        self.finished_jobs = 0
+        self.failed_jobs = 0
+        self.cancelled_jobs = 0
+
+    def submit(self, target, args=(), kwargs=None,
+               priority=JobPriority.NORMAL, callback=None, serial_key=None):
+        """Schedule the target to be called on a worker thread.
+
+        :param target: Callable to run.
+        :param tuple args: Positional arguments to pass to the target.
+        :param dict kwargs: Keyword arguments to pass to the target.
+        :param JobPriority priority: Lane to put the job into.
+        :param callback: Optional callable to call on the game thread with
+        the future once the job is done.
+        :param serial_key: Optional hashable key. Jobs with the same key
+        never run at the same time and run in the order they were
+        submitted.
+        :rtype: JobFuture
+        """
+        future = JobFuture(target, args, kwargs or {}, priority, tuple(
+            (getter, setter, getter()) for getter, setter in self._contexts),
+            serial_key)
+
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        with self._lock:
+            self.submitted_jobs += 1
+
+            if serial_key is not None:
+                waiting = self._serial_lanes.get(serial_key)
+
+                # Another job of this key is queued or running, it will
+                # queue this one once it's done
+                if waiting is not None:
+                    waiting.append(future)
+                    return future
+
+                self._serial_lanes[serial_key] = deque()
+
+            if not self._stopping:
+                self._enqueue(future)
+                return future
+
+        # Workers are exiting, so don't leave the job behind
+        self._run_future(future)
+        return future
+
+    def register_context(self, getter, setter):
+        """Carry a thread-local value over from the submitting thread to
+        the jobs it submits.
+
+        :param getter: Callable that returns the value on the current
+        thread.
+        :param setter: Callable that sets the value on the current thread.
+        """
+        self._contexts.append((getter, setter))
+
+    def _enqueue(self, future):
+        # Must be called with the lock held
+        self._queued[future.priority] += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+
+        self._queue.put((future.priority, next(self._sequence), future))
+
+        if (self.queue_depth > self._idle_workers and
+                len(self._workers) < self.max_workers):
+
+            self._spawn_worker()
+
+    def _release_serial_key(self, serial_key):
+        with self._lock:
+            waiting = self._serial_lanes[serial_key]
+            if not waiting:
+                del self._serial_lanes[serial_key]
+                return
+
+            future = waiting.popleft()
+            if not self._stopping:
+                self._enqueue(future)
+                return
+
+        self._run_future(future)
+
+    def _spawn_worker(self):
+        worker = GameThread(target=self._work)
+        worker.daemon = True
+        self._workers.add(worker)
+        worker.start()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                self._idle_workers += 1
+
+            try:
+                priority, _, future = self._queue.get(
+                    timeout=WORKER_IDLE_TIMEOUT)
+
+            except Empty:
+                with self._lock:
+                    self._idle_workers -= 1
+
+                    # Don't exit if a job was put right after the timeout
+                    if self._queue.empty():
+                        self._workers.discard(current_thread())
+                        return
+
+                continue
+
+            with self._lock:
+                self._idle_workers -= 1
+
+                if priority == _STOP_PRIORITY:
+                    self._workers.discard(current_thread())
+                    return
+
+                self._queued[priority] -= 1
+
+            self._run_future(future)
+
+    def _run_future(self, future):
+        with self._lock:
+            self._running += 1
+
+        ran = future._run()
+
+        with self._lock:
+            self._running -= 1
+
+            if not ran:
+                self.cancelled_jobs += 1
+            elif future._exception is not None:
+                self.failed_jobs += 1
+            else:
+                self.finished_jobs += 1
+
+        if future.serial_key is not None:
+            self._release_serial_key(future.serial_key)
+
+    def stop(self):
+        """Let workers finish all the queued jobs and exit.
+
+        Jobs submitted after this run right away on the calling thread.
+        """
+        with self._lock:
+            self._stopping = True
+
+            for _ in range(len(self._workers)):
+                self._queue.put((_STOP_PRIORITY, next(self._sequence), None))
+
+    @property
+    def queue_depth(self):
+        return sum(self._queued.values())
+
+    def get_metrics(self):
+        """Return a snapshot of the scheduler state.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'workers': len(self._workers),
+                'max_workers': self.max_workers,
+                'running': self._running,
+                'queue_depth': self.queue_depth,
+                'queue_depth_by_priority': {
+                    priority.name.lower(): queued
+                    for priority, queued in self._queued.items()
+                },
+                'peak_queue_depth': self.peak_queue_depth,
+                'serial_waiting': sum(map(len, self._serial_lanes.values())),
+                'submitted': self.submitted_jobs,
+                'finished': self.finished_jobs,
+                'failed': self.failed_jobs,
+                'cancelled': self.cancelled_jobs,
+            }
+
+# The singleton object of the _JobScheduler class.
+job_scheduler = _JobScheduler()
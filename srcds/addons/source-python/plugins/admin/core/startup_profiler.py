@@ -0,0 +1,220 @@
+"""Opt-in profiler of Source.Python Admin startup.
+
+Has to be imported before the rest of Source.Python Admin modules so that
+their imports are timed.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+import sys
+from threading import get_ident
+from time import perf_counter
+
+# Source.Python Admin
+from . import admin_core_logger
+
+_config_start_time = perf_counter()
+
+from .config import config
+
+_config_time = perf_counter() - _config_start_time
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+STARTUP_PROFILING_ENABLED = config.getboolean(
+    'profiling', 'startup', fallback=False)
+
+# How many slowest imports to show in the report
+REPORT_IMPORTS_LIMIT = 25
+
+startup_profiler_logger = admin_core_logger.startup_profiler
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _TimingLoader:
+    """Proxy of a module loader that times module execution."""
+    def __init__(self, loader, fullname, profiler):
+        self._loader = loader
+        self._fullname = fullname
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Let the module see its original loader
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        self._profiler._enter_import(self._fullname)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(self._fullname)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path finder that wraps loaders of other finders."""
+    def __init__(self, profiler):
+        self._profiler = profiler
+        self._searching = set()
+
+    def find_spec(self, fullname, path, target=None):
+        # Don't time imports made by worker threads
+        if get_ident() != self._profiler._thread_ident:
+            return None
+
+        # Prevent recursion, we're asking other finders
+        if fullname in self._searching:
+            return None
+
+        self._searching.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._searching.discard(fullname)
+
+        if spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            return spec
+
+        spec.loader = _TimingLoader(spec.loader, fullname, self._profiler)
+        return spec
+
+
+class _StartupProfiler:
+    """Time startup phases and module imports."""
+    def __init__(self, enabled=STARTUP_PROFILING_ENABLED):
+        self.enabled = enabled
+        self.finished = False
+
+        # Phase name -> [total seconds, calls]
+        self.phases = {}
+
+        # Module name -> [inclusive seconds, self seconds]
+        self.imports = {}
+
+        self._import_stack = []
+        self._thread_ident = get_ident()
+        self._finder = None
+        self._start_time = perf_counter()
+        self.total_time = None
+
+    def start(self):
+        if not self.enabled or self._finder is not None:
+            return
+
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def finish(self):
+        """Stop timing imports and log the report."""
+        if not self.enabled or self.finished:
+            return
+
+        self.finished = True
+        self.total_time = perf_counter() - self._start_time
+
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+        self._finder = None
+
+        startup_profiler_logger.log_message(self.get_report())
+
+    @contextmanager
+    def phase(self, name):
+        """Time the code in the with-block as the given phase.
+
+        Phases with the same name are summed up.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, perf_counter() - start_time)
+
+    def add_phase(self, name, seconds):
+        if not self.enabled:
+            return
+
+        phase = self.phases.setdefault(name, [0.0, 0])
+        phase[0] += seconds
+        phase[1] += 1
+
+    def _enter_import(self, fullname):
+        self._import_stack.append([fullname, perf_counter(), 0.0])
+
+    def _exit_import(self, fullname):
+        fullname, start_time, children_time = self._import_stack.pop()
+        inclusive_time = perf_counter() - start_time
+
+        if self._import_stack:
+            self._import_stack[-1][2] += inclusive_time
+
+        self.imports[fullname] = [
+            inclusive_time, inclusive_time - children_time]
+
+    def get_report(self):
+        """Return the report sorted by time.
+
+        :rtype: str
+        """
+        if not self.enabled:
+            return (
+                "Startup profiling is disabled, set [profiling] startup=1 "
+                "in the config.ini of Source.Python Admin to enable it")
+
+        lines = ["Source.Python Admin startup profile"]
+        if self.total_time is not None:
+            lines.append("Total: {:.1f} ms".format(self.total_time * 1000))
+
+        lines.append("")
+        lines.append("Phases (total ms, calls):")
+        for name, (seconds, calls) in sorted(
+                self.phases.items(), key=lambda item: -item[1][0]):
+
+            lines.append("  {:>9.1f}  {:>5}  {}".format(
+                seconds * 1000, calls, name))
+
+        lines.append("")
+        lines.append(
+            "Slowest imports (self ms, inclusive ms), top {}:".format(
+                REPORT_IMPORTS_LIMIT))
+
+        for name, (inclusive_time, self_time) in sorted(
+                self.imports.items(),
+                key=lambda item: -item[1][1])[:REPORT_IMPORTS_LIMIT]:
+
+            lines.append("  {:>9.1f}  {:>9.1f}  {}".format(
+                self_time * 1000, inclusive_time * 1000, name))
+
+        return "\n".join(lines)
+
+# The singleton object of the _StartupProfiler class.
+startup_profiler = _StartupProfiler()
+startup_profiler.add_phase("core config", _config_time)
+startup_profiler.start()
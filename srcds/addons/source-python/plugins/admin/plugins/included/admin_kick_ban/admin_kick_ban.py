@@ -12,8 +12,13 @@ from admin.core.frontends.menus import (
 from admin.core.frontends.motd import (
     main_motd, MOTDSection, MOTDPageEntry, PlayerBasedFeaturePage)
 from admin.core.helpers import log_admin_action
+from admin.core.metrics import metrics
+from admin.core.plugins.prepare import pop_prepared_data
+from admin.core.startup_profiler import startup_profiler
 
 # Included Plugin
+from .admission import get_admission_metrics
+from .bans.base import stock_ban_data_watcher
 from .bans.ip_address import (
     ban_ip_address_feature, banned_ip_address_manager,
     BanIPAddressMenuCommand, BanIPAddressPage,
@@ -27,6 +32,10 @@ from .bans.steamid import (
     LiftSteamIDBanPage, review_steamid_ban_popup_feature,
     ReviewSteamIDBanPage, search_bad_steamid_bans_popup_feature)
 from .strings import plugin_strings
+from .sync import ban_sync
+
+# Registers the "bans import" and "bans export" server sub-commands
+from . import transfer  # noqa: F401
 
 
 # =============================================================================
@@ -190,5 +199,45 @@ motd_section_ip_address.add_entry(MOTDPageEntry(
 # =============================================================================
 # >> SYNCHRONOUS DATABASE OPERATIONS
 # =============================================================================
-banned_steamid_manager.refresh()
-banned_ip_address_manager.refresh()
+# Bans are usually loaded by prepare.py before the plugin is loaded
+_prepared_data = pop_prepared_data('admin_kick_ban')
+
+if _prepared_data is None:
+    # Skip the ban events that the following refreshes will account for
+    ban_sync.reset_sequence()
+
+    with startup_profiler.phase("ban cache refresh"):
+        banned_steamid_manager.refresh()
+        banned_ip_address_manager.refresh()
+
+else:
+    ban_sync.reset_sequence(_prepared_data['last_sequence'])
+
+    with startup_profiler.phase("ban cache refresh"):
+        banned_steamid_manager.refresh(_prepared_data['steamid'])
+        banned_ip_address_manager.refresh(_prepared_data['ip_address'])
+
+
+# =============================================================================
+# >> BAN SYNC
+# =============================================================================
+ban_sync.start()
+
+
+# =============================================================================
+# >> STOCK BAN DATA WATCHER
+# =============================================================================
+stock_ban_data_watcher.start()
+
+
+# =============================================================================
+# >> METRICS
+# =============================================================================
+metrics.register_collector('admission', get_admission_metrics)
+
+
+# =============================================================================
+# >> LOAD & UNLOAD FUNCTIONS
+# =============================================================================
+def unload():
+    metrics.unregister_collector('admission')
@@ -0,0 +1,230 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import OrderedDict
+from functools import lru_cache
+from time import time
+
+# Included Plugin
+from .strings import plugin_strings
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+@lru_cache()
+def get_ban_reason(language):
+    """Return the default ban reason translated to the given language.
+
+    :param str language: Language to translate the reason to.
+    :return: Translated reason.
+    :rtype: str
+    """
+    return plugin_strings['default_ban_reason'].get_string(language)
+
+
+@lru_cache()
+def get_flood_reason(language):
+    """Return the connection flood rejection reason translated to the given
+    language.
+
+    :param str language: Language to translate the reason to.
+    :return: Translated reason.
+    :rtype: str
+    """
+    return plugin_strings['default_flood_reason'].get_string(language)
+
+
+def get_admission_metrics():
+    """Return the connection check counters, shown in "admin stats".
+
+    :rtype: dict
+    """
+    result = {}
+    for prefix, counter in (
+            ('challenge', challenge_check_counter),
+            ('client_connect', client_connect_check_counter)):
+
+        for key, value in counter.get_metrics().items():
+            result[prefix + '.' + key] = value
+
+    return result
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class ConnectionCheckCounter:
+    """Count connection checks per second."""
+    def __init__(self):
+        self.total = 0
+        self.peak_per_second = 0
+
+        self._current_second = 0
+        self._current_count = 0
+        self._last_second_count = 0
+
+    def hit(self):
+        now = int(time())
+        if now != self._current_second:
+            if now == self._current_second + 1:
+                self._last_second_count = self._current_count
+            else:
+                self._last_second_count = 0
+
+            self._current_second = now
+            self._current_count = 0
+
+        self._current_count += 1
+        self.total += 1
+
+        if self._current_count > self.peak_per_second:
+            self.peak_per_second = self._current_count
+
+    @property
+    def per_second(self):
+        """Return the number of checks made during the last full second."""
+        now = int(time())
+        if now == self._current_second:
+            return self._last_second_count
+
+        if now == self._current_second + 1:
+            return self._current_count
+
+        return 0
+
+    def get_metrics(self):
+        """Return a snapshot of the counter.
+
+        :rtype: dict
+        """
+        return {
+            'total': self.total,
+            'per_second': self.per_second,
+            'peak_per_second': self.peak_per_second,
+        }
+
+
+class _TokenBucket:
+    __slots__ = ('tokens', 'updated_at', 'violations')
+
+    def __init__(self, tokens, updated_at):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.violations = 0
+
+
+class ConnectionFloodGuard:
+    """Per-address token bucket rate limiter.
+
+    Every address may make up to *burst* connection attempts in a row and
+    regains *rate* attempts per second. Only the *max_tracked* most recently
+    seen addresses are remembered.
+    """
+    def __init__(self, rate, burst, max_tracked, ban_threshold=0,
+                 ban_callback=None):
+
+        self.rate = rate
+        self.burst = burst
+        self.max_tracked = max_tracked
+        self.ban_threshold = ban_threshold
+        self.ban_callback = ban_callback
+
+        self._buckets = OrderedDict()
+
+    def check(self, address):
+        """Consume one connection attempt of the given address.
+
+        :param str address: Address that attempts to connect.
+        :return: Whether or not the attempt should be allowed.
+        :rtype: bool
+        """
+        now = time()
+
+        bucket = self._buckets.get(address)
+        if bucket is None:
+            bucket = self._buckets[address] = _TokenBucket(self.burst, now)
+
+            if len(self._buckets) > self.max_tracked:
+                self._buckets.popitem(last=False)
+
+        else:
+            self._buckets.move_to_end(address)
+
+            bucket.tokens = min(
+                self.burst,
+                bucket.tokens + (now - bucket.updated_at) * self.rate)
+
+            bucket.updated_at = now
+
+            # The address has calmed down, forgive its violations
+            if bucket.tokens >= self.burst:
+                bucket.violations = 0
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return True
+
+        bucket.violations += 1
+        if (
+                self.ban_threshold > 0 and
+                bucket.violations == self.ban_threshold and
+                self.ban_callback is not None):
+
+            self.ban_callback(address)
+
+        return False
+
+    def forget(self, address):
+        self._buckets.pop(address, None)
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class DecisionCache:
+    """Short-lived cache of positive and negative ban decisions."""
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._decisions = OrderedDict()
+
+    def get(self, key):
+        """Return the cached decision or None if there's no valid one."""
+        try:
+            decision, expires_at = self._decisions[key]
+        except KeyError:
+            return None
+
+        if expires_at < time():
+            self._decisions.pop(key, None)
+            return None
+
+        return decision
+
+    def set(self, key, decision):
+        if self.ttl <= 0:
+            return
+
+        # Pop and insert rather than move_to_end, so that a clear() made in
+        # between can't make this fail
+        self._decisions.pop(key, None)
+        self._decisions[key] = (decision, time() + self.ttl)
+
+        if len(self._decisions) > self.max_size:
+            self._decisions.popitem(last=False)
+
+    def clear(self):
+        self._decisions.clear()
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Checks made in the connection challenge hook
+challenge_check_counter = ConnectionCheckCounter()
+
+# Checks made in the OnClientConnect listener
+client_connect_check_counter = ConnectionCheckCounter()
@@ -0,0 +1,103 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from time import time
+
+# Source.Python
+from listeners import OnClientActive
+
+# Included Plugin
+from .left_player import online_player_table
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# How many player ban statuses to remember per ban type
+MAX_BAN_STATUSES = 1024
+
+_ban_status_caches = []
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class BanStatusCache(dict):
+    """Ban expiration of players against one ban manager, by SteamID.
+
+    Statuses are computed once per player (and address) and dropped
+    whenever any ban of the manager changes. Whether the ban has expired
+    is checked on every read.
+
+    The cache is only read, filled and dropped on the game thread.
+    """
+    def __init__(self, banned_uniqueid_manager, get_uniqueid):
+        """Initialize the cache.
+
+        :param banned_uniqueid_manager: Manager to look the bans up in.
+        :param get_uniqueid: Callable returning the uniqueid (as expected by
+        the manager) of the given left player.
+        """
+        super().__init__()
+
+        self._banned_uniqueid_manager = banned_uniqueid_manager
+        self._get_uniqueid = get_uniqueid
+
+        banned_uniqueid_manager.change_listeners.append(self.clear)
+        _ban_status_caches.append(self)
+
+    def _get_expires_at(self, left_player):
+        try:
+            uniqueid = self._banned_uniqueid_manager.\
+                _convert_uniqueid_to_db_format(self._get_uniqueid(left_player))
+        except ValueError:
+            return None
+
+        banned_player_info = self._banned_uniqueid_manager.get(uniqueid)
+        if banned_player_info is None:
+            return None
+
+        return banned_player_info.expires_at
+
+    def get_expires_at(self, left_player):
+        """Return expiration of the ban of the given player.
+
+        :param left_player: LeftPlayer instance.
+        :return: Ban expiration timestamp, negative value for permanent bans
+        or None if the player is not banned.
+        """
+        status = self.get(left_player.steamid)
+        if status is None or status[0] != left_player.address:
+            if len(self) >= MAX_BAN_STATUSES:
+                self.clear()
+
+            status = self[left_player.steamid] = (
+                left_player.address, self._get_expires_at(left_player))
+
+        return status[1]
+
+    def is_banned(self, left_player):
+        """Return whether the given player is currently banned.
+
+        :param left_player: LeftPlayer instance.
+        :rtype: bool
+        """
+        expires_at = self.get_expires_at(left_player)
+        if expires_at is None:
+            return False
+
+        return expires_at < 0 or expires_at >= time()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnClientActive
+def listener_on_client_active(index):
+    left_player = online_player_table.get(index)
+    if left_player is None:
+        return
+
+    for ban_status_cache in _ban_status_caches:
+        ban_status_cache.get_expires_at(left_player)
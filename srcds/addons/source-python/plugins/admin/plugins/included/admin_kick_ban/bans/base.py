@@ -3,11 +3,14 @@
 # =============================================================================
 # Python
 from collections import OrderedDict
+from functools import lru_cache
+from hashlib import sha1
 import json
+from threading import get_ident
 from time import time
 
 # Source.Python
-from listeners.tick import GameThread
+from listeners.tick import Delay, Repeat
 from menus import PagedMenu, PagedOption, SimpleMenu, SimpleOption, Text
 from players.helpers import get_client_language
 from steam import SteamID
@@ -21,20 +24,51 @@ from admin.core.clients import clients
 from admin.core.features import BaseFeature, Feature
 from admin.core.frontends.motd import BaseFeaturePage
 from admin.core.helpers import format_player_name, log_admin_action
+from admin.core.metrics import metrics
 from admin.core.orm import Session
 from admin.core.paths import ADMIN_CFG_PATH, get_server_file
+from admin.core.scheduler import job_scheduler
 
 # Included Plugin
+from ..config import plugin_config
+from ..logger import plugin_logger
 from ..strings import plugin_strings
+from ..sync import ban_sync
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# How many formatted ban durations to remember
+FORMATTED_DURATIONS_CACHE_SIZE = 128
+
+# How many SteamID conversions to remember
+CONVERTED_STEAMIDS_CACHE_SIZE = 1024
+
+# Value of "banned_by" for the bans issued by the server itself
+BANNED_BY_SERVER = "SERVER"
+
+# Serial key of the jobs writing bans, so that a ban and the lift or review
+# that follows it are always committed and cached in that order
+BAN_WRITES_SERIAL_KEY = "admin_kick_ban.bans"
+
+STOCK_BAN_DATA_PATH = ADMIN_CFG_PATH / "included_plugins" / "admin_kick_ban"
+BAN_REASONS_FILE = STOCK_BAN_DATA_PATH / "ban_reasons.json"
+BAN_DURATIONS_FILE = STOCK_BAN_DATA_PATH / "ban_durations.json"
+
+# How often to check stock ban data files for changes
+STOCK_BAN_DATA_CHECK_INTERVAL = plugin_config.getfloat(
+    'settings', 'stock_ban_data_check_interval_seconds', fallback=10.0)
+
+# Identifier of the game thread
+_game_thread_ident = get_ident()
 
 
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
 def load_stock_ban_reasons():
-    with open(get_server_file(
-            ADMIN_CFG_PATH / "included_plugins" / "admin_kick_ban" /
-            "ban_reasons.json")) as f:
+    with open(get_server_file(BAN_REASONS_FILE)) as f:
 
         ban_reasons_json = json.load(f)
 
@@ -47,9 +81,7 @@ def load_stock_ban_reasons():
 
 
 def load_stock_ban_durations():
-    with open(get_server_file(
-            ADMIN_CFG_PATH / "included_plugins" / "admin_kick_ban" /
-            "ban_durations.json")) as f:
+    with open(get_server_file(BAN_DURATIONS_FILE)) as f:
 
         ban_durations_json = json.load(f)
 
@@ -58,6 +90,53 @@ def load_stock_ban_durations():
     return ban_durations_json
 
 
+def get_stock_ban_data_stamp():
+    """Return a value that changes whenever any of the stock ban data files
+    (or their _server overrides) is modified, created or removed."""
+    stamp = []
+    for path in (BAN_REASONS_FILE, BAN_DURATIONS_FILE):
+        path = get_server_file(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            stamp.append((str(path), None, None))
+        else:
+            stamp.append((str(path), stat.st_mtime, stat.st_size))
+
+    return tuple(stamp)
+
+
+def reload_stock_ban_data():
+    """Reparse stock ban reasons and durations and swap them in.
+
+    If any of the files fails to parse, previously loaded data is kept.
+
+    :return: Whether or not the new data was applied.
+    :rtype: bool
+    """
+    global stock_ban_reasons, stock_ban_durations
+
+    try:
+        ban_reasons = load_stock_ban_reasons()
+        ban_durations = load_stock_ban_durations()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        plugin_logger.log_warning(
+            "Unable to reload stock ban reasons/durations, keeping the old "
+            "ones: {}".format(e))
+
+        return False
+
+    stock_ban_reasons, stock_ban_durations = ban_reasons, ban_durations
+    ban_form_metadata_cache.clear()
+    return True
+
+
+@lru_cache(maxsize=CONVERTED_STEAMIDS_CACHE_SIZE)
+def convert_steamid_to_db_format(steamid):
+    return str(SteamID.parse(steamid).to_uint64())
+
+
+@lru_cache(maxsize=FORMATTED_DURATIONS_CACHE_SIZE)
 def format_ban_duration(seconds):
     if seconds < 0:
         return plugin_strings['duration permanent']
@@ -109,38 +188,187 @@ class _BannedPlayerInfo:
 stock_ban_durations = load_stock_ban_durations()
 
 
+class _BanFormMetadataCache(dict):
+    """Per-language cache of stock ban reasons and durations in the form
+    they're sent to the MoTD review pages.
+
+    Every value is a (etag, metadata) tuple. The ETag lets the client skip
+    re-downloading the metadata it already has."""
+    def __missing__(self, language):
+        ban_durations = []
+        for stock_ban_duration in stock_ban_durations:
+            ban_durations.append({
+                'value': stock_ban_duration,
+                'title': format_ban_duration(
+                    stock_ban_duration).get_string(language),
+            })
+
+        ban_reasons = []
+        for stock_ban_reason in stock_ban_reasons.values():
+            duration_value = stock_ban_reason.duration
+            duration_title = (
+                None if duration_value is None else
+                format_ban_duration(duration_value).get_string(language))
+
+            ban_reasons.append({
+                'hidden': stock_ban_reason.translation.get_string(
+                            language_manager.default),
+                'title': stock_ban_reason.translation.get_string(language),
+                'duration-value': duration_value,
+                'duration-title': duration_title,
+            })
+
+        metadata = {
+            'reasons': ban_reasons,
+            'durations': ban_durations,
+        }
+        etag = sha1(json.dumps(
+            [language, metadata], sort_keys=True).encode('utf-8')).hexdigest()
+
+        value = self[language] = (etag, metadata)
+        return value
+
+# The singleton object of the _BanFormMetadataCache class.
+ban_form_metadata_cache = _BanFormMetadataCache()
+
+# Warm up the cache for the default language
+ban_form_metadata_cache[language_manager.default]
+
+
+class _StockBanDataWatcher:
+    """Periodically stat stock ban data files and reload them if they
+    were changed."""
+    def __init__(self):
+        self._stamp = get_stock_ban_data_stamp()
+        self._repeat = Repeat(self.check)
+
+    def start(self, interval=STOCK_BAN_DATA_CHECK_INTERVAL):
+        if interval <= 0:
+            return
+
+        self._repeat.start(interval)
+
+    def stop(self):
+        self._repeat.stop()
+
+    def check(self):
+        stamp = get_stock_ban_data_stamp()
+        if stamp == self._stamp:
+            return
+
+        self._stamp = stamp
+
+        if reload_stock_ban_data():
+            plugin_logger.log_message(
+                "Stock ban reasons/durations have been reloaded")
+
+# The singleton object of the _StockBanDataWatcher class.
+stock_ban_data_watcher = _StockBanDataWatcher()
+
+
 class BannedUniqueIDManager(dict):
     model = None
 
+    # Type of the bans used in ban sync events
+    ban_type = None
+
+    def __init__(self):
+        super().__init__()
+
+        # Callbacks to call on the game thread whenever the set of active
+        # bans may change
+        self.change_listeners = []
+
+        if self.ban_type is not None:
+            ban_sync.register_manager(self.ban_type, self)
+
+    def _notify_change(self):
+        # Listeners own caches that only the game thread reads and fills
+        if get_ident() != _game_thread_ident:
+            Delay(0, self._notify_change)
+            return
+
+        for change_listener in self.change_listeners:
+            change_listener()
+
     def _convert_uniqueid_to_db_format(self, uniqueid):
         raise NotImplementedError
 
     def _convert_steamid_to_db_format(self, steamid):
-        return str(SteamID.parse(steamid).to_uint64())
+        if steamid == BANNED_BY_SERVER:
+            return steamid
 
-    def refresh(self):
-        self.clear()
+        return convert_steamid_to_db_format(steamid)
+
+    @staticmethod
+    def _is_ban_active(banned_user, current_time):
+        if banned_user.is_unbanned:
+            return False
+
+        if -1 < banned_user.expires_at < current_time:
+            return False
+
+        return True
+
+    @staticmethod
+    def _get_banned_player_info(banned_user):
+        return _BannedPlayerInfo(
+            banned_user.uniqueid, banned_user.id, banned_user.name,
+            banned_user.banned_by, banned_user.reviewed,
+            banned_user.expires_at, banned_user.reason, banned_user.notes
+        )
+
+    def refresh(self, banned_users=None):
+        """Reload the cached bans.
 
+        :param banned_users: Already loaded rows of the model. If None, the
+        rows are loaded from the database.
+        """
         session = Session()
 
-        banned_users = session.query(self.model).all()
+        if banned_users is None:
+            banned_users = session.query(self.model).all()
 
         current_time = time()
+        banned_player_infos = {}
         for banned_user in banned_users:
-            if banned_user.is_unbanned:
+            if not self._is_ban_active(banned_user, current_time):
                 continue
 
-            if -1 < banned_user.expires_at < current_time:
-                continue
-
-            self[banned_user.uniqueid] = _BannedPlayerInfo(
-                banned_user.uniqueid, banned_user.id, banned_user.name,
-                banned_user.banned_by, banned_user.reviewed,
-                banned_user.expires_at, banned_user.reason, banned_user.notes
-            )
+            banned_player_infos[banned_user.uniqueid] = (
+                self._get_banned_player_info(banned_user))
 
         session.close()
 
+        # Swap the contents only after everything is loaded
+        self.clear()
+        self.update(banned_player_infos)
+
+        self._notify_change()
+
+    def apply_change(self, ban_id, banned_user):
+        """Bring the cached state of the given ban in line with the
+        database after it was changed by this or another server.
+
+        :param int ban_id: ID of the changed ban.
+        :param banned_user: Already loaded row of the ban, None if the ban
+        has been removed.
+        """
+        if (
+                banned_user is not None and
+                self._is_ban_active(banned_user, time())):
+
+            self[banned_user.uniqueid] = self._get_banned_player_info(
+                banned_user)
+
+        else:
+            for uniqueid, banned_player_info in tuple(self.items()):
+                if banned_player_info.id == ban_id:
+                    del self[uniqueid]
+                    break
+
+        self._notify_change()
+
     def is_banned(self, uniqueid):
         uniqueid = self._convert_uniqueid_to_db_format(uniqueid)
 
@@ -152,36 +380,31 @@ class BannedUniqueIDManager(dict):
 
         if self[uniqueid].expires_at < time():
             del self[uniqueid]
+            self._notify_change()
             return False
 
         return True
 
     def save_ban_to_database(self, banned_by, uniqueid, name, duration):
-        uniqueid = self._convert_uniqueid_to_db_format(uniqueid)
-        banned_by = self._convert_steamid_to_db_format(banned_by)
-
-        session = Session()
-
-        banned_user = self.model(uniqueid, name, banned_by, duration)
-
-        session.add(banned_user)
-        session.commit()
-
-        self[uniqueid] = _BannedPlayerInfo(
-            uniqueid, banned_user.id, name, banned_by, False,
-            banned_user.expires_at, "", "")
-
-        session.close()
+        """Save a new ban on a worker thread and cache it once it's
+        committed.
+
+        :rtype: JobFuture
+        """
+        return self._submit_write(self._save_ban, (
+            self._convert_steamid_to_db_format(banned_by),
+            self._convert_uniqueid_to_db_format(uniqueid),
+            name,
+            duration,
+        ))
 
     def remove_ban_from_database(self, ban_id):
-        session = Session()
-
-        banned_user = session.query(self.model).filter_by(id=ban_id).first()
-        if banned_user is not None:
-            session.delete(banned_user)
-            session.commit()
+        """Delete the ban on a worker thread and drop it from the cache
+        once it's committed.
 
-        session.close()
+        :rtype: JobFuture
+        """
+        return self._submit_write(self._remove_ban, (ban_id, ))
 
     def get_all_bans(self, uniqueid=None, banned_by=None, reviewed=None,
                      expired=None, unbanned=None):
@@ -254,51 +477,102 @@ class BannedUniqueIDManager(dict):
         return result
 
     def review_ban(self, ban_id, reason, duration):
+        """Review the ban on a worker thread and update the cache once
+        it's committed.
+
+        :rtype: JobFuture
+        """
+        return self._submit_write(self._review_ban, (ban_id, reason, duration))
+
+    def lift_ban(self, ban_id, unbanned_by):
+        """Lift the ban on a worker thread and drop it from the cache once
+        it's committed.
+
+        :rtype: JobFuture
+        """
+        return self._submit_write(self._lift_ban, (
+            ban_id, self._convert_steamid_to_db_format(unbanned_by)))
+
+    def _submit_write(self, target, args):
+        # Workers only talk to the database, the cache and its listeners
+        # are only touched on the game thread
+        def callback(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+
+            change = future.result()
+            if change is not None:
+                self.apply_change(*change)
+
+        return job_scheduler.submit(
+            target=target, args=args, callback=callback,
+            serial_key=BAN_WRITES_SERIAL_KEY)
+
+    # The methods below run on worker threads. They return the
+    # (ban_id, banned_user) change to apply, or None if nothing changed.
+    def _save_ban(self, banned_by, uniqueid, name, duration):
         session = Session()
 
-        banned_user = session.query(self.model).filter_by(id=ban_id).first()
+        banned_user = self.model(uniqueid, name, banned_by, duration)
 
-        if banned_user is None:
-            session.close()
-            return
+        session.add(banned_user)
+        session.flush()
 
-        banned_user.review(reason, duration)
-        expires_at = banned_user.expires_at
+        ban_sync.publish(session, self.ban_type, 'ban', banned_user.id)
+        return self._commit(session, banned_user)
+
+    def _remove_ban(self, ban_id):
+        session = Session()
+
+        banned_user = session.query(self.model).filter_by(id=ban_id).first()
+        if banned_user is not None:
+            session.delete(banned_user)
+            ban_sync.publish(session, self.ban_type, 'remove', ban_id)
+            session.commit()
 
-        session.commit()
         session.close()
 
-        for banned_player_info in self.values():
-            if banned_player_info.id != ban_id:
-                continue
+        return ban_id, None
 
-            banned_player_info.reviewed = True
-            banned_player_info.expires_at = expires_at
-            banned_player_info.reason = reason
-            break
+    def _review_ban(self, ban_id, reason, duration):
+        session = Session()
 
-    def lift_ban(self, ban_id, unbanned_by):
-        unbanned_by = self._convert_steamid_to_db_format(unbanned_by)
+        banned_user = session.query(self.model).filter_by(id=ban_id).first()
+
+        if banned_user is None:
+            session.close()
+            return None
+
+        banned_user.review(reason, duration)
+
+        ban_sync.publish(session, self.ban_type, 'review', ban_id)
+        return self._commit(session, banned_user)
 
+    def _lift_ban(self, ban_id, unbanned_by):
         session = Session()
 
         banned_user = session.query(self.model).filter_by(id=ban_id).first()
 
         if banned_user is None:
             session.close()
-            return
+            return None
 
         banned_user.lift_ban(unbanned_by)
 
+        ban_sync.publish(session, self.ban_type, 'lift', ban_id)
+        return self._commit(session, banned_user)
+
+    @staticmethod
+    def _commit(session, banned_user):
         session.commit()
-        session.close()
 
-        for uniqueid, banned_player_info in self.items():
-            if banned_player_info.id != ban_id:
-                continue
+        # Load the committed row before the session goes away, so that the
+        # game thread can read it
+        session.refresh(banned_user)
+        session.expunge(banned_user)
+        session.close()
 
-            del self[uniqueid]
-            break
+        return banned_user.id, banned_user
 
 
 class LiftBanMOTDFeature(BaseFeature):
@@ -317,10 +591,7 @@ class LiftBanMOTDFeature(BaseFeature):
         return None
 
     def execute(self, client, ban_id, player_name):
-        GameThread(
-            target=self.banned_uniqueid_manager.lift_ban,
-            args=(ban_id, client.steamid)
-        ).start()
+        self.banned_uniqueid_manager.lift_ban(ban_id, client.steamid)
 
         for ws_lift_ban_page in self.ws_lift_ban_pages:
             ws_lift_ban_page.send_remove_ban_id(ban_id)
@@ -340,6 +611,7 @@ class LiftBanPopupFeature(Feature):
         self.ban_popup = PagedMenu(title=self.popup_title)
 
         @self.ban_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".ban_popup.build")
         def build_callback(popup, index):
             client = clients[index]
             popup.clear()
@@ -359,10 +631,8 @@ class LiftBanPopupFeature(Feature):
         def select_callback(popup, index, option):
             client = clients[index]
 
-            GameThread(
-                target=self.banned_uniqueid_manager.lift_ban,
-                args=(option.value.id, client.steamid)
-            ).start()
+            self.banned_uniqueid_manager.lift_ban(
+                option.value.id, client.steamid)
 
             log_admin_action(plugin_strings['message ban_lifted'].tokenized(
                 admin_name=client.name,
@@ -386,6 +656,7 @@ class LiftAnyBanPopupFeature(Feature):
         self.confirm_popup = SimpleMenu()
 
         @self.ban_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".ban_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
@@ -406,6 +677,7 @@ class LiftAnyBanPopupFeature(Feature):
             clients[index].send_popup(self.confirm_popup)
 
         @self.confirm_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".confirm_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
@@ -446,10 +718,8 @@ class LiftAnyBanPopupFeature(Feature):
 
             client = clients[index]
 
-            GameThread(
-                target=self.banned_uniqueid_manager.lift_ban,
-                args=(option.value[0].id, client.steamid)
-            ).start()
+            self.banned_uniqueid_manager.lift_ban(
+                option.value[0].id, client.steamid)
 
             log_admin_action(plugin_strings['message ban_lifted'].tokenized(
                 admin_name=client.name,
@@ -476,10 +746,7 @@ class ReviewBanMOTDFeature(BaseFeature):
         return None
 
     def execute(self, client, ban_id, reason, duration, player_name):
-        GameThread(
-            target=self.banned_uniqueid_manager.review_ban,
-            args=(ban_id, reason, duration)
-        ).start()
+        self.banned_uniqueid_manager.review_ban(ban_id, reason, duration)
 
         for ws_review_ban_page in self.ws_review_ban_pages:
             ws_review_ban_page.send_remove_ban_id(ban_id)
@@ -510,6 +777,7 @@ class ReviewBanPopupFeature(Feature):
         self.duration_popup = PagedMenu(title=self.popup_title)
 
         @self.ban_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".ban_popup.build")
         def build_callback(popup, index):
             client = clients[index]
             popup.clear()
@@ -531,6 +799,7 @@ class ReviewBanPopupFeature(Feature):
             clients[index].send_popup(self.reason_popup)
 
         @self.reason_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".reason_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
@@ -551,6 +820,7 @@ class ReviewBanPopupFeature(Feature):
             clients[index].send_popup(self.duration_popup)
 
         @self.duration_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".duration_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
@@ -575,10 +845,8 @@ class ReviewBanPopupFeature(Feature):
         def select_callback(popup, index, option):
             client = clients[index]
 
-            GameThread(
-                target=self.banned_uniqueid_manager.review_ban,
-                args=(option.value[0].id, option.value[1], option.value[2])
-            ).start()
+            self.banned_uniqueid_manager.review_ban(
+                option.value[0].id, option.value[1], option.value[2])
 
             log_admin_action(plugin_strings['message ban_reviewed'].tokenized(
                 admin_name=client.name,
@@ -603,6 +871,7 @@ class SearchBadBansPopupFeature(Feature):
         self.remove_popup = SimpleMenu()
 
         @self.ban_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".ban_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
@@ -624,6 +893,7 @@ class SearchBadBansPopupFeature(Feature):
             clients[index].send_popup(self.remove_popup)
 
         @self.remove_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".remove_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
@@ -661,10 +931,8 @@ class SearchBadBansPopupFeature(Feature):
 
             client = clients[index]
 
-            GameThread(
-                target=self.banned_uniqueid_manager.remove_ban_from_database,
-                args=(option.value[0].id, )
-            ).start()
+            self.banned_uniqueid_manager.remove_ban_from_database(
+                option.value[0].id)
 
             log_admin_action(plugin_strings['message ban_removed'].tokenized(
                 admin_name=client.name,
@@ -759,29 +1027,7 @@ class ReviewBanPage(_BaseBanPage):
 
         if data['action'] == "get-ban-data":
             language = get_client_language(self.index)
-
-            ban_durations = []
-            for stock_ban_duration in stock_ban_durations:
-                ban_durations.append({
-                    'value': stock_ban_duration,
-                    'title': format_ban_duration(
-                        stock_ban_duration).get_string(language),
-                })
-
-            ban_reasons = []
-            for stock_ban_reason in stock_ban_reasons.values():
-                duration_value = stock_ban_reason.duration
-                duration_title = (
-                    None if duration_value is None else
-                    format_ban_duration(duration_value).get_string(language))
-
-                ban_reasons.append({
-                    'hidden': stock_ban_reason.translation.get_string(
-                                language_manager.default),
-                    'title': stock_ban_reason.translation.get_string(language),
-                    'duration-value': duration_value,
-                    'duration-title': duration_title,
-                })
+            metadata_etag, metadata = ban_form_metadata_cache[language]
 
             ban_data = []
             for banned_player_info in self.feature.get_bans(client):
@@ -791,9 +1037,14 @@ class ReviewBanPage(_BaseBanPage):
                     'name': banned_player_info.name,
                 })
 
-            self.send_data({
+            response = {
                 'action': "ban-data",
                 'bans': ban_data,
-                'reasons': ban_reasons,
-                'durations': ban_durations,
-            })
+                'metadataEtag': metadata_etag,
+            }
+
+            # Only send reasons and durations if the client doesn't have them
+            if data.get('metadataEtag') != metadata_etag:
+                response.update(metadata)
+
+            self.send_data(response)
@@ -3,7 +3,6 @@
 # =============================================================================
 # Source.Python
 from listeners import OnClientConnect
-from listeners.tick import GameThread
 from players.entity import Player
 from players.helpers import get_client_language
 from translations.manager import language_manager
@@ -13,21 +12,41 @@ from admin.core.helpers import (
     extract_ip_address, format_player_name, log_admin_action)
 
 # Included Plugin
+from ..admission import (
+    client_connect_check_counter, ConnectionFloodGuard, DecisionCache,
+    get_ban_reason, get_flood_reason)
+from ..ban_status import BanStatusCache
 from ..config import plugin_config
 from ..left_player import (
     LeftPlayerBasedAdminCommand, LeftPlayerBasedFeature,
     LeftPlayerBasedFeaturePage, LeftPlayerIter)
+from ..logger import plugin_logger
 from ..models import BannedIPAddress
 from ..strings import plugin_strings
 from .base import (
-    BannedUniqueIDManager, LiftBanMOTDFeature, LiftBanPopupFeature,
-    LiftAnyBanPopupFeature, ReviewBanMOTDFeature, ReviewBanPopupFeature,
-    LiftBanPage, ReviewBanPage, SearchBadBansPopupFeature)
+    BANNED_BY_SERVER, BannedUniqueIDManager, LiftBanMOTDFeature,
+    LiftBanPopupFeature, LiftAnyBanPopupFeature, ReviewBanMOTDFeature,
+    ReviewBanPopupFeature, LiftBanPage, ReviewBanPage,
+    SearchBadBansPopupFeature)
 
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
+FLOOD_GUARD_ENABLED = plugin_config.getboolean(
+    'flood_guard', 'enabled', fallback=False)
+FLOOD_GUARD_ATTEMPTS_PER_SECOND = plugin_config.getfloat(
+    'flood_guard', 'attempts_per_second', fallback=0.5)
+FLOOD_GUARD_BURST = plugin_config.getint('flood_guard', 'burst', fallback=5)
+FLOOD_GUARD_MAX_TRACKED_ADDRESSES = plugin_config.getint(
+    'flood_guard', 'max_tracked_addresses', fallback=4096)
+FLOOD_GUARD_DECISION_CACHE_SECONDS = plugin_config.getfloat(
+    'flood_guard', 'decision_cache_seconds', fallback=5.0)
+FLOOD_GUARD_AUTO_BAN_THRESHOLD = plugin_config.getint(
+    'flood_guard', 'auto_ban_threshold', fallback=0)
+FLOOD_GUARD_AUTO_BAN_DURATION = plugin_config.getint(
+    'flood_guard', 'auto_ban_duration_seconds', fallback=600)
+
 _ws_ban_ip_address_pages = []
 _ws_lift_ip_address_pages = []
 _ws_review_ip_address_ban_pages = []
@@ -38,6 +57,7 @@ _ws_review_ip_address_ban_pages = []
 # =============================================================================
 class _BannedIPAddressManager(BannedUniqueIDManager):
     model = BannedIPAddress
+    ban_type = 'ip_address'
 
     def _convert_uniqueid_to_db_format(self, uniqueid):
         return uniqueid
@@ -45,6 +65,40 @@ class _BannedIPAddressManager(BannedUniqueIDManager):
 # The singleton object for the _BannedIPAddressManager class.
 banned_ip_address_manager = _BannedIPAddressManager()
 
+# The singleton object of the BanStatusCache class for IP address bans.
+ip_address_ban_status_cache = BanStatusCache(
+    banned_ip_address_manager,
+    lambda left_player: extract_ip_address(left_player.address))
+
+
+def _auto_ban_ip_address(ip_address):
+    plugin_logger.log_message(
+        "Temporarily banning {} for connection flooding".format(ip_address))
+
+    # Reject right away, without waiting for the database
+    ip_address_ban_decision_cache.set(ip_address, True)
+
+    banned_ip_address_manager.save_ban_to_database(
+        BANNED_BY_SERVER,
+        ip_address,
+        ip_address,
+        FLOOD_GUARD_AUTO_BAN_DURATION
+    )
+
+ip_address_flood_guard = ConnectionFloodGuard(
+    rate=FLOOD_GUARD_ATTEMPTS_PER_SECOND,
+    burst=FLOOD_GUARD_BURST,
+    max_tracked=FLOOD_GUARD_MAX_TRACKED_ADDRESSES,
+    ban_threshold=FLOOD_GUARD_AUTO_BAN_THRESHOLD,
+    ban_callback=_auto_ban_ip_address,
+)
+ip_address_ban_decision_cache = DecisionCache(
+    ttl=FLOOD_GUARD_DECISION_CACHE_SECONDS,
+    max_size=FLOOD_GUARD_MAX_TRACKED_ADDRESSES,
+)
+banned_ip_address_manager.change_listeners.append(
+    ip_address_ban_decision_cache.clear)
+
 
 class _BanIPAddressFeature(LeftPlayerBasedFeature):
     flag = "admin.admin_kick_ban.ban_ip_address"
@@ -55,11 +109,12 @@ class _BanIPAddressFeature(LeftPlayerBasedFeature):
             client.tell(plugin_strings['error bot_cannot_ban'])
             return
 
-        ip_address = extract_ip_address(left_player.address)
-        if banned_ip_address_manager.is_banned(ip_address):
+        if ip_address_ban_status_cache.is_banned(left_player):
             client.tell(plugin_strings['error already_ban_in_effect'])
             return
 
+        ip_address = extract_ip_address(left_player.address)
+
         try:
             player = Player.from_userid(left_player.userid)
         except (OverflowError, ValueError):
@@ -73,10 +128,8 @@ class _BanIPAddressFeature(LeftPlayerBasedFeature):
 
         duration = int(plugin_config['settings']['default_ban_time_seconds'])
 
-        GameThread(
-            target=banned_ip_address_manager.save_ban_to_database,
-            args=(client.steamid, ip_address, left_player.name, duration)
-        ).start()
+        banned_ip_address_manager.save_ban_to_database(
+            client.steamid, ip_address, left_player.name, duration)
 
         for ws_ban_ip_address_page in _ws_ban_ip_address_pages:
             ws_ban_ip_address_page.send_remove_id(left_player)
@@ -158,12 +211,21 @@ class BanIPAddressMenuCommand(LeftPlayerBasedAdminCommand):
 
     def _iter(self):
         for left_player in LeftPlayerIter(self.base_filter):
-            ip_address = extract_ip_address(left_player.address)
-            if banned_ip_address_manager.is_banned(ip_address):
+            if ip_address_ban_status_cache.is_banned(left_player):
                 continue
 
             yield left_player
 
+    def _get_player(self, steamid):
+        left_player = super()._get_player(steamid)
+        if (
+                left_player is None or
+                ip_address_ban_status_cache.is_banned(left_player)):
+
+            return None
+
+        return left_player
+
 
 class BanIPAddressPage(LeftPlayerBasedFeaturePage):
     admin_plugin_id = "admin_kick_ban"
@@ -184,8 +246,7 @@ class BanIPAddressPage(LeftPlayerBasedFeaturePage):
         if not super().filter(left_player):
             return False
 
-        ip_address = extract_ip_address(left_player.address)
-        if banned_ip_address_manager.is_banned(ip_address):
+        if ip_address_ban_status_cache.is_banned(left_player):
             return False
 
         return True
@@ -242,14 +303,30 @@ class ReviewIPAddressBanPage(ReviewBanPage):
 def listener_on_client_connect(
         allow_connect, index, name, address, reject_message, max_reject_len):
 
-    ip_address = extract_ip_address(address)
-    if not banned_ip_address_manager.is_banned(ip_address):
+    client_connect_check_counter.hit()
+
+    # Bots and local clients don't have a port in their address
+    if ':' not in address:
         return
 
+    ip_address = extract_ip_address(address)
+
+    if FLOOD_GUARD_ENABLED and not ip_address_flood_guard.check(ip_address):
+        reason = get_flood_reason(language_manager.default)
+
+    else:
+        is_banned = ip_address_ban_decision_cache.get(ip_address)
+        if is_banned is None:
+            is_banned = banned_ip_address_manager.is_banned(ip_address)
+            ip_address_ban_decision_cache.set(ip_address, is_banned)
+
+        if not is_banned:
+            return
+
+        reason = get_ban_reason(language_manager.default)
+
     allow_connect.set_bool(False)
 
-    reason = plugin_strings['default_ban_reason'].get_string(
-        language_manager.default)
     reason = reason.encode('utf-8')[:max_reject_len].decode('utf-8', 'ignore')
 
     reject_message.set_string_array(reason)
@@ -3,9 +3,7 @@
 # =============================================================================
 # Source.Python
 from core import GAME_NAME
-from engines.server import server
 from listeners import OnNetworkidValidated
-from listeners.tick import GameThread
 from memory import make_object
 from memory.hooks import PostHook
 from players import Client
@@ -14,10 +12,13 @@ from players.helpers import get_client_language
 from translations.manager import language_manager
 
 # Source.Python Admin
+from admin.core.clients import server_client_index
 from admin.core.helpers import format_player_name, log_admin_action
 from admin.core.memory import custom_server
 
 # Included Plugin
+from ..admission import challenge_check_counter, get_ban_reason
+from ..ban_status import BanStatusCache
 from ..config import plugin_config
 from ..left_player import (
     LeftPlayerBasedAdminCommand, LeftPlayerBasedFeature,
@@ -34,12 +35,7 @@ from .base import (
 # >> FUNCTIONS
 # =============================================================================
 def find_client(steamid):
-    for x in range(server.num_clients):
-        client = server.get_client(x)
-        if client.steamid == steamid:
-            return client
-
-    return None
+    return server_client_index.find(steamid)
 
 
 # =============================================================================
@@ -55,6 +51,7 @@ _ws_review_steamid_ban_pages = []
 # =============================================================================
 class _BannedSteamIDManager(BannedUniqueIDManager):
     model = BannedSteamID
+    ban_type = 'steamid'
 
     def _convert_uniqueid_to_db_format(self, uniqueid):
         return self._convert_steamid_to_db_format(uniqueid)
@@ -62,6 +59,10 @@ class _BannedSteamIDManager(BannedUniqueIDManager):
 # The singleton object for the _BannedSteamIDManager class.
 banned_steamid_manager = _BannedSteamIDManager()
 
+# The singleton object of the BanStatusCache class for SteamID bans.
+steamid_ban_status_cache = BanStatusCache(
+    banned_steamid_manager, lambda left_player: left_player.steamid)
+
 
 class _BanSteamIDFeature(LeftPlayerBasedFeature):
     flag = "admin.admin_kick_ban.ban_steamid"
@@ -72,32 +73,26 @@ class _BanSteamIDFeature(LeftPlayerBasedFeature):
             client.tell(plugin_strings['error bot_cannot_ban'])
             return
 
-        if banned_steamid_manager.is_banned(left_player.steamid):
+        if steamid_ban_status_cache.is_banned(left_player):
             client.tell(plugin_strings['error already_ban_in_effect'])
             return
 
-        try:
-            player = Player.from_userid(left_player.userid)
-        except (OverflowError, ValueError):
-            pass
-        else:
-            language = get_client_language(player.index)
+        index = server_client_index.find_index(left_player.steamid)
+        if index is not None:
+            language = get_client_language(index)
 
             # Disconnect the player
-            player.kick(
+            Player(index).kick(
                 plugin_strings['default_ban_reason'].get_string(language))
 
         duration = int(plugin_config['settings']['default_ban_time_seconds'])
 
-        GameThread(
-            target=banned_steamid_manager.save_ban_to_database,
-            args=(
-                client.steamid,
-                left_player.steamid,
-                left_player.name,
-                duration
-            )
-        ).start()
+        banned_steamid_manager.save_ban_to_database(
+            client.steamid,
+            left_player.steamid,
+            left_player.name,
+            duration
+        )
 
         for ws_ban_steamid_page in _ws_ban_steamid_pages:
             ws_ban_steamid_page.send_remove_id(left_player)
@@ -178,11 +173,21 @@ class BanSteamIDMenuCommand(LeftPlayerBasedAdminCommand):
 
     def _iter(self):
         for left_player in LeftPlayerIter(self.base_filter):
-            if banned_steamid_manager.is_banned(left_player.steamid):
+            if steamid_ban_status_cache.is_banned(left_player):
                 continue
 
             yield left_player
 
+    def _get_player(self, steamid):
+        left_player = super()._get_player(steamid)
+        if (
+                left_player is None or
+                steamid_ban_status_cache.is_banned(left_player)):
+
+            return None
+
+        return left_player
+
 
 class BanSteamIDPage(LeftPlayerBasedFeaturePage):
     admin_plugin_id = "admin_kick_ban"
@@ -203,7 +208,7 @@ class BanSteamIDPage(LeftPlayerBasedFeaturePage):
         if not super().filter(left_player):
             return False
 
-        if banned_steamid_manager.is_banned(left_player.steamid):
+        if steamid_ban_status_cache.is_banned(left_player):
             return False
 
         return True
@@ -265,8 +270,7 @@ def listener_on_networkid_validated(name, steamid):
     if client is None:
         return
 
-    client.disconnect(plugin_strings['default_ban_reason'].get_string(
-        language_manager.default))
+    client.disconnect(get_ban_reason(language_manager.default))
 
 
 # =============================================================================
@@ -274,21 +278,22 @@ def listener_on_networkid_validated(name, steamid):
 # =============================================================================
 @PostHook(custom_server.check_challenge_type)
 def post_check_challenge_type(args, return_value=0):
+    challenge_check_counter.hit()
+
     client = make_object(Client, args[1] + 4)
-    if not banned_steamid_manager.is_banned(client.steamid):
+
+    # Fast path: SteamID conversion is cached and the lookup is a single
+    # dict access. Unparsable SteamIDs (bots, pending) are admitted.
+    try:
+        if not banned_steamid_manager.is_banned(client.steamid):
+            return
+    except ValueError:
         return
 
+    reason = get_ban_reason(language_manager.default)
     if GAME_NAME == 'csgo':
-        custom_server.reject_connection(
-            args[3],
-            plugin_strings['default_ban_reason'].get_string(
-                language_manager.default)
-        )
+        custom_server.reject_connection(args[3], reason)
     else:
-        custom_server.reject_connection(
-            args[3], args[7],
-            plugin_strings['default_ban_reason'].get_string(
-                language_manager.default)
-        )
+        custom_server.reject_connection(args[3], args[7], reason)
 
     return False
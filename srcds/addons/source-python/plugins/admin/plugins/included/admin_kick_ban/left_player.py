@@ -1,13 +1,19 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from collections import OrderedDict
+
 # Source.Python
+from events import Event
 from filters.players import PlayerIter
-from listeners import OnClientActive, OnClientDisconnect
+from listeners import (
+    OnClientActive, OnClientDisconnect, OnNetworkidValidated)
 from players.entity import Player
+from players.helpers import index_from_userid
 
 # Source.Python Admin
-from admin.core.clients import RemoteClient
+from admin.core.clients import RemoteClient, server_client_index
 from admin.core.features import BaseFeature
 from admin.core.frontends.menus import BasePlayerBasedAdminCommand
 from admin.core.frontends.motd import BasePlayerBasedFeaturePage
@@ -20,10 +26,47 @@ from .config import plugin_config
 # >> GLOBAL VARIABLES
 # =============================================================================
 LEFT_PLAYERS_LIMIT = int(plugin_config['settings']['left_players_limit'])
-_left_players = []
+
+# Disconnected players by their SteamIDs, from the oldest to the most recent
+_left_players = OrderedDict()
 _ws_left_player_based_pages = []
 
 
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def find_left_player(steamid, base_filter='all'):
+    """Find the online or left player with the given SteamID.
+
+    :param str steamid: SteamID of the player.
+    :param str base_filter: Filter of LeftPlayerIter the player must pass.
+    :return: LeftPlayer instance or None if no such player passes the
+    filter.
+    """
+    # Bots and players with pending SteamIDs aren't indexed
+    if not server_client_index.is_valid_steamid(steamid):
+        for left_player in LeftPlayerIter(base_filter):
+            if left_player.steamid == steamid:
+                return left_player
+
+        return None
+
+    # Online players take precedence over their left records
+    index = server_client_index.find_index(steamid)
+    if index is None:
+        left_player = _left_players.get(steamid)
+    else:
+        left_player = online_player_table.get(index)
+
+    if left_player is None:
+        return None
+
+    if not LeftPlayerIter.filters[base_filter](left_player):
+        return None
+
+    return left_player
+
+
 # =============================================================================
 # >> CLASSES
 # =============================================================================
@@ -56,20 +99,70 @@ class LeftPlayer:
         return self._disconnected
 
 
+class _OnlinePlayerTable(dict):
+    """Live LeftPlayer records of the players that are on the server,
+    by their indexes.
+
+    Records are created once per connection and then updated from game
+    events, so that iterating over them doesn't touch the engine."""
+    def __init__(self):
+        super().__init__()
+
+        self._snapshot = None
+
+    @property
+    def snapshot(self):
+        """Return a tuple of online records ordered by player index."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self[index] for index in sorted(self))
+
+        return self._snapshot
+
+    def add(self, index):
+        left_player = self[index] = LeftPlayer(index, disconnected=False)
+        self._snapshot = None
+        return left_player
+
+    def discard(self, index):
+        if self.pop(index, None) is not None:
+            self._snapshot = None
+
+    def from_userid(self, userid):
+        try:
+            return self.get(index_from_userid(userid))
+        except ValueError:
+            return None
+
+    def refresh(self):
+        """Rebuild the table from the players that are on the server."""
+        self.clear()
+        self._snapshot = None
+
+        for player in PlayerIter():
+            self.add(player.index)
+
+# The singleton object of the _OnlinePlayerTable class.
+online_player_table = _OnlinePlayerTable()
+
+
 class LeftPlayerIter(PlayerIter):
     @staticmethod
     def iterator():
-        seen_steamids = []
-        result = []
-        for player in PlayerIter.iterator():
-            seen_steamids.append(player.steamid)
-            result.append(LeftPlayer(player.index, disconnected=False))
+        online_players = online_player_table.snapshot
+        seen_steamids = set(
+            left_player.steamid for left_player in online_players)
 
-        for left_player in _left_players:
+        # Most recently disconnected players go first. Build the whole list
+        # before yielding anything, because the consumer may kick players
+        # (and thus modify _left_players) while iterating.
+        result = []
+        for left_player in reversed(_left_players.values()):
             if left_player.steamid in seen_steamids:
                 continue
 
-            result.insert(0, left_player)
+            result.append(left_player)
+
+        result.extend(online_players)
 
         yield from result
 
@@ -137,6 +230,9 @@ class LeftPlayerBasedAdminCommand(BasePlayerBasedAdminCommand):
     def _iter(self):
         yield from LeftPlayerIter(self.base_filter)
 
+    def _get_player(self, steamid):
+        return find_left_player(steamid, self.base_filter)
+
 
 class LeftPlayerBasedFeaturePage(BasePlayerBasedFeaturePage):
     abstract = True
@@ -164,10 +260,9 @@ class LeftPlayerBasedFeaturePage(BasePlayerBasedFeaturePage):
         yield from LeftPlayerIter(self.base_filter)
 
     def _execute(self, client, steamid):
-        for left_player in self._iter():
-            if left_player.steamid == steamid:
-                self.feature.execute(client, left_player)
-                break
+        left_player = find_left_player(steamid, self.base_filter)
+        if left_player is not None:
+            self.feature.execute(client, left_player)
 
     def _render_player_name(self, left_player):
         if left_player.disconnected:
@@ -193,7 +288,7 @@ class LeftPlayerBasedFeaturePage(BasePlayerBasedFeaturePage):
 # =============================================================================
 @OnClientActive
 def listener_on_client_active(index):
-    left_player = LeftPlayer(index, disconnected=False)
+    left_player = online_player_table.add(index)
     for ws_left_player_based_page in _ws_left_player_based_pages:
         if not ws_left_player_based_page.filter(left_player):
             continue
@@ -203,18 +298,15 @@ def listener_on_client_active(index):
 
 @OnClientDisconnect
 def listener_on_client_disconnect(index):
+    online_player_table.discard(index)
     left_player = LeftPlayer(index, disconnected=True)
 
-    for left_player_ in _left_players:
-        if left_player_.steamid == left_player.steamid:
-            _left_players.remove(left_player_)
-
-            for ws_left_player_based_page in _ws_left_player_based_pages:
-                ws_left_player_based_page.send_remove_id(left_player_)
-
-            break
+    left_player_ = _left_players.pop(left_player.steamid, None)
+    if left_player_ is not None:
+        for ws_left_player_based_page in _ws_left_player_based_pages:
+            ws_left_player_based_page.send_remove_id(left_player_)
 
-    _left_players.append(left_player)
+    _left_players[left_player.steamid] = left_player
 
     for ws_left_player_based_page in _ws_left_player_based_pages:
         if not ws_left_player_based_page.filter(left_player):
@@ -223,7 +315,54 @@ def listener_on_client_disconnect(index):
         ws_left_player_based_page.send_add_player(left_player)
 
     if len(_left_players) > LEFT_PLAYERS_LIMIT:
-        left_player_ = _left_players.pop(0)
+        _, left_player_ = _left_players.popitem(last=False)
 
         for ws_left_player_based_page in _ws_left_player_based_pages:
             ws_left_player_based_page.send_remove_id(left_player_)
+
+
+@OnNetworkidValidated
+def listener_on_networkid_validated(name, steamid):
+    # SteamIDs that were pending at the moment of activation should be
+    # re-read now
+    for index, left_player in online_player_table.items():
+        if left_player.steamid == 'STEAM_ID_PENDING':
+            left_player.steamid = Player(index).steamid
+
+
+# =============================================================================
+# >> EVENTS
+# =============================================================================
+@Event('player_changename')
+def on_player_changename(ev):
+    left_player = online_player_table.from_userid(ev['userid'])
+    if left_player is not None:
+        left_player.name = ev['newname']
+
+
+@Event('player_team')
+def on_player_team(ev):
+    left_player = online_player_table.from_userid(ev['userid'])
+    if left_player is not None:
+        left_player.team = ev['team']
+
+
+@Event('player_death')
+def on_player_death(ev):
+    left_player = online_player_table.from_userid(ev['userid'])
+    if left_player is not None:
+        left_player.dead = True
+
+
+@Event('player_spawn')
+def on_player_spawn(ev):
+    left_player = online_player_table.from_userid(ev['userid'])
+    if left_player is not None:
+        left_player.dead = Player.from_userid(ev['userid']).dead
+
+
+# =============================================================================
+# >> ONLINE PLAYER TABLE
+# =============================================================================
+# Pick up the players that were already on the server when we got loaded
+online_player_table.refresh()
@@ -0,0 +1,11 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Admin
+from admin.core.plugins import admin_plugins_logger
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+plugin_logger = admin_plugins_logger.admin_kick_ban
@@ -84,3 +84,29 @@ class BannedIPAddress(BannedUser):
         self.ip_address = uniqueid
 
     uniqueid = property(get_uniqueid, set_uniqueid)
+
+
+class BanEvent(Base):
+    """Append-only record of a change made to a ban, used to keep bans in
+    sync between several servers that share the same database."""
+    __tablename__ = config['database']['prefix'] + "ban_event"
+
+    # Servers remember the last event ID they've seen, so IDs must never be
+    # reused, not even after the newest events are gone
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = Column(Integer, primary_key=True)
+    server_id = Column(String(32))
+    ban_type = Column(String(16))
+    action = Column(String(16))
+    ban_id = Column(Integer)
+    created_at = Column(Integer, index=True)
+
+    def __init__(self, server_id, ban_type, action, ban_id):
+        super().__init__()
+
+        self.server_id = server_id
+        self.ban_type = ban_type
+        self.action = action
+        self.ban_id = ban_id
+        self.created_at = int(time())
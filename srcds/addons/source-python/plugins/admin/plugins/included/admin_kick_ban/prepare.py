@@ -0,0 +1,33 @@
+"""Load the bans on a worker thread before the plugin itself is loaded."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+from sqlalchemy import func
+
+# Source.Python Admin
+from admin.core.orm import Session
+
+# Included Plugin
+from .models import BanEvent, BannedIPAddress, BannedSteamID
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def prepare():
+    session = Session()
+
+    # Get the last event first so that no ban changes are missed
+    last_sequence = session.query(func.max(BanEvent.id)).scalar() or 0
+
+    prepared_data = {
+        'last_sequence': last_sequence,
+        'steamid': session.query(BannedSteamID).all(),
+        'ip_address': session.query(BannedIPAddress).all(),
+    }
+
+    session.close()
+
+    return prepared_data
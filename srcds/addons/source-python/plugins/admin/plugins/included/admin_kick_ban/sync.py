@@ -0,0 +1,367 @@
+"""Keep bans in sync between several servers sharing the same database.
+
+Every change made to a ban (ban, review, lift, removal) is published as a
+row of the append-only ban event table. Each server polls the table for the
+events that appeared after the last one it has seen and re-reads only the
+affected bans. Rows are read on a worker thread and the ban caches are
+updated on the game thread. If a gap in the event sequence doesn't fill up
+in time, the missing events are skipped - they belong to transactions that
+were rolled back. A full reload of the ban caches is only performed if the
+events this server hasn't seen yet have been pruned.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from time import time
+from uuid import uuid4
+
+# Source.Python
+from listeners.tick import Repeat
+
+# Site-Package
+from sqlalchemy import func
+
+# Source.Python Admin
+from admin.core.orm import Session
+from admin.core.scheduler import job_scheduler, JobPriority
+
+# Included Plugin
+from .config import plugin_config
+from .logger import plugin_logger
+from .models import BanEvent
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+SYNC_ENABLED = plugin_config.getboolean('sync', 'enabled', fallback=False)
+SYNC_POLL_INTERVAL = plugin_config.getfloat(
+    'sync', 'poll_interval_seconds', fallback=0.5)
+SYNC_EVENT_RETENTION_SECONDS = plugin_config.getint(
+    'sync', 'event_retention_hours', fallback=24) * 3600
+
+# How long to wait for the missing events of a gap in the sequence before
+# skipping them
+SYNC_GAP_TIMEOUT = plugin_config.getfloat(
+    'sync', 'gap_timeout_seconds', fallback=2.0)
+
+# How many events to fetch in a single poll
+SYNC_BATCH_SIZE = 500
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class BanEventFeed:
+    """Transport of ban events between servers."""
+    def publish(self, session, event):
+        """Publish the given event as a part of the given session.
+
+        :param session: Session the ban itself is being changed in.
+        :param BanEvent event: Event to publish.
+        """
+        raise NotImplementedError
+
+    def get_first_sequence(self):
+        """Return the sequence number of the oldest event still stored."""
+        raise NotImplementedError
+
+    def get_last_sequence(self):
+        """Return the sequence number of the last published event."""
+        raise NotImplementedError
+
+    def fetch(self, session, after_sequence, limit):
+        """Return the events that follow the given sequence number.
+
+        :param session: Session to use.
+        :param int after_sequence: Last sequence number seen by the caller.
+        :param int limit: Maximum number of events to return.
+        :rtype: list
+        """
+        raise NotImplementedError
+
+    def prune(self, max_age):
+        """Remove events older than the given number of seconds."""
+        raise NotImplementedError
+
+
+class DatabaseBanEventFeed(BanEventFeed):
+    """Ban event feed that stores events in the shared database."""
+    def publish(self, session, event):
+        session.add(event)
+
+    def get_first_sequence(self):
+        session = Session()
+        first_sequence = session.query(func.min(BanEvent.id)).scalar()
+        session.close()
+
+        return first_sequence or 0
+
+    def get_last_sequence(self):
+        session = Session()
+        last_sequence = session.query(func.max(BanEvent.id)).scalar()
+        session.close()
+
+        return last_sequence or 0
+
+    def fetch(self, session, after_sequence, limit):
+        return (
+            session
+            .query(BanEvent)
+            .filter(BanEvent.id > after_sequence)
+            .order_by(BanEvent.id)
+            .limit(limit)
+            .all()
+        )
+
+    def prune(self, max_age):
+        session = Session()
+
+        # Always keep the last event, so that its ID is never handed out again
+        last_sequence = session.query(func.max(BanEvent.id)).scalar() or 0
+
+        (
+            session
+            .query(BanEvent)
+            .filter(BanEvent.created_at < time() - max_age)
+            .filter(BanEvent.id < last_sequence)
+            .delete(synchronize_session=False)
+        )
+
+        session.commit()
+        session.close()
+
+
+class _SyncResult:
+    """What a poll has found in the database, applied on the game thread.
+
+    :param int after_sequence: Sequence number the poll started from.
+    :param int last_sequence: Sequence number to continue from.
+    """
+    def __init__(self, after_sequence, last_sequence):
+        self.after_sequence = after_sequence
+        self.last_sequence = last_sequence
+
+        # Whether the events that follow last_sequence are not contiguous
+        self.gap = False
+
+        # How many missing events were given up on
+        self.skipped_events = 0
+
+        # Ban type -> all rows of the model, if every ban must be reloaded
+        self.banned_users = None
+
+        # (ban type, ban ID, row or None) for every changed ban
+        self.changes = []
+
+
+class _BanSync:
+    def __init__(self, feed):
+        self.feed = feed
+        self.server_id = plugin_config.get(
+            'sync', 'server_id', fallback='') or uuid4().hex
+
+        self.enabled = SYNC_ENABLED
+        self.last_sequence = 0
+        self.full_resyncs = 0
+        self.skipped_events = 0
+
+        self._managers = {}
+        self._polling = False
+        self._gap_detected_at = None
+        self._repeat = Repeat(self._poll)
+
+    def register_manager(self, ban_type, manager):
+        """Register a BannedUniqueIDManager to receive remote changes.
+
+        :param str ban_type: Type of bans the manager stores.
+        :param manager: BannedUniqueIDManager instance.
+        """
+        self._managers[ban_type] = manager
+
+    def publish(self, session, ban_type, action, ban_id):
+        """Publish a ban change as a part of the given session."""
+        if not self.enabled:
+            return
+
+        self.feed.publish(
+            session, BanEvent(self.server_id, ban_type, action, ban_id))
+
+    def reset_sequence(self, last_sequence=None):
+        """Skip all the events published so far.
+
+        Call this before reloading ban caches from the database.
+
+        :param last_sequence: Already known sequence number of the last
+        published event. If None, it is requested from the feed.
+        """
+        if not self.enabled:
+            return
+
+        if last_sequence is None:
+            last_sequence = self.feed.get_last_sequence()
+
+        self.last_sequence = last_sequence
+        self._gap_detected_at = None
+
+    def start(self, interval=SYNC_POLL_INTERVAL):
+        if not self.enabled:
+            return
+
+        job_scheduler.submit(
+            target=self.feed.prune,
+            args=(SYNC_EVENT_RETENTION_SECONDS, ),
+            priority=JobPriority.BACKGROUND
+        )
+
+        self._repeat.start(interval)
+
+    def stop(self):
+        self._repeat.stop()
+
+    def _poll(self):
+        # Don't stack up queries if the database is slow
+        if self._polling:
+            return
+
+        gap_timed_out = (
+            self._gap_detected_at is not None and
+            time() - self._gap_detected_at >= SYNC_GAP_TIMEOUT)
+
+        self._polling = True
+        job_scheduler.submit(
+            target=self._fetch,
+            args=(self.last_sequence, gap_timed_out),
+            callback=self._apply
+        )
+
+    def _fetch(self, after_sequence, gap_timed_out):
+        session = Session()
+        try:
+            # The feed has been wiped or its IDs were reused
+            if self.feed.get_last_sequence() < after_sequence:
+                plugin_logger.log_warning(
+                    "Ban event sequence went back, reloading all bans")
+
+                return self._fetch_all(session, after_sequence)
+
+            events = self.feed.fetch(session, after_sequence, SYNC_BATCH_SIZE)
+
+            skipped_events = 0
+            next_sequence = after_sequence + 1
+            if events and events[0].id != next_sequence:
+
+                # This server has missed the changes of the pruned events
+                if self.feed.get_first_sequence() > next_sequence:
+                    plugin_logger.log_warning(
+                        "Ban events after #{} have been pruned, reloading "
+                        "all bans".format(after_sequence))
+
+                    return self._fetch_all(session, after_sequence)
+
+                # The missing events were rolled back (or their IDs were
+                # never used), they will never show up
+                if gap_timed_out:
+                    skipped_events = events[0].id - next_sequence
+                    next_sequence = events[0].id
+
+                    plugin_logger.log_message(
+                        "Skipping {} missing ban event(s) after #{}".format(
+                            skipped_events, after_sequence))
+
+            # Events with lower IDs may still be uncommitted, so only go as
+            # far as the events are contiguous
+            contiguous_events = []
+            for event in events:
+                if event.id != next_sequence + len(contiguous_events):
+                    break
+
+                contiguous_events.append(event)
+
+            result = _SyncResult(
+                after_sequence,
+                contiguous_events[-1].id if contiguous_events else
+                after_sequence
+            )
+            result.gap = len(contiguous_events) < len(events)
+            result.skipped_events = skipped_events
+
+            for event in contiguous_events:
+                if event.server_id == self.server_id:
+                    continue
+
+                # Bulk changes can't be applied incrementally, the events
+                # up to this one are committed, so a reload covers them all
+                if event.action == 'resync':
+                    result.banned_users = self._load_all(session)
+                    result.changes.clear()
+                    break
+
+                manager = self._managers.get(event.ban_type)
+                if manager is None:
+                    continue
+
+                result.changes.append((
+                    event.ban_type, event.ban_id,
+                    session.query(manager.model).filter_by(
+                        id=event.ban_id).first()
+                ))
+
+            return result
+
+        except Exception:
+            plugin_logger.log_exception("Unable to sync bans")
+            return None
+
+        finally:
+            session.close()
+
+    def _fetch_all(self, session, after_sequence):
+        # Get the last event first so that no ban changes are missed
+        result = _SyncResult(after_sequence, self.feed.get_last_sequence())
+        result.banned_users = self._load_all(session)
+        return result
+
+    def _load_all(self, session):
+        return {
+            ban_type: session.query(manager.model).all()
+            for ban_type, manager in self._managers.items()
+        }
+
+    def _apply(self, future):
+        self._polling = False
+
+        result = future.result()
+
+        # The sequence was reset while the poll was running
+        if result is None or result.after_sequence != self.last_sequence:
+            return
+
+        self.last_sequence = result.last_sequence
+        self.skipped_events += result.skipped_events
+
+        # Time the gap from when it has stopped the sequence
+        if not result.gap:
+            self._gap_detected_at = None
+        elif (
+                self._gap_detected_at is None or
+                result.last_sequence != result.after_sequence):
+
+            self._gap_detected_at = time()
+
+        if result.banned_users is not None:
+            plugin_logger.log_message("Reloading all bans")
+
+            self.full_resyncs += 1
+            for ban_type, banned_users in result.banned_users.items():
+                self._managers[ban_type].refresh(banned_users)
+
+            return
+
+        for ban_type, ban_id, banned_user in result.changes:
+            self._managers[ban_type].apply_change(ban_id, banned_user)
+
+# The singleton object of the _BanSync class.
+ban_sync = _BanSync(DatabaseBanEventFeed())
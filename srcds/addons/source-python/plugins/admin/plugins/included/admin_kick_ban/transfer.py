@@ -0,0 +1,405 @@
+"""Bulk import and export of bans.
+
+Supported formats:
+    csv   - comma-separated values with a header row, columns are named
+            after the fields in BAN_FIELDS (only "uniqueid" is required)
+    jsonl - one JSON object per line, keys are the same as for csv
+    cfg   - Valve's banned_user.cfg ("banid") and listip.cfg ("addip")
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import csv
+import json
+from time import time
+
+# Source.Python
+from listeners.tick import Delay
+from paths import GAME_PATH
+from steam import SteamID
+
+# Site-Package
+from sqlalchemy import or_
+
+# Source.Python Admin
+from admin.core.orm import Session
+from admin.core.plugins.command import admin_command_manager
+from admin.core.scheduler import job_scheduler, JobPriority
+
+# Included Plugin
+from .bans.base import BANNED_BY_SERVER
+from .bans.ip_address import banned_ip_address_manager
+from .bans.steamid import banned_steamid_manager
+from .logger import plugin_logger
+from .sync import ban_sync
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# How many rows to insert in a single transaction
+IMPORT_BATCH_SIZE = 1000
+
+# How many rows to load into memory at once while exporting
+EXPORT_BATCH_SIZE = 1000
+
+BAN_FIELDS = (
+    'uniqueid', 'name', 'banned_by', 'reviewed', 'banned_at', 'expires_at',
+    'is_unbanned', 'unbanned_by', 'reason', 'notes',
+)
+
+# Ban type -> (manager, name of the column that stores unique IDs)
+_ban_types = {
+    'steamid': (banned_steamid_manager, 'steamid64'),
+    'ip_address': (banned_ip_address_manager, 'ip_address'),
+}
+
+_transfer_future = None
+
+
+# =============================================================================
+# >> READERS
+# =============================================================================
+# Readers yield None for the lines they can't parse, so that a single broken
+# line doesn't stop the whole import
+def _read_csv(f):
+    reader = csv.DictReader(f)
+    while True:
+        try:
+            yield next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            yield None
+
+
+def _read_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+
+        yield row if isinstance(row, dict) else None
+
+
+def _read_cfg(f):
+    current_time = int(time())
+    for line in f:
+        tokens = line.split()
+        if len(tokens) < 3 or tokens[0] not in ('banid', 'addip'):
+            continue
+
+        try:
+            minutes = int(float(tokens[1]))
+        except (OverflowError, ValueError):
+            yield None
+            continue
+
+        yield {
+            'uniqueid': tokens[2],
+            'banned_at': current_time,
+            'expires_at': -1 if minutes <= 0 else current_time + minutes * 60,
+        }
+
+_readers = {
+    'csv': _read_csv,
+    'jsonl': _read_jsonl,
+    'cfg': _read_cfg,
+}
+
+
+# =============================================================================
+# >> WRITERS
+# =============================================================================
+class _CSVWriter:
+    def __init__(self, f, ban_type):
+        self._writer = csv.DictWriter(f, BAN_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, ban):
+        self._writer.writerow(ban)
+
+
+class _JSONLWriter:
+    def __init__(self, f, ban_type):
+        self._f = f
+
+    def write(self, ban):
+        self._f.write(json.dumps(ban) + '\n')
+
+
+class _CFGWriter:
+    def __init__(self, f, ban_type):
+        self._f = f
+        self._command = 'banid' if ban_type == 'steamid' else 'addip'
+        self._steamid = ban_type == 'steamid'
+        self._current_time = time()
+
+    def write(self, ban):
+        if ban['is_unbanned']:
+            return
+
+        if ban['expires_at'] < 0:
+            minutes = 0
+        elif ban['expires_at'] > self._current_time:
+            minutes = max(
+                1, int((ban['expires_at'] - self._current_time) // 60))
+        else:
+            return
+
+        uniqueid = ban['uniqueid']
+        if self._steamid:
+            uniqueid = SteamID.parse(uniqueid).to_steamid2()
+
+        self._f.write('{} {} {}\n'.format(self._command, minutes, uniqueid))
+
+_writers = {
+    'csv': _CSVWriter,
+    'jsonl': _JSONLWriter,
+    'cfg': _CFGWriter,
+}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+
+    return bool(value)
+
+
+def _convert_row(manager, uniqueid_column, row, current_time):
+    """Convert an imported row to a mapping ready for bulk insertion."""
+    banned_by = str(row.get('banned_by') or BANNED_BY_SERVER)
+    try:
+        banned_by = manager._convert_steamid_to_db_format(banned_by)
+    except ValueError:
+        pass
+
+    return {
+        uniqueid_column: manager._convert_uniqueid_to_db_format(
+            str(row['uniqueid']).strip()),
+        'name': str(row.get('name') or "")[:64],
+        'banned_by': banned_by[:32],
+        'reviewed': _to_bool(row.get('reviewed', True)),
+        'banned_at': int(float(row.get('banned_at') or current_time)),
+        'expires_at': int(float(row.get('expires_at') or -1)),
+        'is_unbanned': _to_bool(row.get('is_unbanned', False)),
+        'unbanned_by': str(row.get('unbanned_by') or ""),
+        'reason': str(row.get('reason') or ""),
+        'notes': str(row.get('notes') or ""),
+    }
+
+
+def _is_row_active(row, current_time):
+    return not row['is_unbanned'] and not (
+        -1 < row['expires_at'] < current_time)
+
+
+def _get_actively_banned(session, manager, uniqueid_column, current_time):
+    """Return the set of unique IDs that have an active ban."""
+    model = manager.model
+    query = (
+        session
+        .query(getattr(model, uniqueid_column))
+        .filter(model.is_unbanned.is_(False))
+        .filter(or_(
+            model.expires_at <= -1, model.expires_at >= current_time))
+    )
+
+    return {uniqueid for uniqueid, in query}
+
+
+def _finish_import(ban_type, manager):
+    """Let this server and the other ones know about the imported bans."""
+    session = Session()
+    try:
+        # Other servers can't tell which bans were inserted in bulk
+        ban_sync.publish(session, ban_type, 'resync', 0)
+        session.commit()
+
+        banned_users = session.query(manager.model).all()
+
+    finally:
+        session.close()
+
+    # Ban caches are only ever changed on the game thread
+    Delay(0, manager.refresh, (banned_users, ))
+
+
+def import_bans(ban_type, file_format, path):
+    """Stream bans from the given file into the database.
+
+    Active bans of unique IDs that are already actively banned are skipped,
+    so that importing the same file twice doesn't duplicate them. Inactive
+    bans are imported as they are, as they only make up the ban history.
+
+    :return: (number of imported bans, number of skipped rows, number of
+    already banned unique IDs, seconds)
+    :rtype: tuple
+    """
+    manager, uniqueid_column = _ban_types[ban_type]
+    read = _readers[file_format]
+
+    start_time = current_time = time()
+    imported = skipped = already_banned = 0
+    batch = []
+
+    session = Session()
+    try:
+        actively_banned = _get_actively_banned(
+            session, manager, uniqueid_column, current_time)
+
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in read(f):
+                if row is None:
+                    skipped += 1
+                    continue
+
+                try:
+                    row = _convert_row(
+                        manager, uniqueid_column, row, int(current_time))
+                except (
+                        AttributeError, KeyError, OverflowError, TypeError,
+                        ValueError):
+
+                    skipped += 1
+                    continue
+
+                if _is_row_active(row, current_time):
+                    uniqueid = row[uniqueid_column]
+                    if uniqueid in actively_banned:
+                        already_banned += 1
+                        continue
+
+                    actively_banned.add(uniqueid)
+
+                batch.append(row)
+
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    session.bulk_insert_mappings(manager.model, batch)
+                    session.commit()
+                    imported += len(batch)
+                    batch = []
+
+        if batch:
+            session.bulk_insert_mappings(manager.model, batch)
+            session.commit()
+            imported += len(batch)
+
+    finally:
+        session.close()
+
+        # Even if the import has failed half-way, some batches might
+        # already be committed
+        if imported:
+            _finish_import(ban_type, manager)
+
+    return imported, skipped, already_banned, time() - start_time
+
+
+def export_bans(ban_type, file_format, path):
+    """Stream all bans of the given type from the database to the file.
+
+    :return: (number of exported bans, seconds)
+    :rtype: tuple
+    """
+    manager, uniqueid_column = _ban_types[ban_type]
+
+    start_time = time()
+    exported = 0
+
+    session = Session()
+    try:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = _writers[file_format](f, ban_type)
+
+            query = (
+                session
+                .query(manager.model)
+                .order_by(manager.model.id)
+                .yield_per(EXPORT_BATCH_SIZE)
+            )
+
+            for banned_user in query:
+                ban = {field: getattr(banned_user, field)
+                       for field in BAN_FIELDS}
+
+                writer.write(ban)
+                exported += 1
+
+    finally:
+        session.close()
+
+    return exported, time() - start_time
+
+
+def _start_transfer(ban_type, file_format, path, target, report):
+    global _transfer_future
+
+    if ban_type not in _ban_types:
+        plugin_logger.log_message(
+            "Unknown ban type '{}', use one of: {}".format(
+                ban_type, ", ".join(sorted(_ban_types))))
+
+        return
+
+    if file_format not in _readers:
+        plugin_logger.log_message(
+            "Unknown format '{}', use one of: {}".format(
+                file_format, ", ".join(sorted(_readers))))
+
+        return
+
+    if _transfer_future is not None and not _transfer_future.done():
+        plugin_logger.log_message("Another ban transfer is in progress")
+        return
+
+    def callback(future):
+        if future.exception() is None:
+            plugin_logger.log_message(report(*future.result()))
+        else:
+            plugin_logger.log_message("Ban transfer has failed")
+
+    _transfer_future = job_scheduler.submit(
+        target=target,
+        args=(ban_type, file_format, GAME_PATH / path),
+        priority=JobPriority.BACKGROUND,
+        callback=callback
+    )
+
+
+def _report_import(imported, skipped, already_banned, seconds):
+    return (
+        "Imported {} bans ({} rows skipped, {} already banned) in {:.2f}s "
+        "({:.0f} bans/s)".format(
+            imported, skipped, already_banned, seconds,
+            imported / max(seconds, 1e-6)))
+
+
+def _report_export(exported, seconds):
+    return "Exported {} bans in {:.2f}s ({:.0f} bans/s)".format(
+        exported, seconds, exported / max(seconds, 1e-6))
+
+
+# =============================================================================
+# >> COMMANDS
+# =============================================================================
+@admin_command_manager.server_sub_command(['bans', 'import'])
+def _admin_bans_import(command_info, ban_type, file_format, path):
+    _start_transfer(ban_type, file_format, path, import_bans, _report_import)
+
+
+@admin_command_manager.server_sub_command(['bans', 'export'])
+def _admin_bans_export(command_info, ban_type, file_format, path):
+    _start_transfer(ban_type, file_format, path, export_bans, _report_export)
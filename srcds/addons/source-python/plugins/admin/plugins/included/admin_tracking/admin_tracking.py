@@ -9,7 +9,6 @@ from time import localtime, strftime, time
 # Source.Python
 from events import Event
 from listeners import OnClientActive
-from listeners.tick import GameThread
 from menus import PagedMenu, PagedOption, SimpleMenu, Text
 from players.dictionary import PlayerDictionary
 from players.entity import Player
@@ -22,9 +21,11 @@ from admin.core.helpers import extract_ip_address, format_player_name
 from admin.core.features import PlayerBasedFeature
 from admin.core.frontends.menus import (
     AdminMenuSection, PlayerBasedAdminCommand)
+from admin.core.metrics import metrics
 from admin.core.orm import Session
 from admin.core.paths import ADMIN_CFG_PATH, get_server_file
 from admin.core.plugins.strings import PluginStrings
+from admin.core.scheduler import job_scheduler, JobPriority
 
 # Included Plugin
 from .models import TrackedPlayerRecord as DB_Record
@@ -141,7 +142,10 @@ class _TrackedPlayer(list):
 class _TrackedPlayerDictionary(PlayerDictionary):
     def on_automatically_removed(self, index):
         tracked_player = self[index]
-        GameThread(target=tracked_player.save_to_database).start()
+        job_scheduler.submit(
+            target=tracked_player.save_to_database,
+            priority=JobPriority.BACKGROUND
+        )
 
 
 class _TrackPopupRecord:
@@ -162,8 +166,9 @@ class _TrackPopupFeature(PlayerBasedFeature):
     allow_execution_on_equal_priority = True
 
     def __init__(self):
-        self._selected_record = None
-        self._records_to_show = None
+        # Per-client state, by player index
+        self._selected_records = {}
+        self._records_to_show = {}
 
         self.record_popup = PagedMenu(
             title=plugin_strings['popup_title select_record'])
@@ -174,10 +179,11 @@ class _TrackPopupFeature(PlayerBasedFeature):
         self.dummy_popup.append(Text(plugin_strings['popup_text processing']))
 
         @self.record_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".record_popup.build")
         def build_callback(popup, index):
             popup.clear()
 
-            for record in self._records_to_show:
+            for record in self._records_to_show[index]:
                 text = plugin_strings['popup_title record_title'].tokenized(
                     seen_at=strftime(
                         "%d %b %Y %H:%M:%S", localtime(record.seen_at)
@@ -199,36 +205,39 @@ class _TrackPopupFeature(PlayerBasedFeature):
         def select_callback(popup, index, option):
             client = clients[index]
 
-            self._selected_record = option.value
+            self._selected_records[index] = option.value
             client.send_popup(self.track_popup)
 
         @self.track_popup.register_build_callback
+        @metrics.timed("features." + self.flag + ".track_popup.build")
         def build_callback(popup, index):
+            selected_record = self._selected_records[index]
+
             popup.title = plugin_strings['popup_title record_title'].tokenized(
                 seen_at=strftime(
                     "%d %b %Y %H:%M:%S", localtime(
-                        self._selected_record.seen_at)
+                        selected_record.seen_at)
                 ),
-                name=format_player_name(self._selected_record.name)
+                name=format_player_name(selected_record.name)
             )
 
             popup.clear()
             popup.append(Text(plugin_strings['popup_text name'].tokenized(
-                name=self._selected_record.name,  # Non-formatted name
+                name=selected_record.name,  # Non-formatted name
             )))
             popup.append(Text(plugin_strings['popup_text steamid'].tokenized(
-                steamid=self._selected_record.steamid,
+                steamid=selected_record.steamid,
             )))
             popup.append(Text(
                 plugin_strings['popup_text ip_address'].tokenized(
-                    ip_address=self._selected_record.ip_address,
+                    ip_address=selected_record.ip_address,
             )))
             popup.append(PagedOption(
                 text=plugin_strings['popup_title search_for_ip'].tokenized(
-                    ip_address=self._selected_record.ip_address),
+                    ip_address=selected_record.ip_address),
                 value=(
                     _TrackPopupOption.SEARCH_BY_IP,
-                    self._selected_record.ip_address
+                    selected_record.ip_address
                 )
             ))
 
@@ -238,30 +247,14 @@ class _TrackPopupFeature(PlayerBasedFeature):
             if option.value[0] == _TrackPopupOption.SEARCH_BY_IP:
                 client.send_popup(self.dummy_popup)
 
-                GameThread(
-                    target=self._show_players_for_ip_address,
-                    args=(client, option.value[1], )
-                ).start()
-
-    def _show_records_for_steamid(self, client, steamid):
-        self._records_to_show = []
-        steamid64 = str(SteamID.parse(steamid).to_uint64())
-
-        # Firstly, add live records (if player is on the server)
-        for tracked_player in tracked_players.values():
-            if tracked_player.steamid == steamid64:
-                for record in reversed(tracked_player):
-                    self._records_to_show.append(_TrackPopupRecord(
-                        steamid64,
-                        record.ip_address,
-                        record.name,
-                        record.seen_at,
-                        live=True
-                    ))
+                self._show_players_for_ip_address(client, option.value[1])
 
-                break
+    def _show_records(self, client, records):
+        self._records_to_show[client.player.index] = records
+        client.send_popup(self.record_popup)
 
-        # Secondly, add records from the database
+    @staticmethod
+    def _get_db_records_for_steamid(steamid64):
         session = Session()
 
         db_records = (
@@ -274,8 +267,36 @@ class _TrackPopupFeature(PlayerBasedFeature):
 
         session.close()
 
+        return [_TrackPopupRecord(
+            db_record.steamid64,
+            db_record.ip_address,
+            db_record.name,
+            db_record.seen_at,
+            live=False
+        ) for db_record in db_records]
+
+    @staticmethod
+    def _get_db_records_for_ip_address(ip_address, seen_steamids):
+        session = Session()
+
+        db_records = (
+            session
+            .query(DB_Record)
+            .filter_by(ip_address=ip_address)
+            .order_by(DB_Record.seen_at.desc())
+            .all()
+        )
+
+        session.close()
+
+        records = []
         for db_record in db_records:
-            self._records_to_show.append(_TrackPopupRecord(
+            if db_record.steamid64 in seen_steamids:
+                continue
+
+            seen_steamids.add(db_record.steamid64)
+
+            records.append(_TrackPopupRecord(
                 db_record.steamid64,
                 db_record.ip_address,
                 db_record.name,
@@ -283,11 +304,37 @@ class _TrackPopupFeature(PlayerBasedFeature):
                 live=False
             ))
 
-        client.send_popup(self.record_popup)
+        return records
+
+    def _show_records_for_steamid(self, client, steamid):
+        live_records = []
+        steamid64 = str(SteamID.parse(steamid).to_uint64())
+
+        # Firstly, add live records (if player is on the server)
+        for tracked_player in tracked_players.values():
+            if tracked_player.steamid == steamid64:
+                for record in reversed(tracked_player):
+                    live_records.append(_TrackPopupRecord(
+                        steamid64,
+                        record.ip_address,
+                        record.name,
+                        record.seen_at,
+                        live=True
+                    ))
+
+                break
+
+        # Secondly, add records from the database
+        client.compute_and_apply(
+            self._get_db_records_for_steamid,
+            lambda db_records: self._show_records(
+                client, live_records + db_records),
+            args=(steamid64, )
+        )
 
     def _show_players_for_ip_address(self, client, ip_address):
-        self._records_to_show = []
-        seen_steamids = []
+        live_records = []
+        seen_steamids = set()
 
         # Firstly, add live records (if player is on the server)
         for tracked_player in tracked_players.values():
@@ -299,9 +346,9 @@ class _TrackPopupFeature(PlayerBasedFeature):
             if record.ip_address != ip_address:
                 continue
 
-            seen_steamids.append(tracked_player.steamid)
+            seen_steamids.add(tracked_player.steamid)
 
-            self._records_to_show.append(_TrackPopupRecord(
+            live_records.append(_TrackPopupRecord(
                 tracked_player.steamid,
                 ip_address,
                 record.name,
@@ -310,34 +357,13 @@ class _TrackPopupFeature(PlayerBasedFeature):
             ))
 
         # Secondly, add records from the database
-        session = Session()
-
-        db_records = (
-            session
-            .query(DB_Record)
-            .filter_by(ip_address=ip_address)
-            .order_by(DB_Record.seen_at.desc())
-            .all()
+        client.compute_and_apply(
+            self._get_db_records_for_ip_address,
+            lambda db_records: self._show_records(
+                client, live_records + db_records),
+            args=(ip_address, seen_steamids)
         )
 
-        session.close()
-
-        for db_record in db_records:
-            if db_record.steamid64 in seen_steamids:
-                continue
-
-            seen_steamids.append(db_record.steamid64)
-
-            self._records_to_show.append(_TrackPopupRecord(
-                db_record.steamid64,
-                db_record.ip_address,
-                db_record.name,
-                db_record.seen_at,
-                live=False
-            ))
-
-        client.send_popup(self.record_popup)
-
     def execute(self, client, player):
         if (
                 player.is_fake_client() or
@@ -350,10 +376,7 @@ class _TrackPopupFeature(PlayerBasedFeature):
 
         client.send_popup(self.dummy_popup)
 
-        GameThread(
-            target=self._show_records_for_steamid,
-            args=(client, player.steamid)
-        ).start()
+        self._show_records_for_steamid(client, player.steamid)
 
 # The singleton object of the _TrackPopupFeature class.
 track_popup_feature = _TrackPopupFeature()